@@ -1,40 +1,35 @@
 """
-# A lot of this should be the purview of the PulsesOutputSocket class, i.e. a `pulse` method with settable rate and duty cycle
-# look at some examples os square wave classes. Probably better if the parameters are in Hz.
+Send pulses from pulse output one, at an interval set by the main knob.
+
+The pulses are timed by a ClockEngine running its own reference clock on a
+hardware timer, so the loop below only has to read the knob.
 """
 import time
 from computer import Computer
+from computer.clock_engine import ClockEngine
 
 pulse_length = 10  # ms
+min_interval = 20  # ms
 max_interval = 3277  # ms
 
 computer = Computer()
-pulses_output_socket_one = computer.pulses_output_socket_one
 main_knob = computer.main_knob
-main_knob.max_value = max_interval
-
-time_to_turn_pulse_on = 0
-"""The next time at which the pulse should be turned on."""
-
-time_to_turn_pulse_off = None
-"""The next time at which the pulse should be turned off."""
 
-def pulse_should_begin(time_to_turn_pulse_on):
-    return time.ticks_diff(time.ticks_ms, time_to_turn_pulse_on) > 0
+clock = ClockEngine(computer.pulses_output_socket_one,
+                    width_us=pulse_length * 1000)
 
-def pulse_should_end(time_to_turn_pulse_off):
-    return time.ticks_diff(now, time_to_turn_pulse_off) > 0
 
-while True:
-
-    if pulse_should_begin(time_to_turn_pulse_on) > 0:
+def set_interval(ranged_variable):
+    """Set the interval between pulses from the position of the main knob."""
+    position = (ranged_variable.value - ranged_variable.minimum_value) / \
+        ranged_variable.value_range
+    clock.period_us = int((min_interval +
+                           position * (max_interval - min_interval)) * 1000)
 
-        pulses_output_socket_one.turn_on()
 
-        pulse_gap = main_knob.read()
-        now = time.ticks_ms()
-        time_to_turn_pulse_on = time.ticks_add(now, pulse_gap)
-        time_to_turn_pulse_off = time.ticks_add(now, pulse_length)
+main_knob.value_changed.connect(set_interval)
+clock.start(period_us=max_interval * 1000)
 
-    elif pulses_output_socket_one.is_on() and pulse_should_end(time_to_turn_pulse_off):
-        pulses_output_socket_one.turn_off()
+while True:
+    main_knob.read()
+    time.sleep_ms(10)
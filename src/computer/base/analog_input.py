@@ -1,6 +1,8 @@
+import array
 import machine
 from computer.base.hardware_component import HardwareComponent
 from connect.ranged_variable import RangedVariable
+from connect.rate_limited_signal import RateLimitedSignal
 from connect.signal import Signal
 
 
@@ -36,6 +38,9 @@ class AnalogInput(HardwareComponent):
         These classes' values are not read via the multiplexer.
     """
 
+    _curve = None
+    _curve_table = None
+
     def __init__(self):
 
         self.ranged_variable = RangedVariable(
@@ -43,8 +48,16 @@ class AnalogInput(HardwareComponent):
             minimum=self.min_value,
             maximum=self.max_value
         )
-        self.value_changed = Signal()
-        """Signal emitted when this analog input's value changes."""
+        self.value_changed = RateLimitedSignal()
+        """Signal emitted, with the ranged variable, when this analog input's value changes.
+
+        The signal is not rate-limited by default. Set its max_rate_hz to
+        bound how often the connected slots are called; the latest value is
+        then delivered by a later read once the interval has passed.
+        """
+
+        self.change_threshold = 32
+        """The change in value, exclusive, at which value_changed is emitted."""
 
         self._has_jack = False
         """Whether this analog input has a jack inserted."""
@@ -73,6 +86,33 @@ class AnalogInput(HardwareComponent):
         elif (not self._has_jack) and had_jack:
             self.jack_removed.emit()
 
+    @property
+    def curve(self):
+        """The response curve applied to each reading, if any.
+
+        The curve is applied to the position of each reading between this
+        input's min_value and max_value, and the curved position is scaled
+        back into that range before it is stored in the ranged variable.
+        For the inverted CV and CV/Audio inputs the position rises with the
+        voltage. Both steps are precomputed into one lookup table (see
+        Curve.table_for_range).
+        """
+        return self._curve
+
+    @curve.setter
+    def curve(self, curve) -> None:
+        """Set the response curve applied to each reading."""
+        self._curve = curve
+        self._scale_curve()
+
+    def _scale_curve(self) -> None:
+        """Build the lookup table of the curve for this input's current range."""
+        if self._curve is None:
+            self._curve_table = None
+        else:
+            self._curve_table = self._curve.table_for_range(self.min_value,
+                                                            self.max_value)
+
     @property
     def adc(self) -> machine.ADC:
         """The analog-to-digital converter used by this analog input."""
@@ -115,12 +155,26 @@ class AnalogInput(HardwareComponent):
         Neither of these seems strictly necessary on read since the mappings take
         care of converting to the right ranges, and either way python is storing these
         as integers, 12-bit or 16-bit it doesn't care.
+
+        If this analog input has a curve, the reading is looked up by its 12
+        most significant bits in the curve's table for this input's range.
+
+        value_changed is emitted if the value moved by more than
+        change_threshold. Otherwise, any value held back by its rate limit is
+        delivered if the limit now allows.
         """
         value = self.ranged_variable.value
-        self.ranged_variable.value = self.adc.read_u16()
+        reading = self.adc.read_u16()
+
+        if self._curve_table is not None:
+            reading = self._curve_table[reading >> 4]
+
+        self.ranged_variable.value = reading
 
-        if abs(self.ranged_variable.value - value) > 32:
-            self.value_changed.emit(ranged_variable=self.ranged_variable)
+        if abs(self.ranged_variable.value - value) > self.change_threshold:
+            self.value_changed.emit_value(self.ranged_variable)
+        else:
+            self.value_changed.poll()
 
     def read_norm_probe(self) -> bool:
         """Read a boolean value from this analog input.
@@ -134,3 +188,326 @@ class AnalogInput(HardwareComponent):
             return True
         else:
             return False
+
+
+class ADCRoundRobin(object):
+    """Free-running capture of several ADC channels through the ADC's registers.
+
+    Each call to machine.ADC.read_u16 starts a single conversion and waits
+    for it. The RP2040's ADC can instead convert continuously, stepping
+    through a set of channels in turn (round-robin) and pushing each result
+    into a four-entry FIFO. This class configures that mode through direct
+    register access and drains the FIFO in bulk into a ring buffer of
+    readings for each channel, so all the channels are sampled at a steady
+    rate set by the ADC's clock divider, however long the Python code
+    between drains takes (up to the depth of the FIFO).
+
+    The ADC channels are 0 (GPIO 26, CV/Audio input two), 1 (GPIO 27,
+    CV/Audio input one), 2 (GPIO 28, multiplexer pin one) and 3 (GPIO 29,
+    multiplexer pin two). Channels 2 and 3 sample whichever inputs the
+    multiplexer currently selects. Readings are scaled to 16 bits as by
+    read_u16.
+
+    The FIFO must be drained before it fills, i.e. at least every four
+    conversions. If it overflows, readings are lost and the channel of each
+    reading is no longer known, so the capture is restarted from the first
+    channel and the overflow counted in overflow_count.
+
+    Parameters
+    ----------
+    channels : tuple of int
+        The ADC channels to capture, in increasing order.
+    block_size : int
+        The number of readings kept for each channel.
+    mem32 : object
+        The 32-bit memory accessor, machine.mem32 or a fake register map
+        such as FakeADCRegisters.
+    """
+    BASE = 0x4004C000
+    """The address of the ADC's registers."""
+
+    CS = BASE + 0x00
+    """The address of the control and status register."""
+
+    FCS = BASE + 0x08
+    """The address of the FIFO control and status register."""
+
+    FIFO = BASE + 0x0C
+    """The address of the FIFO."""
+
+    DIV = BASE + 0x10
+    """The address of the clock divider register."""
+
+    CS_EN = 1 << 0
+    CS_START_MANY = 1 << 3
+    CS_READY = 1 << 8
+    CS_AINSEL_SHIFT = 12
+    CS_RROBIN_SHIFT = 16
+
+    FCS_EN = 1 << 0
+    FCS_ERR = 1 << 2
+    FCS_UNDER = 1 << 10
+    FCS_OVER = 1 << 11
+    FCS_LEVEL_SHIFT = 16
+    FCS_LEVEL_MASK = 0xF
+
+    FIFO_ERR = 1 << 15
+    FIFO_VAL_MASK = 0xFFF
+
+    CLOCK_HZ = 48_000_000
+    """The frequency of the ADC's clock."""
+
+    CYCLES_PER_CONVERSION = 96
+    """The number of ADC clock cycles taken by a conversion."""
+
+    DEFAULT_CHANNELS = (0, 1, 2, 3)
+    """The ADC channels captured by default."""
+
+    DEFAULT_BLOCK_SIZE = 64
+    """The default number of readings kept for each channel."""
+
+    def __init__(self,
+                 channels: tuple = DEFAULT_CHANNELS,
+                 block_size: int = DEFAULT_BLOCK_SIZE,
+                 mem32=None):
+
+        if not channels or list(channels) != sorted(set(channels)) or \
+                not all(channel in range(4) for channel in channels):
+            raise ValueError("Invalid round-robin channels: ", channels)
+
+        self.channels = tuple(channels)
+        self.block_size = block_size
+
+        self._mem32 = machine.mem32 if mem32 is None else mem32
+
+        self.buffers = tuple(array.array("H", [0] * block_size)
+                             for _ in channels)
+        """The ring buffer of readings of each channel, in the order of channels."""
+
+        self._indices = array.array("H", [0] * len(channels))
+        self._position = 0
+        self._running = False
+
+        self.sample_count = 0
+        """The number of readings drained from the FIFO."""
+
+        self.overflow_count = 0
+        """The number of times the FIFO overflowed and the capture was restarted."""
+
+        self.error_count = 0
+        """The number of readings flagged as conversion errors."""
+
+    @property
+    def running(self) -> bool:
+        """Whether the ADC is converting continuously."""
+        return self._running
+
+    def start(self, sample_rate_hz: int) -> None:
+        """Start converting the channels continuously.
+
+        Parameters
+        ----------
+        sample_rate_hz
+            The number of readings of each channel per second. The ADC's
+            total conversion rate, this times the number of channels, is at
+            most 500 kHz.
+        """
+        conversion_rate_hz = sample_rate_hz * len(self.channels)
+        div = (self.CLOCK_HZ * 256) // conversion_rate_hz - 256
+        if div < (self.CYCLES_PER_CONVERSION - 1) * 256 or div >= 1 << 24:
+            raise ValueError("Round-robin sample rate out of range: ",
+                             sample_rate_hz)
+
+        self._mem32[self.DIV] = div
+        self._running = True
+        self.__restart()
+
+    def stop(self) -> None:
+        """Stop converting, leaving the ADC ready for read_u16."""
+        mem32 = self._mem32
+        mem32[self.CS] = self.CS_EN
+        self.__wait_ready()
+
+        mem32[self.FCS] = self.FCS_OVER | self.FCS_UNDER
+        mem32[self.DIV] = 0
+        self.__discard_fifo()
+        self._running = False
+
+    def drain(self) -> int:
+        """Move every reading waiting in the FIFO into the channels' buffers.
+
+        Returns
+        -------
+        int
+            The number of readings drained.
+        """
+        mem32 = self._mem32
+
+        fcs = mem32[self.FCS]
+        if fcs & self.FCS_OVER:
+            self.overflow_count += 1
+            self.__restart()
+            return 0
+
+        buffers = self.buffers
+        indices = self._indices
+        n_channels = len(buffers)
+        block_size = self.block_size
+        position = self._position
+        drained = 0
+
+        fcs_address = self.FCS
+        fifo_address = self.FIFO
+        level_shift = self.FCS_LEVEL_SHIFT
+        level_mask = self.FCS_LEVEL_MASK
+        error_bit = self.FIFO_ERR
+        value_mask = self.FIFO_VAL_MASK
+
+        level = (fcs >> level_shift) & level_mask
+        while level:
+            for _ in range(level):
+                raw = mem32[fifo_address]
+                if raw & error_bit:
+                    self.error_count += 1
+                raw &= value_mask
+
+                index = indices[position]
+                buffers[position][index] = (raw << 4) | (raw >> 8)
+                index += 1
+                indices[position] = 0 if index == block_size else index
+
+                position += 1
+                if position == n_channels:
+                    position = 0
+
+            drained += level
+            level = (mem32[fcs_address] >> level_shift) & level_mask
+
+        self._position = position
+        self.sample_count += drained
+
+        return drained
+
+    def latest(self, channel: int) -> int:
+        """Get the most recent reading of a channel.
+
+        Parameters
+        ----------
+        channel
+            The ADC channel.
+
+        Returns
+        -------
+        int
+            The reading, scaled to 16 bits.
+        """
+        position = self.channels.index(channel)
+        return self.buffers[position][self._indices[position] - 1]
+
+    def __restart(self) -> None:
+        """Restart converting from the first channel with an empty FIFO."""
+        mem32 = self._mem32
+
+        mem32[self.CS] = self.CS_EN
+        self.__wait_ready()
+        self.__discard_fifo()
+
+        mem32[self.FCS] = self.FCS_EN | self.FCS_ERR | \
+            self.FCS_OVER | self.FCS_UNDER
+        self._position = 0
+
+        rrobin = 0
+        for channel in self.channels:
+            rrobin |= 1 << channel
+
+        mem32[self.CS] = self.CS_EN | self.CS_START_MANY | \
+            (self.channels[0] << self.CS_AINSEL_SHIFT) | \
+            (rrobin << self.CS_RROBIN_SHIFT)
+
+    def __wait_ready(self) -> None:
+        """Wait for any conversion in progress to finish."""
+        while not self._mem32[self.CS] & self.CS_READY:
+            pass
+
+    def __discard_fifo(self) -> None:
+        """Read and discard every reading in the FIFO."""
+        mem32 = self._mem32
+        while (mem32[self.FCS] >> self.FCS_LEVEL_SHIFT) & self.FCS_LEVEL_MASK:
+            mem32[self.FIFO]
+
+
+class FakeADCRegisters(object):
+    """A fake of the ADC's registers, for testing ADCRoundRobin on the host.
+
+    It is indexed by address like machine.mem32. Conversions are made by
+    calling convert, which pushes readings of the fake input values into the
+    FIFO, following the round-robin setting as the hardware does.
+
+    Parameters
+    ----------
+    values : dict of int to int
+        The 12-bit value read from each ADC channel.
+    """
+    FIFO_DEPTH = 4
+    """The number of readings the FIFO holds."""
+
+    def __init__(self, values=None):
+        self.values = {} if values is None else values
+        self.registers = {ADCRoundRobin.CS: ADCRoundRobin.CS_READY,
+                          ADCRoundRobin.FCS: 0,
+                          ADCRoundRobin.DIV: 0}
+        self.fifo = []
+        self.over = False
+
+    def convert(self, count: int = 1) -> None:
+        """Make conversions, if the ADC is converting continuously.
+
+        Parameters
+        ----------
+        count
+            The number of conversions to make.
+        """
+        for _ in range(count):
+            cs = self.registers[ADCRoundRobin.CS]
+            if not cs & ADCRoundRobin.CS_START_MANY:
+                return
+
+            channel = (cs >> ADCRoundRobin.CS_AINSEL_SHIFT) & 0x7
+            if len(self.fifo) < self.FIFO_DEPTH:
+                self.fifo.append(self.values.get(channel, 0) & 0xFFF)
+            else:
+                self.over = True
+
+            rrobin = (cs >> ADCRoundRobin.CS_RROBIN_SHIFT) & 0x1F
+            if rrobin:
+                for step in range(1, 6):
+                    following = (channel + step) % 5
+                    if rrobin & (1 << following):
+                        channel = following
+                        break
+
+            cs &= ~(0x7 << ADCRoundRobin.CS_AINSEL_SHIFT)
+            self.registers[ADCRoundRobin.CS] = \
+                cs | (channel << ADCRoundRobin.CS_AINSEL_SHIFT)
+
+    def __getitem__(self, address: int) -> int:
+        if address == ADCRoundRobin.FIFO:
+            return self.fifo.pop(0) if self.fifo else 0
+
+        value = self.registers.get(address, 0)
+        if address == ADCRoundRobin.FCS:
+            value |= len(self.fifo) << ADCRoundRobin.FCS_LEVEL_SHIFT
+            if self.over:
+                value |= ADCRoundRobin.FCS_OVER
+        elif address == ADCRoundRobin.CS:
+            value |= ADCRoundRobin.CS_READY
+
+        return value
+
+    def __setitem__(self, address: int, value: int) -> None:
+        if address == ADCRoundRobin.FCS and value & ADCRoundRobin.FCS_OVER:
+            # the overflow flag is cleared by writing one to it
+            self.over = False
+            value &= ~ADCRoundRobin.FCS_OVER
+
+        self.registers[address] = value
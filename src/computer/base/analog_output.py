@@ -1,4 +1,6 @@
 from computer.base.hardware_component import HardwareComponent
+from connect.curve import Curve
+from connect.mapping import Mapping
 from connect.ranged_variable import RangedVariable
 
 
@@ -40,6 +42,27 @@ class AnalogOutput(HardwareComponent):
             maximum=self.max_value
         )
 
+        self.curve = None
+        """The response curve applied by map_and_write_value, if any."""
+
+        self.__curve_index = RangedVariable(value=0,
+                                            minimum=0,
+                                            maximum=Curve.SIZE - 1)
+        """The index into the curve's table of the latest mapped value."""
+
+        self.__curve_level = RangedVariable(value=0,
+                                            minimum=0,
+                                            maximum=65535)
+        """The curved position of the latest mapped value, from the curve's table."""
+
+        self.__curve_input = None
+        """The mapping from the latest source variable onto the curve's index."""
+
+        self.__curve_output = Mapping(self.__curve_level,
+                                      self.ranged_variable,
+                                      fixed_point=True)
+        """The mapping from the curved position onto this analog output's range."""
+
     @property
     def hardware_min(self) -> int:
         """The minimum value writeable to this analog output."""
@@ -68,7 +91,7 @@ class AnalogOutput(HardwareComponent):
         ranged_variable : RangedVariable
             The ranged variable from which to map this analog output's ranged variable's minimum's value.
         """
-        self.min_value.map_value(ranged_variable)
+        self.ranged_variable.map_minimum_value(ranged_variable)
 
     def map_max_value(self, ranged_variable):
         """Update this analog output's ranged variable's maximum's value from another.
@@ -78,7 +101,7 @@ class AnalogOutput(HardwareComponent):
         ranged_variable : RangedVariable
             The ranged variable from which to map this analog output's ranged variable's maximum's value.
         """
-        self.max_value.map_value(ranged_variable)
+        self.ranged_variable.map_maximum_value(ranged_variable)
 
     def map_range(self, ranged_variable):
         """Update this analog output's range from a ranged variable.
@@ -89,8 +112,8 @@ class AnalogOutput(HardwareComponent):
             The ranged variable from which to map this analog output's range.
         """
 
-        self.min_value.map_value(ranged_variable)
-        self.max_value.map_value(ranged_variable)
+        self.ranged_variable.map_minimum_value(ranged_variable)
+        self.ranged_variable.map_maximum_value(ranged_variable)
 
     def map_and_write_value(self, ranged_variable):
         """Update and write the value of this analog output's ranged variable from another.
@@ -99,6 +122,59 @@ class AnalogOutput(HardwareComponent):
         ----------
         ranged_variable : RangedVariable
             The ranged variable from which to map this analog output's ranged variable's value.
+
+        If this analog output has a curve, the position of the value within
+        the other variable's range indexes the curve's table, and the curved
+        position is mapped onto this analog output's range. Both steps are
+        Mappings, whose coefficients are only recomputed when a range
+        changes. The step onto the curved position is fixed-point; the step
+        onto the index is not, so the other variable may have a range of any
+        size, in integers or floats.
         """
-        self.ranged_variable.map_value(ranged_variable)
+        if self.curve is None:
+            self.ranged_variable.map_value(ranged_variable)
+        else:
+            curve_input = self.__curve_input
+            if curve_input is None or curve_input.source is not ranged_variable:
+                curve_input = self.__follow_curve_source(ranged_variable)
+
+            curve_input()
+            self.__curve_level.value = \
+                self.curve.table[int(self.__curve_index.value)]
+            self.__curve_output()
+
         self.write(self.ranged_variable.value)
+
+    def __follow_curve_source(self, ranged_variable):
+        """Replace the mapping onto the curve's index with one from a new source."""
+        if self.__curve_input is not None:
+            self.__curve_input.disconnect()
+
+        self.__curve_input = Mapping(ranged_variable, self.__curve_index)
+
+        return self.__curve_input
+
+    def mapping_from(self, ranged_variable, fixed_point: bool = True):
+        """Create a mapping which writes to this analog output from a ranged variable.
+
+        The mapping can be connected as a slot in place of
+        map_and_write_value, e.g. to an analog input's value_changed signal.
+        By default it is evaluated in fixed-point arithmetic, so each update
+        allocates no memory.
+
+        Parameters
+        ----------
+        ranged_variable : RangedVariable
+            The ranged variable from which to map this analog output's value.
+        fixed_point : bool
+            Whether the mapping is evaluated in fixed-point arithmetic.
+
+        Returns
+        -------
+        Mapping
+            The mapping from the ranged variable to this analog output.
+        """
+        return Mapping(ranged_variable,
+                       self.ranged_variable,
+                       callback=self.write,
+                       fixed_point=fixed_point)
@@ -1,10 +1,14 @@
 import machine
 from computer.base.hardware_component import HardwareComponent
+from computer.timer_wheel import TimerWheel
 
 
 class DigitalOutput(HardwareComponent):
     """A hardware digital output.
 
+    Pulses of every digital output are timed by the shared TimerWheel,
+    rather than a timer for each output.
+
     See Also
     --------
     PulseOutputSocket
@@ -13,12 +17,16 @@ class DigitalOutput(HardwareComponent):
         A light emitting diode on the module.
     """
 
+    DEFAULT_PULSE_WIDTH_US = 100_000
+    """The default width of a pulse in microseconds."""
+
     def __init__(self):
         super().__init__()
         self._pin = machine.Pin(self.io_pin_id,
                                 machine.Pin.OUT)
 
-        self._timer = machine.Timer(-1)
+        self.__timer_wheel = TimerWheel.shared()
+        self.__timer_wheel_slot = self.__timer_wheel.register(self)
 
     @property
     def on_value(self) -> int:
@@ -57,10 +65,25 @@ class DigitalOutput(HardwareComponent):
         elif self._pin.value == self.OFF_VALUE:
             self.turn_on()
 
-    def pulse(self) -> None:
-        """Turn this digital output on for a period, then off."""
-        self.turn_on()
+    def pulse(self,
+              width_us: int = DEFAULT_PULSE_WIDTH_US,
+              retrigger: int = TimerWheel.RESTART) -> None:
+        """Turn this digital output on for a period, then off.
+
+        Parameters
+        ----------
+        width_us
+            The time in microseconds for which this digital output is on.
+        retrigger
+            What to do if this digital output is already pulsing;
+            TimerWheel.EXTEND, TimerWheel.RESTART or TimerWheel.IGNORE.
+        """
+        self.__timer_wheel.pulse(self.__timer_wheel_slot, width_us, retrigger)
+
+    def cancel_pulse(self) -> None:
+        """Stop a pulse of this digital output from turning it off, leaving it as it is."""
+        self.__timer_wheel.cancel(self.__timer_wheel_slot)
 
-        self._timer.init(mode=machine.Timer.ONE_SHOT,
-                         period=100,
-                         callback=self.turn_off)
+    def is_pulsing(self) -> bool:
+        """Determine whether this digital output is on for a pulse."""
+        return self.__timer_wheel.is_pulsing(self.__timer_wheel_slot)
@@ -1,4 +1,5 @@
 import machine
+import time
 from computer.base.analog_input import AnalogInput
 
 
@@ -23,6 +24,19 @@ class Multiplexer(object):
     By default, the multiplexer digital output is set to (0, 0) so reads on pin
     one will return the main knob value and pin two will return the CV 1 input
     value.
+
+    The logic pins are shared by every multiplexed input, so a single
+    multiplexer object (see Multiplexer.shared) tracks their current state.
+    Only pins whose value actually changes are written, and the settling time
+    is only waited for after a real change of state. The switch_count and
+    skipped_write_count counters record how many state changes were made and
+    how many pin writes were avoided.
+
+    Parameters
+    ----------
+    settling_time_us : int
+        The time in microseconds to wait after changing the multiplexer state
+        before the selected input is read.
     """
     __MUX_LOGIC_A_PIN_ID = 24
     """The ID of the first multiplexer output pin."""
@@ -47,30 +61,60 @@ class Multiplexer(object):
     __MUX_IO_ADC_TWO = machine.ADC(MUX_IO_PIN_TWO_ID)
     """The ADC connected to the second multiplexer analog output."""
 
-    def __init__(self):
+    DEFAULT_SETTLING_TIME_US = 0
+    """The default time to wait after a change of multiplexer state."""
+
+    __shared = None
+    """The multiplexer object shared by all multiplexed inputs."""
+
+    def __init__(self, settling_time_us: int = DEFAULT_SETTLING_TIME_US):
+
+        self.settling_time_us = settling_time_us
+
+        self.switch_count = 0
+        """The number of times the multiplexer state has been changed."""
+
+        self.skipped_write_count = 0
+        """The number of logic pin writes skipped as the pin already had the value."""
+
+        self.__MUX_LOGIC_A_PIN.value(False)
+        self.__MUX_LOGIC_B_PIN.value(False)
+        self._value_a = False
+        self._value_b = False
+
+    @classmethod
+    def shared(cls):
+        """Get the multiplexer object shared by all multiplexed inputs.
+
+        Returns
+        -------
+        Multiplexer
+            The process-wide multiplexer, created on first use.
+        """
+        if cls.__shared is None:
+            cls.__shared = cls()
 
-        self.mux_logic_pin_a_value = False
-        self.mux_logic_pin_b_value = False
+        return cls.__shared
 
     @property
     def mux_logic_pin_a_value(self) -> bool:
         """The value at the first mux logic digital output pin."""
-        return self.__MUX_LOGIC_A_PIN.value()
+        return self._value_a
 
     @mux_logic_pin_a_value.setter
     def mux_logic_pin_a_value(self, value) -> None:
         """Set the value at the first mux logic digital output pin."""
-        self.__MUX_LOGIC_A_PIN.value(value)
+        self.set_logic_pin_values(value, self._value_b)
 
     @property
     def mux_logic_pin_b_value(self) -> bool:
         """The value at the second mux logic digital output pin."""
-        return self.__MUX_LOGIC_B_PIN.value()
+        return self._value_b
 
     @mux_logic_pin_b_value.setter
     def mux_logic_pin_b_value(self, value) -> None:
         """Set the value at the second mux logic digital output pin."""
-        self.__MUX_LOGIC_B_PIN.value(value)
+        self.set_logic_pin_values(self._value_a, value)
 
     def set_logic_pin_values(self, value_a: bool, value_b: bool) -> None:
         """Set the values of the multiplexer logic pins.
@@ -82,8 +126,63 @@ class Multiplexer(object):
         value_b
             The value to which to set the second multiplexer logic pin.
         """
-        self.mux_logic_pin_a_value = value_a
-        self.mux_logic_pin_b_value = value_b
+        changed = False
+
+        if value_a != self._value_a:
+            self.__MUX_LOGIC_A_PIN.value(value_a)
+            self._value_a = value_a
+            changed = True
+        else:
+            self.skipped_write_count += 1
+
+        if value_b != self._value_b:
+            self.__MUX_LOGIC_B_PIN.value(value_b)
+            self._value_b = value_b
+            changed = True
+        else:
+            self.skipped_write_count += 1
+
+        if changed:
+            self.switch_count += 1
+            if self.settling_time_us:
+                time.sleep_us(self.settling_time_us)
+
+    def reset_counters(self) -> None:
+        """Reset the switch and skipped write counters to zero."""
+        self.switch_count = 0
+        self.skipped_write_count = 0
+
+    @classmethod
+    def equivalent_logic_values(cls,
+                                pin_id: int,
+                                value_a: bool,
+                                value_b: bool) -> tuple:
+        """Get the logic pin values that select the same input as those provided.
+
+        The second multiplexer analog output only distinguishes CV 1 from CV 2
+        using the first logic pin (see the truth table above), so an input
+        read on that pin can be sampled in either of two multiplexer states.
+        Inputs read on the first pin are only selected by a single state.
+
+        Parameters
+        ----------
+        pin_id
+            The ID of the multiplexer analog input pin the input is read on.
+        value_a
+            The value of the first multiplexer logic pin for the input.
+        value_b
+            The value of the second multiplexer logic pin for the input.
+
+        Returns
+        -------
+        tuple of tuple of bool
+            The (A, B) logic pin values which select the input, with the
+            provided values first.
+        """
+        if pin_id == cls.MUX_IO_PIN_TWO_ID:
+            return (value_a, value_b), (value_a, not value_b)
+        else:
+            return ((value_a, value_b),)
 
     def get_adc(self, pin_id) -> machine.ADC:
         """Get the analog-to-digital converter connected to the pin with the provided pin ID."""
@@ -125,7 +224,7 @@ class MultiplexedInput(AnalogInput):
 
     def __init__(self):
         super().__init__()
-        self.__multiplexer = Multiplexer()
+        self.__multiplexer = Multiplexer.shared()
         self._adc = self.__multiplexer.get_adc(self.io_pin_id)
 
     @property
@@ -0,0 +1,295 @@
+import machine
+import time
+
+
+class ClockEngine(object):
+    """A clock divider and multiplier driving a pulse output.
+
+    The engine follows a reference clock, either the falling edges at a
+    pulse input or its own internal clock, and pulses an output multiply
+    times for every divide reference edges. Output pulses are timed by a
+    one-shot hardware timer rather than by polling, so they are unaffected
+    by how long the main loop takes.
+
+    On each reference edge starting a cycle of divide edges, the first
+    output pulse is sent at once, from the edge's interrupt handler, and the
+    rest are scheduled on a hard timer interrupt at predicted times, evenly spaced across the cycle
+    using the measured period of the reference clock,
+
+        spacing = period * divide / multiply
+
+    The internal reference clock is a one-shot hard timer, re-armed for each
+    edge from the time of the last, so a change of period_us takes effect
+    from the last edge instead of restarting the clock.
+
+    Each pulse is scheduled against the time of the edge starting its cycle,
+    so timer latency does not accumulate, and a new cycle discards any
+    pulses of the previous cycle still scheduled. With swing, every second
+    output pulse (counting whole cycles of multiply pulses, whether or not
+    they were all sent) is delayed by a fraction of the spacing.
+
+    Everything run from the interrupt handlers uses small integers only, so
+    allocates no memory. To keep it so, divide and multiply are bounded, and
+    a cycle of divide reference periods is limited to MAX_CYCLE_US; a longer
+    measured period is treated as the longest allowed for the division.
+
+    Parameters
+    ----------
+    output : DigitalOutput
+        The output to pulse, e.g. a PulseOutputSocket.
+    source : PulseInputSocket, optional
+        The input whose falling edges are the reference clock. If None, the
+        engine runs its own reference clock, see period_us.
+    divide : int
+        The number of reference edges per cycle of output pulses, up to
+        MAX_DIVIDE.
+    multiply : int
+        The number of output pulses per cycle, up to MAX_MULTIPLY.
+    swing : float
+        The fraction of the spacing, from 0 to under 1, by which every
+        second output pulse is delayed.
+    width_us : int
+        The width of each output pulse in microseconds.
+    periods : int
+        The number of recent periods of the source averaged to measure its
+        period.
+    """
+    DEFAULT_WIDTH_US = 10_000
+    """The default width of each output pulse in microseconds."""
+
+    DEFAULT_PERIOD_US = 500_000
+    """The default period of the internal reference clock in microseconds."""
+
+    MAX_DIVIDE = 1024
+    """The largest number of reference edges per cycle."""
+
+    MAX_MULTIPLY = 64
+    """The largest number of output pulses per cycle."""
+
+    MAX_CYCLE_US = (1 << 28) - 1
+    """The longest cycle in microseconds, keeping every time within a small integer."""
+
+    __SWING_SHIFT = 8
+    __SWING_MASK = (1 << __SWING_SHIFT) - 1
+
+    def __init__(self,
+                 output,
+                 source=None,
+                 divide: int = 1,
+                 multiply: int = 1,
+                 swing: float = 0,
+                 width_us: int = DEFAULT_WIDTH_US,
+                 periods: int = 2):
+
+        self.output = output
+        self.source = source
+        self.width_us = width_us
+        self.periods = periods
+
+        self._divide = 1
+        self._max_period_us = self.MAX_CYCLE_US
+        self._multiply = 1
+        self._swing = 0
+        self.divide = divide
+        self.multiply = multiply
+        self.swing = swing
+
+        self._period_us = self.DEFAULT_PERIOD_US
+
+        self._edge_count = 0
+        self._cycle_start = 0
+        self._spacing = 0
+        self._next_pulse = 0
+        self._cycle_parity = 1
+        self._reference_edge = 0
+
+        self._pulse_timer = machine.Timer(-1)
+        self._reference_timer = None
+        self._running = False
+
+        # bound once, since binding a method allocates
+        self._edge_ref = self.__on_edge
+        self._pulse_ref = self.__on_pulse_timer
+        self._reference_ref = self.__on_reference_timer
+
+    @property
+    def divide(self) -> int:
+        """The number of reference edges per cycle of output pulses."""
+        return self._divide
+
+    @divide.setter
+    def divide(self, divide: int) -> None:
+        """Set the number of reference edges per cycle of output pulses."""
+        if divide < 1 or divide > self.MAX_DIVIDE:
+            raise ValueError("Invalid clock division: ", divide)
+        self._divide = divide
+        self._max_period_us = self.MAX_CYCLE_US // divide
+
+    @property
+    def multiply(self) -> int:
+        """The number of output pulses per cycle."""
+        return self._multiply
+
+    @multiply.setter
+    def multiply(self, multiply: int) -> None:
+        """Set the number of output pulses per cycle."""
+        if multiply < 1 or multiply > self.MAX_MULTIPLY:
+            raise ValueError("Invalid clock multiplication: ", multiply)
+        self._multiply = multiply
+
+    @property
+    def swing(self) -> float:
+        """The fraction of the spacing by which every second output pulse is delayed."""
+        return self._swing / (1 << self.__SWING_SHIFT)
+
+    @swing.setter
+    def swing(self, swing: float) -> None:
+        """Set the fraction of the spacing by which every second output pulse is delayed."""
+        if not 0 <= swing < 1:
+            raise ValueError("Invalid clock swing: ", swing)
+        self._swing = int(swing * (1 << self.__SWING_SHIFT))
+
+    @property
+    def period_us(self) -> int:
+        """The period of the reference clock in microseconds.
+
+        With a source, this is the last period measured at the source.
+        Without one, setting it changes the rate of the internal clock, from
+        its last edge, so the clock keeps running however often it is set.
+        """
+        return self._period_us
+
+    @period_us.setter
+    def period_us(self, period_us: int) -> None:
+        """Set the period of the internal reference clock in microseconds."""
+        if period_us < 1 or period_us > self.MAX_CYCLE_US:
+            raise ValueError("Invalid clock period: ", period_us)
+
+        self._period_us = period_us
+        if self.source is None and self._running:
+            self.__arm_reference_timer()
+
+    @property
+    def running(self) -> bool:
+        """Whether the engine is following its reference clock."""
+        return self._running
+
+    def start(self, period_us: int = None) -> None:
+        """Start following the reference clock.
+
+        Parameters
+        ----------
+        period_us
+            The period of the internal reference clock in microseconds, if
+            there is no source. By default the current period_us is used.
+        """
+        if self._running:
+            return
+
+        if period_us is not None:
+            self.period_us = period_us
+
+        self._edge_count = 0
+        self._cycle_parity = 1
+        self._running = True
+
+        if self.source is None:
+            self._reference_timer = machine.Timer(-1)
+            self._reference_edge = time.ticks_us()
+            self.__arm_reference_timer()
+        else:
+            if not self.source.capturing:
+                self.source.start_capture()
+            self.source.edge_callback = self._edge_ref
+
+    def stop(self) -> None:
+        """Stop following the reference clock."""
+        if not self._running:
+            return
+
+        self._running = False
+
+        if self.source is None:
+            self._reference_timer.deinit()
+            self._reference_timer = None
+        else:
+            self.source.edge_callback = None
+
+        self._pulse_timer.deinit()
+
+    def __arm_reference_timer(self) -> None:
+        """Time the next edge of the internal reference clock, a period after the last."""
+        delay = time.ticks_diff(time.ticks_add(self._reference_edge,
+                                               self._period_us),
+                                time.ticks_us())
+        self._reference_timer.init(mode=machine.Timer.ONE_SHOT,
+                                   period=delay if delay > 0 else 1,
+                                   tick_hz=1_000_000,
+                                   callback=self._reference_ref,
+                                   hard=True)
+
+    def __on_reference_timer(self, _) -> None:
+        """Make an edge of the internal reference clock, and time the next."""
+        edge = time.ticks_add(self._reference_edge, self._period_us)
+        now = time.ticks_us()
+        # fall back into step if the period was shortened past several edges
+        if time.ticks_diff(now, edge) >= self._period_us:
+            edge = now
+        self._reference_edge = edge
+
+        self.__on_edge(edge)
+        self.__arm_reference_timer()
+
+    def __on_edge(self, now: int) -> None:
+        """Start a cycle of output pulses if this edge begins one."""
+        if self.source is not None:
+            period = self.source.period_us(self.periods)
+            if period:
+                self._period_us = period
+
+        edge = self._edge_count
+        self._edge_count = edge + 1 if edge + 1 < self._divide else 0
+        if edge:
+            return
+
+        period = self._period_us
+        if period > self._max_period_us:
+            period = self._max_period_us
+
+        self._pulse_timer.deinit()
+        self._cycle_start = now
+        self._spacing = period * self._divide // self._multiply
+        self._next_pulse = 0
+        self._cycle_parity ^= 1
+
+        self.__schedule_pulse()
+
+    def __on_pulse_timer(self, _) -> None:
+        """Send the due output pulse, and schedule the next of the cycle."""
+        self.output.pulse(self.width_us)
+
+        self._next_pulse += 1
+        if self._next_pulse < self._multiply:
+            self.__schedule_pulse()
+
+    def __schedule_pulse(self) -> None:
+        """Schedule the next output pulse of the cycle, or send it if it is due."""
+        offset = self._next_pulse * self._spacing
+        if (self._cycle_parity * self._multiply + self._next_pulse) & 1:
+            # split the spacing, so neither product leaves the small integers
+            spacing = self._spacing
+            offset += (spacing >> self.__SWING_SHIFT) * self._swing + \
+                (((spacing & self.__SWING_MASK) * self._swing)
+                 >> self.__SWING_SHIFT)
+
+        if not offset:
+            self.__on_pulse_timer(None)
+            return
+
+        delay = time.ticks_diff(time.ticks_add(self._cycle_start, offset),
+                                time.ticks_us())
+        self._pulse_timer.init(mode=machine.Timer.ONE_SHOT,
+                               period=delay if delay > 0 else 1,
+                               tick_hz=1_000_000,
+                               callback=self._pulse_ref,
+                               hard=True)
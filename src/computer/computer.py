@@ -16,6 +16,9 @@ from .sockets import PulseOutputSocketTwo
 from .leds import LEDMatrix
 from .eeprom import Eeprom
 from .normalization_probe import NormalizationProbe
+from .jack_detector import JackDetector
+from .oscillator import Oscillator
+from .base.multiplexed_input import Multiplexer
 
 
 class Computer(object):
@@ -69,6 +72,18 @@ class Computer(object):
         The normalization probe high reads ~2600.
     """
 
+    MUX_SCAN_ORDER = (
+        (False, False),
+        (True, False),
+        (True, True),
+        (False, True)
+    )
+    """The order in which multiplexer logic states are visited by a scan.
+
+    This is a Gray code, so consecutive states (including the wrap from the
+    last state of one scan to the first of the next) differ by one pin.
+    """
+
     def __init__(self):
 
         self._board_version = None
@@ -85,6 +100,7 @@ class Computer(object):
         self._cv_audio_input_socket_two = None
         self._cv_audio_output_socket_one = None
         self._cv_audio_output_socket_two = None
+        self._oscillator = None
 
         self._cv_input_socket_one = None
         self._cv_input_socket_two = None
@@ -99,25 +115,56 @@ class Computer(object):
         self._led_matrix = None
 
         self._normalization_probe = NormalizationProbe()
+        self._jack_detector = None
 
         self.__input_sockets = []
 
-    def update_input_sockets(self, fire_all_signals: bool = False):
+        self._multiplexer = None
+        self.__scan_plan = None
+        self.__direct_inputs = None
+
+    def update_input_sockets(self,
+                             fire_all_signals: bool = False,
+                             bit_parallel: bool = True):
+        """Determine which input sockets have a jack inserted.
+
+        Bits of the normalization probe's pattern are written and read back
+        from each input socket; a socket whose readback ever disagrees with
+        the written bit has a jack inserted.
+
+        By default detection is bit-parallel: each probe bit is written once
+        and every socket still matching the pattern is read against it, so at
+        most n_bits probe writes are made in total instead of n_bits per
+        socket. Sockets are read in multiplexer state order, reversing
+        direction on each bit so that the multiplexer changes state at most
+        once per bit, and a socket is dropped as soon as its readback
+        disagrees with the probe.
+
+        Bit-parallel detection is also adaptive. The pattern is restarted and
+        its short prefix (the probe's prefix_bits) is run first. A socket
+        already believed to have no jack that matches the whole prefix is
+        confirmed as such, and only sockets believed to have a jack go on to
+        the full n_bits before being judged to have had it removed. Most
+        scans therefore finish after the prefix. A newly inserted jack is
+        missed by one scan with the false positive probability of the prefix
+        (see NormalizationProbe).
+
+        Parameters
+        ----------
+        fire_all_signals
+            Whether to emit jack_inserted or jack_removed for every socket,
+            rather than only for those whose state has changed.
+        bit_parallel
+            Whether to probe all sockets bit by bit. If False, each socket is
+            probed in turn with its own run of bits.
+        """
+        self.__input_sockets = self.__input_sockets_by_mux_state()
 
-        self.__input_sockets = [
-            self._cv_audio_input_socket_one,
-            self._cv_audio_input_socket_two,
-            self._cv_input_socket_one,
-            self._cv_input_socket_two,
-            self._pulses_input_socket_one,
-            self._pulses_input_socket_two
-        ]
+        if bit_parallel:
+            self.__detect_jacks_bit_parallel(fire_all_signals)
+            return
 
-        # this could be more efficient going bit by bit instead of socket by socket?
         for socket in self.__input_sockets:
-            if socket is None:
-                continue
-
             socket_connected = False
             for i in range(self._normalization_probe.n_bits):
                 written_value = self._normalization_probe.write()
@@ -127,15 +174,81 @@ class Computer(object):
                     socket_connected = True
                     break
 
-            if socket_connected:
-                socket.has_jack = True
-                if fire_all_signals:
-                    socket.jack_inserted.emit()
+            self.__set_has_jack(socket, socket_connected, fire_all_signals)
+
+    def __detect_jacks_bit_parallel(self, fire_all_signals: bool) -> None:
+        """Probe all input sockets at once, one bit of the pattern at a time."""
+        probe = self._normalization_probe
+        probe.restart()
+        unpatched = list(self.__input_sockets)
+
+        for i in range(probe.n_bits):
+            if not unpatched:
+                break
+
+            if i == probe.prefix_bits:
+                # sockets without a jack that matched the prefix are confirmed
+                # and only sockets that had a jack are probed to full length
+                for socket in unpatched:
+                    if not socket.has_jack:
+                        self.__set_has_jack(socket, False, fire_all_signals)
+
+                unpatched = [socket for socket in unpatched if socket.has_jack]
+                if not unpatched:
+                    return
+
+            written_value = probe.write()
 
+            matched = []
+            for socket in unpatched:
+                if socket.read_norm_probe() == written_value:
+                    matched.append(socket)
+                else:
+                    self.__set_has_jack(socket, True, fire_all_signals)
+
+            # read back in the opposite direction for the next bit, starting
+            # from the multiplexer state this bit finished in
+            matched.reverse()
+            unpatched = matched
+
+        for socket in unpatched:
+            self.__set_has_jack(socket, False, fire_all_signals)
+
+    def __input_sockets_by_mux_state(self) -> list:
+        """Get the existing input sockets, ordered by multiplexer logic state.
+
+        The CV input sockets are read through the multiplexer, sorted by the
+        logic pin values selecting them. The other input sockets do not use
+        the multiplexer and follow them.
+        """
+        multiplexed_sockets = sorted(
+            (socket for socket in (self._cv_input_socket_one,
+                                   self._cv_input_socket_two)
+             if socket is not None),
+            key=lambda socket: (socket.mux_logic_a_pin_value,
+                                socket.mux_logic_b_pin_value)
+        )
+
+        direct_sockets = [
+            socket for socket in (self._cv_audio_input_socket_one,
+                                  self._cv_audio_input_socket_two,
+                                  self._pulses_input_socket_one,
+                                  self._pulses_input_socket_two)
+            if socket is not None
+        ]
+
+        return multiplexed_sockets + direct_sockets
+
+    @staticmethod
+    def __set_has_jack(socket, has_jack: bool, fire_all_signals: bool) -> None:
+        """Record whether a socket has a jack, emitting its signals as requested."""
+        socket.has_jack = has_jack
+
+        if fire_all_signals:
+            if has_jack:
+                socket.jack_inserted.emit()
             else:
-                socket.has_jack = False
-                if fire_all_signals:
-                    socket.jack_removed.emit()
+                socket.jack_removed.emit()
 
     @property
     def eeprom(self):
@@ -156,10 +269,19 @@ class Computer(object):
 
         return self._uart0
 
+    @property
+    def multiplexer(self):
+        """The multiplexer shared by the knobs, Z switch and CV input sockets."""
+        if self._multiplexer is None:
+            self._multiplexer = Multiplexer.shared()
+
+        return self._multiplexer
+
     @property
     def main_knob(self):
         if self._main_knob is None:
             self._main_knob = MainKnob()
+            self.__invalidate_scan_plan()
 
         return self._main_knob
 
@@ -167,6 +289,7 @@ class Computer(object):
     def knob_x(self):
         if self._knob_x is None:
             self._knob_x = KnobX()
+            self.__invalidate_scan_plan()
 
         return self._knob_x
 
@@ -174,6 +297,7 @@ class Computer(object):
     def knob_y(self):
         if self._knob_y is None:
             self._knob_y = KnobY()
+            self.__invalidate_scan_plan()
 
         return self._knob_y
 
@@ -181,6 +305,7 @@ class Computer(object):
     def switch_z(self):
         if self._switch_z is None:
             self._switch_z = SwitchZ()
+            self.__invalidate_scan_plan()
 
         return self._switch_z
 
@@ -188,6 +313,8 @@ class Computer(object):
     def cv_input_socket_one(self):
         if self._cv_input_socket_one is None:
             self._cv_input_socket_one = CVInputSocketOne()
+            self.__add_input_socket(self._cv_input_socket_one)
+            self.__invalidate_scan_plan()
 
         return self._cv_input_socket_one
 
@@ -195,6 +322,8 @@ class Computer(object):
     def cv_input_socket_two(self):
         if self._cv_input_socket_two is None:
             self._cv_input_socket_two = CVInputSocketTwo()
+            self.__add_input_socket(self._cv_input_socket_two)
+            self.__invalidate_scan_plan()
 
         return self._cv_input_socket_two
 
@@ -217,6 +346,8 @@ class Computer(object):
         """The left CV/Audio input socket on the Computer."""
         if self._cv_audio_input_socket_one is None:
             self._cv_audio_input_socket_one = CVAudioInputSocketOne()
+            self.__add_input_socket(self._cv_audio_input_socket_one)
+            self.__invalidate_scan_plan()
 
         return self._cv_audio_input_socket_one
 
@@ -225,6 +356,8 @@ class Computer(object):
         """The right CV/Audio input socket on the Computer."""
         if self._cv_audio_input_socket_two is None:
             self._cv_audio_input_socket_two = CVAudioInputSocketTwo()
+            self.__add_input_socket(self._cv_audio_input_socket_two)
+            self.__invalidate_scan_plan()
 
         return self._cv_audio_input_socket_two
 
@@ -242,10 +375,19 @@ class Computer(object):
 
         return self._cv_audio_output_socket_two
 
+    @property
+    def oscillator(self):
+        """The two-voice wavetable oscillator playing through the CV/Audio outputs."""
+        if self._oscillator is None:
+            self._oscillator = Oscillator()
+
+        return self._oscillator
+
     @property
     def pulses_input_socket_one(self):
         if self._pulses_input_socket_one is None:
             self._pulses_input_socket_one = PulseInputSocketOne()
+            self.__add_input_socket(self._pulses_input_socket_one)
 
         return self._pulses_input_socket_one
 
@@ -253,6 +395,7 @@ class Computer(object):
     def pulses_input_socket_two(self):
         if self._pulses_input_socket_two is None:
             self._pulses_input_socket_two = PulseInputSocketTwo()
+            self.__add_input_socket(self._pulses_input_socket_two)
 
         return self._pulses_input_socket_two
 
@@ -278,32 +421,126 @@ class Computer(object):
         return self._led_matrix
 
     def read_analog_inputs(self):
-        # may be able to speed this up by setting multiplexer pins here
-        # each update of the two multiplexer pins takes ~0.15 ms and we're doing it 8 times each time this is called (should be 4 max)
-        """Update the current raw values of all the analog inputs."""
-        if self._main_knob is not None:
-            self._main_knob.read()
+        """Update the current raw values of all the analog inputs.
+
+        The inputs are read following a scan plan, compiled when first needed
+        and again whenever an input is created or a socket's jack changes.
+        Multiplexed inputs are grouped by the multiplexer logic state that
+        selects them so that each state is visited at most once per scan,
+        sampling both multiplexer ADCs (e.g. the main knob and CV 1 at (0, 0))
+        before moving on. Sockets without a jack are left out of the plan.
 
-        if self._cv_input_socket_one is not None and self._cv_input_socket_one.has_jack:
-            self._cv_input_socket_one.read()
+        If background jack detection has been started, the normalization
+        probe is first advanced by one bit.
+        """
+        if self._jack_detector is not None:
+            self._jack_detector.step()
 
-        if self._knob_x is not None:
-            self._knob_x.read()
+        if self.__scan_plan is None:
+            self.__compile_scan_plan()
 
-        if self._knob_y is not None:
-            self._knob_y.read()
+        multiplexer = self.multiplexer
+        for value_a, value_b, inputs in self.__scan_plan:
+            multiplexer.set_logic_pin_values(value_a, value_b)
+            for analog_input in inputs:
+                analog_input.read(set_logic=False)
 
-        if self._switch_z is not None:
-            self._switch_z.read()
+        for analog_input in self.__direct_inputs:
+            analog_input.read()
 
-        if self._cv_input_socket_two is not None and self._cv_input_socket_two.has_jack:
-            self._cv_input_socket_two.read()
+    def __compile_scan_plan(self) -> None:
+        """Compile the plan used by read_analog_inputs.
 
-        if self._cv_audio_input_socket_one is not None and self._cv_audio_input_socket_one.has_jack:
-            self._cv_audio_input_socket_one.read()
+        The plan is a tuple of (A, B, inputs) entries, one per multiplexer
+        logic state that selects at least one input to be read, ordered by
+        MUX_SCAN_ORDER. CV input sockets can be read in either of two states
+        (see Multiplexer.equivalent_logic_values), so each is placed in a
+        state already visited for a knob or the switch where possible.
+        """
+        inputs_by_state = {state: [] for state in Computer.MUX_SCAN_ORDER}
+
+        for knob in (self._main_knob,
+                     self._knob_x,
+                     self._knob_y,
+                     self._switch_z):
+            if knob is not None:
+                inputs_by_state[(knob.mux_logic_a_pin_value,
+                                 knob.mux_logic_b_pin_value)].append(knob)
+
+        for socket in (self._cv_input_socket_one,
+                       self._cv_input_socket_two):
+            if socket is None or not socket.has_jack:
+                continue
 
-        if self._cv_audio_input_socket_two is not None and self._cv_audio_input_socket_two.has_jack:
-            self._cv_audio_input_socket_two.read()
+            states = Multiplexer.equivalent_logic_values(
+                socket.io_pin_id,
+                socket.mux_logic_a_pin_value,
+                socket.mux_logic_b_pin_value
+            )
+            for state in states:
+                if inputs_by_state[state]:
+                    break
+            else:
+                state = states[0]
+
+            inputs_by_state[state].append(socket)
+
+        self.__scan_plan = tuple(
+            (value_a, value_b, tuple(inputs_by_state[(value_a, value_b)]))
+            for value_a, value_b in Computer.MUX_SCAN_ORDER
+            if inputs_by_state[(value_a, value_b)]
+        )
+
+        self.__direct_inputs = tuple(
+            socket for socket in (self._cv_audio_input_socket_one,
+                                  self._cv_audio_input_socket_two)
+            if socket is not None and socket.has_jack
+        )
+
+    def __invalidate_scan_plan(self) -> None:
+        """Discard the scan plan so that it is recompiled on the next scan."""
+        self.__scan_plan = None
+
+    def __add_input_socket(self, socket) -> None:
+        """Track a newly created input socket.
+
+        The scan plan is recompiled whenever a jack is inserted into or
+        removed from the socket, and the socket is added to any background
+        jack detection.
+        """
+        socket.jack_inserted.connect(self.__invalidate_scan_plan)
+        socket.jack_removed.connect(self.__invalidate_scan_plan)
+
+        if self._jack_detector is not None:
+            self._jack_detector.set_sockets(
+                self.__input_sockets_by_mux_state()
+            )
+
+    def start_jack_detection(
+            self,
+            debounce_patterns: int = JackDetector.DEFAULT_DEBOUNCE_PATTERNS):
+        """Detect jacks in the background as the analog inputs are read.
+
+        Each call to read_analog_inputs then advances the normalization probe
+        by one bit, so jack_inserted and jack_removed are emitted within a
+        bounded number of scans without any scan blocking on the whole probe
+        pattern as update_input_sockets does.
+
+        Parameters
+        ----------
+        debounce_patterns
+            The number of consecutive full probe patterns that must disagree
+            with a socket's has_jack before it is changed.
+        """
+        self._jack_detector = JackDetector(
+            self._normalization_probe,
+            self.__input_sockets_by_mux_state(),
+            debounce_patterns
+        )
+
+    def stop_jack_detection(self) -> None:
+        """Stop detecting jacks in the background."""
+        self._jack_detector = None
 
     @property
     def board_version(self) -> tuple:
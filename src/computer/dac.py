@@ -0,0 +1,174 @@
+import machine
+
+
+class DAC(object):
+    """The MCP4822 digital-to-analog converter driving the CV/Audio outputs.
+
+    https://docs.micropython.org/en/latest/library/machine.SPI.html#machine-spi
+
+    The MCP4822 has two 12-bit output channels, A and B, which go to the
+    CV/Audio output sockets one and two. It is written to over SPI on pins
+    18 (SCK), 19 (SDI/MOSI) and 21 (active-low chip select). MISO is not
+    connected, as the DAC does not output to the RP2040.
+
+    Each write is a 16-bit frame, sent most-significant bit first:
+
+    15 : channel selection bit, 0 for A and 1 for B
+    14 : ignored
+    13 : output gain selection bit, hard-coded to 1
+    12 : output shutdown control bit, hard-coded to 1
+    11-0 : the data value to write to the channel
+
+    The DAC latches a frame when chip select rises, so each frame is sent
+    with its own chip select pulse. The outputs are inverted, so the value
+    written for an output value v is 4095 - v.
+
+    There is one DAC, so a single driver object (see DAC.shared) owns the
+    SPI bus and chip select pin for both output sockets. Frames are built in
+    a preallocated buffer and sent through memoryviews of it, so writing
+    allocates no memory. write_pair updates both channels in one call, with
+    the two frames sent back to back.
+    """
+    SCK_PIN_ID = 18
+    """Pin ID for clock signal from the RP2040 to the DAC."""
+
+    SDI_MOSI_PIN_ID = 19
+    """Pin ID for serial data from RP2040 to the DAC, most-significant bit first."""
+
+    CS_PIN_ID = 21
+    """Active-low chip select signal from RP2040 to enable communication with the DAC."""
+
+    __BAUD_RATE_HZ = 20_000_000
+    """The max SCK clock rate (in Hz) from the MCP4822 datasheet. Equal to 20 MHz"""
+
+    __BITS = 8
+    """The width in bits of each transfer."""
+
+    CHANNEL_A = 0
+    """The channel of the first (leftmost) CV/Audio output socket."""
+
+    CHANNEL_B = 1
+    """The channel of the second (rightmost) CV/Audio output socket."""
+
+    __CHANNEL_BITS = (0b0011000000000000, 0b1011000000000000)
+    """The configuration bits of a frame for each channel."""
+
+    MAX_VALUE = 4095
+    """The largest value writeable to a channel."""
+
+    __shared = None
+    """The DAC driver shared by the CV/Audio output sockets."""
+
+    def __init__(self):
+        self.init()
+
+        self._buffer = bytearray(4)
+        """The frames for channels A and B, in that order."""
+
+        frames = memoryview(self._buffer)
+        self._frames = (frames[0:2], frames[2:4])
+
+    def init(self) -> None:
+        """Set up the SPI bus and chip select pin.
+
+        This is called on creation, and again to take the pins back after
+        they have been used by another peripheral, such as a DACStream.
+        """
+        self._chip_select_pin = machine.Pin(self.CS_PIN_ID,
+                                            mode=machine.Pin.OUT, value=1)
+
+        self._spi = machine.SPI(
+            id=0,
+            baudrate=self.__BAUD_RATE_HZ,
+            polarity=0,
+            phase=0,
+            bits=self.__BITS,
+            firstbit=machine.SPI.MSB,
+            sck=self.SCK_PIN_ID,
+            mosi=self.SDI_MOSI_PIN_ID,
+        )
+
+    @classmethod
+    def shared(cls):
+        """Get the DAC driver shared by the CV/Audio output sockets.
+
+        Returns
+        -------
+        DAC
+            The process-wide DAC driver, created on first use.
+        """
+        if cls.__shared is None:
+            cls.__shared = cls()
+
+        return cls.__shared
+
+    def write(self, channel: int, value) -> None:
+        """Write a value to one channel of the DAC.
+
+        Parameters
+        ----------
+        channel
+            The channel to write to, DAC.CHANNEL_A or DAC.CHANNEL_B.
+        value
+            The 12-bit value, from 0 to 4095, to write.
+        """
+        self.__set_frame(channel, value)
+
+        chip_select_pin = self._chip_select_pin
+        try:
+            chip_select_pin.value(0)
+            self._spi.write(self._frames[channel])
+        finally:
+            chip_select_pin.value(1)
+
+    def write_pair(self, value_a, value_b) -> None:
+        """Write a value to each channel of the DAC, back to back.
+
+        Parameters
+        ----------
+        value_a
+            The 12-bit value, from 0 to 4095, to write to channel A.
+        value_b
+            The 12-bit value, from 0 to 4095, to write to channel B.
+        """
+        self.__set_frame(self.CHANNEL_A, value_a)
+        self.__set_frame(self.CHANNEL_B, value_b)
+
+        chip_select_pin = self._chip_select_pin
+        spi = self._spi
+        frame_a, frame_b = self._frames
+        try:
+            chip_select_pin.value(0)
+            spi.write(frame_a)
+            chip_select_pin.value(1)
+            chip_select_pin.value(0)
+            spi.write(frame_b)
+        finally:
+            chip_select_pin.value(1)
+
+    @classmethod
+    def frame(cls, channel: int, value) -> int:
+        """Get the 16-bit frame which writes a value to a channel.
+
+        Parameters
+        ----------
+        channel
+            The channel to write to, DAC.CHANNEL_A or DAC.CHANNEL_B.
+        value
+            The 12-bit value, from 0 to 4095, to write.
+
+        Returns
+        -------
+        int
+            The frame, to be sent most-significant bit first.
+        """
+        return cls.__CHANNEL_BITS[channel] | \
+            (int(cls.MAX_VALUE - value) & 0xFFF)
+
+    def __set_frame(self, channel: int, value) -> None:
+        """Build the frame writing a value to a channel in the buffer."""
+        data = self.frame(channel, value)
+
+        index = channel << 1
+        self._buffer[index] = data >> 8
+        self._buffer[index + 1] = data & 0xFF
@@ -0,0 +1,233 @@
+import array
+import machine
+from computer.dac import DAC
+from connect.signal import Signal
+
+
+class DACStream(object):
+    """A double-buffered stream of samples to both channels of the DAC.
+
+    Samples are streamed in blocks, each an array('I') of block_size words.
+    Each word holds one stereo sample, the DAC frame for channel A in its
+    upper 16 bits and the frame for channel B in its lower 16 bits (see
+    pack_block). The stream owns two block buffers; while one is being
+    played, the next block is copied into the other with submit_block.
+
+    When a block has been played, the following block starts playing if it
+    has been submitted, and block_freed is emitted with this stream so the
+    next block can be submitted. If the following block has not been
+    submitted in time the stream underruns, counted in underrun_count, and
+    the DAC holds the last sample until a block is submitted.
+
+    This class holds the buffering logic; playing a block is left to the
+    subclasses, PIODACStream on the Computer and FakeDACStream on the host.
+
+    Parameters
+    ----------
+    sample_rate_hz : int
+        The number of stereo samples played per second.
+    block_size : int
+        The number of stereo samples in each block.
+    """
+    DEFAULT_BLOCK_SIZE = 256
+    """The default number of stereo samples in each block."""
+
+    IDLE_VALUE = 2048
+    """The value written to both channels before the first block is played."""
+
+    def __init__(self,
+                 sample_rate_hz: int,
+                 block_size: int = DEFAULT_BLOCK_SIZE):
+
+        if block_size < 1:
+            raise ValueError("Invalid stream block size: ", block_size)
+
+        self.sample_rate_hz = sample_rate_hz
+        self.block_size = block_size
+
+        self.block_freed = Signal()
+        """Signal emitted, with this stream, when a block buffer becomes free."""
+
+        self.underrun_count = 0
+        """The number of times a block finished with no following block submitted."""
+
+        self.block_count = 0
+        """The number of blocks played."""
+
+        self._buffers = (array.array("I", [0] * block_size),
+                         array.array("I", [0] * block_size))
+        self._ready = bytearray(2)
+        self._playing = -1
+        self._next_fill = 0
+        self._running = False
+
+    @staticmethod
+    def pack(value_a, value_b) -> int:
+        """Pack a value for each channel into one stereo sample word.
+
+        Parameters
+        ----------
+        value_a
+            The 12-bit value, from 0 to 4095, for channel A.
+        value_b
+            The 12-bit value, from 0 to 4095, for channel B.
+
+        Returns
+        -------
+        int
+            The stereo sample word.
+        """
+        return (DAC.frame(DAC.CHANNEL_A, value_a) << 16) | \
+            DAC.frame(DAC.CHANNEL_B, value_b)
+
+    @classmethod
+    def pack_block(cls, samples_a, samples_b, block) -> None:
+        """Pack a block of values for each channel into a block of stereo sample words.
+
+        Parameters
+        ----------
+        samples_a : sequence of int
+            The 12-bit values for channel A.
+        samples_b : sequence of int
+            The 12-bit values for channel B, as many as for channel A.
+        block : array.array
+            The array('I') into which the words are written.
+        """
+        for i in range(len(block)):
+            block[i] = cls.pack(samples_a[i], samples_b[i])
+
+    @property
+    def running(self) -> bool:
+        """Whether the stream has been started and not stopped."""
+        return self._running
+
+    def start(self) -> None:
+        """Start the stream, holding the idle value until a block is submitted."""
+        if self._running:
+            return
+
+        self._begin(self.pack(self.IDLE_VALUE, self.IDLE_VALUE))
+        self._running = True
+
+    def stop(self) -> None:
+        """Stop the stream, discarding any submitted blocks."""
+        if not self._running:
+            return
+
+        self._end()
+        self._running = False
+        self._playing = -1
+        self._ready[0] = 0
+        self._ready[1] = 0
+
+    def submit_block(self, block) -> bool:
+        """Copy a block into the free buffer to be played after the current block.
+
+        Parameters
+        ----------
+        block : array.array
+            The array('I') of block_size stereo sample words to play.
+
+        Returns
+        -------
+        bool
+            Whether the block was accepted. A block is refused when both
+            buffers are in use, until block_freed is next emitted.
+        """
+        i = self._next_fill
+        if self._ready[i] or self._playing == i:
+            return False
+
+        self._buffers[i][:] = block
+
+        irq_state = machine.disable_irq()
+        self._next_fill = 1 - i
+        if self._playing == -1 and self._running:
+            self._playing = i
+            self._transfer(self._buffers[i])
+        else:
+            self._ready[i] = 1
+        machine.enable_irq(irq_state)
+
+        return True
+
+    def reset_counters(self) -> None:
+        """Reset the underrun and block counters to zero."""
+        self.underrun_count = 0
+        self.block_count = 0
+
+    def _transfer_complete(self) -> None:
+        """Start the following block, if submitted, once a block has played.
+
+        This is called from the interrupt handler of the transfer, so
+        allocates no memory.
+        """
+        finished = self._playing
+        following = 1 - finished
+
+        if self._ready[following]:
+            self._ready[following] = 0
+            self._playing = following
+            self._transfer(self._buffers[following])
+        else:
+            self._playing = -1
+            self.underrun_count += 1
+
+        self.block_count += 1
+        self._notify_block_freed()
+
+    def _notify_block_freed(self) -> None:
+        """Emit block_freed when a block has played."""
+        self.block_freed.emit_value(self)
+
+    def _begin(self, idle_word: int) -> None:
+        """Prepare the hardware and output the idle word."""
+        raise NotImplementedError(
+            self.__class__.__name__ + " does not implement _begin."
+        )
+
+    def _transfer(self, buffer) -> None:
+        """Start playing a block buffer."""
+        raise NotImplementedError(
+            self.__class__.__name__ + " does not implement _transfer."
+        )
+
+    def _end(self) -> None:
+        """Stop the hardware."""
+        raise NotImplementedError(
+            self.__class__.__name__ + " does not implement _end."
+        )
+
+
+class FakeDACStream(DACStream):
+    """A DAC stream recording the words it plays, for testing on the host.
+
+    Nothing is played until finish_transfer is called, which plays the
+    whole of the current block, as the end of its transfer would.
+    """
+
+    def __init__(self,
+                 sample_rate_hz: int,
+                 block_size: int = DACStream.DEFAULT_BLOCK_SIZE):
+        super().__init__(sample_rate_hz, block_size)
+
+        self.words = []
+        """The stereo sample words played, in order."""
+
+        self.transferring = None
+        """The buffer of the current transfer, if any."""
+
+    def finish_transfer(self) -> None:
+        """Play the block of the current transfer and complete it."""
+        self.words.extend(self.transferring)
+        self.transferring = None
+        self._transfer_complete()
+
+    def _begin(self, idle_word: int) -> None:
+        self.words.append(idle_word)
+
+    def _transfer(self, buffer) -> None:
+        self.transferring = buffer
+
+    def _end(self) -> None:
+        self.transferring = None
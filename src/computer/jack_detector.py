@@ -0,0 +1,109 @@
+class JackDetector(object):
+    """Detects jacks in the input sockets in the background.
+
+    Rather than running the whole normalization probe pattern in one
+    blocking call (see Computer.update_input_sockets), the detector writes
+    one bit of the pattern per call to step and reads it back from every
+    socket that has matched the pattern so far. At the end of each full
+    pattern, a socket whose readback matched every bit is judged to have no
+    jack and any other socket to have one.
+
+    A socket's has_jack is only changed (emitting jack_inserted or
+    jack_removed) once that judgement has disagreed with it for
+    debounce_patterns consecutive patterns, so a change is reported at most
+    (debounce_patterns + 1) * n_bits steps after it happens.
+
+    Parameters
+    ----------
+    normalization_probe : NormalizationProbe
+        The normalization probe used to write the pattern.
+    sockets : list
+        The input sockets to watch, in the order in which to read them.
+    debounce_patterns : int
+        The number of consecutive patterns that must disagree with a socket's
+        has_jack before it is changed.
+    """
+    DEFAULT_DEBOUNCE_PATTERNS = 2
+    """The default number of patterns over which to debounce has_jack."""
+
+    def __init__(self,
+                 normalization_probe,
+                 sockets=(),
+                 debounce_patterns: int = DEFAULT_DEBOUNCE_PATTERNS):
+
+        if debounce_patterns not in range(1, 256):
+            raise ValueError(
+                "Invalid number of debounce patterns: ", debounce_patterns
+            )
+
+        self._normalization_probe = normalization_probe
+        self.debounce_patterns = debounce_patterns
+        self.set_sockets(sockets)
+
+    def set_sockets(self, sockets) -> None:
+        """Set the input sockets to watch, restarting the pattern.
+
+        Parameters
+        ----------
+        sockets : list
+            The input sockets to watch, in the order in which to read them.
+        """
+        self._sockets = tuple(sockets)
+
+        self._matches = bytearray(len(self._sockets))
+        """Whether each socket's readback has matched every bit of the pattern so far."""
+
+        self._disagreements = bytearray(len(self._sockets))
+        """The number of consecutive patterns disagreeing with each socket's has_jack."""
+
+        self._normalization_probe.restart()
+        self.__start_pattern()
+
+    def step(self) -> None:
+        """Write the next bit of the pattern and read it back from the sockets.
+
+        The sockets are read in the opposite direction on alternate bits, so
+        that multiplexed sockets are read starting from the multiplexer state
+        the previous bit finished in.
+        """
+        probe = self._normalization_probe
+        bit_index = probe.index
+        written_value = probe.write()
+
+        sockets = self._sockets
+        matches = self._matches
+        n_sockets = len(sockets)
+
+        if bit_index & 1:
+            indices = range(n_sockets - 1, -1, -1)
+        else:
+            indices = range(n_sockets)
+
+        for i in indices:
+            if matches[i] and sockets[i].read_norm_probe() != written_value:
+                matches[i] = 0
+
+        if probe.index == 0:
+            self.__complete_pattern()
+
+    def __start_pattern(self) -> None:
+        """Mark every socket as matching before the first bit of a pattern."""
+        for i in range(len(self._sockets)):
+            self._matches[i] = 1
+
+    def __complete_pattern(self) -> None:
+        """Judge each socket at the end of a pattern and debounce has_jack."""
+        for i in range(len(self._sockets)):
+            socket = self._sockets[i]
+            has_jack = not self._matches[i]
+
+            if has_jack == socket.has_jack:
+                self._disagreements[i] = 0
+                continue
+
+            self._disagreements[i] += 1
+            if self._disagreements[i] >= self.debounce_patterns:
+                self._disagreements[i] = 0
+                socket.has_jack = has_jack
+
+        self.__start_pattern()
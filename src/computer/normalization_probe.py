@@ -1,5 +1,4 @@
 import machine
-import random
 
 
 class NormalizationProbe(object):
@@ -13,28 +12,88 @@ class NormalizationProbe(object):
     values, it is possible to determine whether each socket is connected to the
     normalization probe, and therefore whether a jack is plugged into its
     socket.
-    A pseudorandom sequence of bits is generated on each instantiation. The
-    length of this sequence is hard-coded; the longer the sequence the lower
-    the possibility of coincidentally receiving it as a genuine input.
+
+    The pattern is generated by a maximal-length 16-bit Galois linear feedback
+    shift register (x^16 + x^14 + x^13 + x^11 + 1, period 65535), restarted
+    from the seed at the start of every pattern, so the same deterministic
+    sequence of n_bits bits is written each time. The register fits in a
+    micropython small integer, so no bit of the pattern allocates memory
+    (shifting a 32-bit random integer does, since on the RP2040 it is a
+    heap-allocated long integer). The default seed starts the pattern with
+    two different bits, so any prefix of two or more bits contains both
+    values.
+
+    The longer the pattern the lower the possibility of coincidentally
+    receiving it as a genuine input. A socket with a jack whose readback is
+    independent of the probe matches each bit with probability 1/2, so it
+    matches the first n bits of the pattern with probability 2^-n:
+
+    n bits | false positive probability
+    -------|---------------------------
+       4   | 6.3e-2
+       8   | 3.9e-3
+      16   | 1.5e-5
+      32   | 2.3e-10
+
+    A socket held at a constant level by a jack never matches a prefix of two
+    or more bits.
+
+    Parameters
+    ----------
+    seed : int
+        The non-zero 16-bit initial state of the shift register.
+    n_bits : int
+        The length of the pattern.
+    prefix_bits : int
+        The length of the short prefix of the pattern used to confirm that a
+        socket still has no jack inserted.
     """
     __IO_PIN_ID = 4
     __N_BITS = 32
+    __PREFIX_BITS = 8
+    __LFSR_TAPS = 0xB400
+    """The feedback taps of the shift register: x^16 + x^14 + x^13 + x^11 + 1."""
+
+    DEFAULT_SEED = 0xACE1
+    """The default initial state of the shift register."""
+
+    def __init__(self,
+                 seed: int = DEFAULT_SEED,
+                 n_bits: int = __N_BITS,
+                 prefix_bits: int = __PREFIX_BITS):
+
+        if seed not in range(1, 0x10000):
+            raise ValueError("Invalid shift register seed: ", seed)
+
+        if prefix_bits not in range(1, n_bits + 1):
+            raise ValueError("Invalid pattern prefix length: ", prefix_bits)
 
-    def __init__(self):
         self._pin = machine.Pin(self.__IO_PIN_ID,
                                 machine.Pin.OUT)
 
-        self.pattern = random.getrandbits(self.__N_BITS)
+        self.seed = seed
+        self.n_bits = n_bits
+        self.prefix_bits = prefix_bits
+
+        self._state = seed
+        self.index = 0
+
+    def restart(self) -> None:
+        """Restart the pattern from its first bit."""
+        self._state = self.seed
         self.index = 0
-        self.n_bits = self.__N_BITS
 
     def write(self):
         """Write the next bit of the pattern to pin 4."""
-        self._pin.value((self.pattern >> self.index) & 1)
+        bit = self._state & 1
+        self._pin.value(bit)
 
-        if self.index == self.__N_BITS - 1:
-            self.index = 0
+        if self.index == self.n_bits - 1:
+            self.restart()
         else:
+            self._state >>= 1
+            if bit:
+                self._state ^= self.__LFSR_TAPS
             self.index += 1
 
-        return self._pin.value()
+        return bit
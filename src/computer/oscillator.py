@@ -0,0 +1,248 @@
+import array
+import machine
+import math
+from computer.dac import DAC
+from connect.mapping import Mapping
+from connect.ranged_variable import RangedVariable
+
+
+class Oscillator(object):
+    """A two-voice wavetable oscillator playing through the CV/Audio outputs.
+
+    A timer interrupt runs at the sample rate, and on each tick advances a
+    phase accumulator for each channel of the DAC, looks up the sample at
+    the new phase in the channel's wavetable, and writes both samples to the
+    DAC in a single update (see DAC.write_pair).
+
+    Wavetables are array('H') of 12-bit samples (0 to 4095), whose length is
+    a power of two of at most 2**13. Each phase is a fixed-point index into
+    the table with 16 fractional bits, and wraps at the end of the table by
+    masking, so every phase stays below 2**30 and a tick allocates no
+    memory. A channel's frequency sets its phase increment,
+
+        increment = frequency * table length * 2**16 / sample rate
+
+    which can be changed at any time without stopping playback. With
+    interpolation, each sample is linearly interpolated between the two
+    table entries either side of the phase, using the fractional bits; this
+    reduces the distortion of small tables at low frequencies, at the cost
+    of a longer tick.
+
+    While the oscillator is running it owns the DAC, so the CV/Audio output
+    sockets should not be written to.
+
+    Parameters
+    ----------
+    sample_rate_hz : int
+        The number of samples written to each channel per second.
+    interpolate : bool
+        Whether to linearly interpolate between wavetable entries.
+    """
+    DEFAULT_SAMPLE_RATE_HZ = 8_000
+    """The default number of samples written to each channel per second."""
+
+    TABLE_SIZE = 256
+    """The length of the wavetables created by the table_from_function method."""
+
+    __FRACTION_BITS = 16
+    __FRACTION_MASK = (1 << __FRACTION_BITS) - 1
+    __MAX_TABLE_SIZE = 1 << 13
+    __N_CHANNELS = 2
+
+    __tables = {}
+    """The wavetables created so far, keyed by their function and size."""
+
+    def __init__(self,
+                 sample_rate_hz: int = DEFAULT_SAMPLE_RATE_HZ,
+                 interpolate: bool = False):
+
+        self.sample_rate_hz = sample_rate_hz
+        self.interpolate = interpolate
+
+        self._dac = DAC.shared()
+        self._timer = None
+
+        sine = self.table_from_function(math.sin)
+        self._tables = [sine] * self.__N_CHANNELS
+        self._phases = array.array("i", [0] * self.__N_CHANNELS)
+        self._increments = array.array("i", [0] * self.__N_CHANNELS)
+        self._phase_masks = array.array("i", [0] * self.__N_CHANNELS)
+        self._index_masks = array.array("i", [0] * self.__N_CHANNELS)
+        self._samples = array.array("i", [0] * self.__N_CHANNELS)
+
+        self.frequencies = tuple(
+            RangedVariable(value=0, minimum=0, maximum=sample_rate_hz // 2)
+            for _ in range(self.__N_CHANNELS)
+        )
+        """The frequency in Hz of each channel, up to half the sample rate."""
+
+        for channel in range(self.__N_CHANNELS):
+            self.set_table(channel, sine)
+
+        # bound once, since binding a method allocates
+        self._tick_ref = self.__tick
+
+    @classmethod
+    def table_from_function(cls, function, size: int = TABLE_SIZE):
+        """Get the wavetable tabulating one period of a function.
+
+        Parameters
+        ----------
+        function : callable
+            A function with period 2 pi, returning values in [-1, 1], such
+            as math.sin. Values returned outside that range are clipped.
+        size : int
+            The length of the wavetable, a power of two.
+
+        Returns
+        -------
+        array.array
+            The wavetable of 12-bit samples, shared with any other caller
+            passing the same function and size.
+        """
+        key = (function, size)
+        if key not in cls.__tables:
+            table = array.array("H", range(size))
+            for i in range(size):
+                value = int(round((function(2 * math.pi * i / size) + 1) *
+                                  DAC.MAX_VALUE / 2))
+                table[i] = min(max(value, 0), DAC.MAX_VALUE)
+            cls.__tables[key] = table
+
+        return cls.__tables[key]
+
+    def set_table(self, channel: int, table) -> None:
+        """Set the wavetable played by a channel.
+
+        Parameters
+        ----------
+        channel
+            The DAC channel, DAC.CHANNEL_A or DAC.CHANNEL_B.
+        table : array.array
+            The wavetable of 12-bit samples, whose length is a power of two
+            of at most 2**13.
+        """
+        size = len(table)
+        if size < 2 or size > self.__MAX_TABLE_SIZE or size & (size - 1):
+            raise ValueError("Invalid wavetable length: ", size)
+
+        # set the masks for the shorter table first, so the timer never
+        # indexes past the end of either table
+        phase_mask = (size << self.__FRACTION_BITS) - 1
+        if phase_mask < self._phase_masks[channel]:
+            self._phase_masks[channel] = phase_mask
+            self._index_masks[channel] = size - 1
+            self._tables[channel] = table
+        else:
+            self._tables[channel] = table
+            self._phase_masks[channel] = phase_mask
+            self._index_masks[channel] = size - 1
+
+        self.set_frequency(channel, self.frequencies[channel].value)
+
+    def set_frequency(self, channel: int, frequency_hz) -> None:
+        """Set the frequency of a channel, without interrupting playback.
+
+        Parameters
+        ----------
+        channel
+            The DAC channel, DAC.CHANNEL_A or DAC.CHANNEL_B.
+        frequency_hz : int or float
+            The frequency in Hz, clamped between 0 and half the sample rate.
+        """
+        frequency = self.frequencies[channel]
+        frequency.value = frequency_hz
+
+        self._increments[channel] = int(
+            frequency.value * len(self._tables[channel]) *
+            (1 << self.__FRACTION_BITS) / self.sample_rate_hz
+        )
+
+    def frequency_mapping(self, channel: int, ranged_variable):
+        """Create a mapping which sets the frequency of a channel from a ranged variable.
+
+        The mapping can be connected as a slot, e.g. to a knob's or CV
+        input's value_changed signal, to modulate the frequency during
+        playback. The range of frequencies mapped onto is the range of the
+        channel's ranged variable in frequencies.
+
+        Parameters
+        ----------
+        channel
+            The DAC channel, DAC.CHANNEL_A or DAC.CHANNEL_B.
+        ranged_variable : RangedVariable
+            The ranged variable from which to map the frequency.
+
+        Returns
+        -------
+        Mapping
+            The mapping from the ranged variable to the channel's frequency.
+        """
+        return Mapping(ranged_variable,
+                       self.frequencies[channel],
+                       callback=lambda frequency_hz:
+                           self.set_frequency(channel, frequency_hz))
+
+    @property
+    def running(self) -> bool:
+        """Whether the oscillator is playing."""
+        return self._timer is not None
+
+    def start(self) -> None:
+        """Start playing, from the current phase of each channel."""
+        if self._timer is not None:
+            return
+
+        if self.interpolate:
+            self._tick_ref = self.__tick_interpolated
+        else:
+            self._tick_ref = self.__tick
+
+        self._timer = machine.Timer(-1,
+                                    freq=self.sample_rate_hz,
+                                    callback=self._tick_ref)
+
+    def stop(self) -> None:
+        """Stop playing, leaving the outputs at their last samples."""
+        if self._timer is not None:
+            self._timer.deinit()
+            self._timer = None
+
+    def reset_phases(self) -> None:
+        """Restart each channel from the start of its wavetable."""
+        for channel in range(self.__N_CHANNELS):
+            self._phases[channel] = 0
+
+    def __tick(self, _) -> None:
+        """Write the next sample of each channel to the DAC."""
+        phases = self._phases
+        samples = self._samples
+        shift = self.__FRACTION_BITS
+
+        for channel in range(self.__N_CHANNELS):
+            phase = (phases[channel] + self._increments[channel]) & \
+                self._phase_masks[channel]
+            phases[channel] = phase
+            samples[channel] = self._tables[channel][phase >> shift]
+
+        self._dac.write_pair(samples[0], samples[1])
+
+    def __tick_interpolated(self, _) -> None:
+        """Write the next linearly interpolated sample of each channel to the DAC."""
+        phases = self._phases
+        samples = self._samples
+        shift = self.__FRACTION_BITS
+        fraction_mask = self.__FRACTION_MASK
+
+        for channel in range(self.__N_CHANNELS):
+            phase = (phases[channel] + self._increments[channel]) & \
+                self._phase_masks[channel]
+            phases[channel] = phase
+
+            table = self._tables[channel]
+            index = phase >> shift
+            sample = table[index]
+            step = table[(index + 1) & self._index_masks[channel]] - sample
+            samples[channel] = sample + ((step * (phase & fraction_mask)) >> shift)
+
+        self._dac.write_pair(samples[0], samples[1])
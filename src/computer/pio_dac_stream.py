@@ -0,0 +1,132 @@
+import machine
+import rp2
+from computer.dac import DAC
+from computer.dac_stream import DACStream
+from connect.deferred_queue import DeferredQueue
+
+
+@rp2.asm_pio(out_init=rp2.PIO.OUT_LOW,
+             set_init=rp2.PIO.OUT_HIGH,
+             sideset_init=rp2.PIO.OUT_LOW,
+             out_shiftdir=rp2.PIO.SHIFT_LEFT,
+             fifo_join=rp2.PIO.JOIN_TX)
+def _mcp4822_stereo():
+    # Send each stereo sample word as two 16-bit frames, in 72 cycles.
+    # Out pin: SDI (19). Set pin: chip select (21). Side-set pin: SCK (18).
+    # Data is changed with SCK low and sampled by the DAC as SCK rises, and
+    # each frame is latched as chip select rises. If the FIFO is empty, pull
+    # copies X, which holds the last word, so the last sample is repeated.
+    pull(noblock)             .side(0)
+    mov(x, osr)               .side(0)
+    set(pins, 0)              .side(0)
+    set(y, 15)                .side(0)
+    label("frame_a")
+    out(pins, 1)              .side(0)
+    jmp(y_dec, "frame_a")     .side(1)
+    set(pins, 1)              .side(0)
+    set(pins, 0)              .side(0)
+    set(y, 15)                .side(0)
+    label("frame_b")
+    out(pins, 1)              .side(0)
+    jmp(y_dec, "frame_b")     .side(1)
+    set(pins, 1)              .side(0)
+
+
+class PIODACStream(DACStream):
+    """A DAC stream played by a PIO state machine fed by DMA.
+
+    The state machine clocks out one stereo sample every 72 cycles and is
+    clocked at 72 times the sample rate, so samples are written at exactly
+    the sample rate whatever the CPU is doing. A DMA channel, paced by the
+    state machine's transmit FIFO, copies each block into the FIFO; its
+    completion interrupt starts the next block and defers block_freed to the
+    shared DeferredQueue. The state machine takes over the DAC's SPI pins
+    until the stream is stopped.
+
+    The state machine's clock divider limits the sample rate to between
+    about 30 Hz and 500 kHz (where SCK reaches the MCP4822's 20 MHz limit).
+
+    Parameters
+    ----------
+    sample_rate_hz : int
+        The number of stereo samples played per second.
+    block_size : int
+        The number of stereo samples in each block.
+    state_machine_id : int
+        The ID, from 0 to 7, of the PIO state machine to use.
+    """
+    CYCLES_PER_SAMPLE = 72
+    """The number of state machine cycles taken to send one stereo sample."""
+
+    DEFAULT_STATE_MACHINE_ID = 0
+    """The default ID of the PIO state machine used."""
+
+    def __init__(self,
+                 sample_rate_hz: int,
+                 block_size: int = DACStream.DEFAULT_BLOCK_SIZE,
+                 state_machine_id: int = DEFAULT_STATE_MACHINE_ID):
+        super().__init__(sample_rate_hz, block_size)
+
+        if state_machine_id not in range(8):
+            raise ValueError("Invalid state machine ID: ", state_machine_id)
+
+        self.state_machine_id = state_machine_id
+        self.block_freed.defer_to(DeferredQueue.shared())
+
+        self._state_machine = None
+        self._dma = None
+        self._dma_ctrl = 0
+
+        # bound once, since binding a method allocates
+        self._irq_ref = self.__on_transfer_complete
+
+    def _begin(self, idle_word: int) -> None:
+        self._state_machine = rp2.StateMachine(
+            self.state_machine_id,
+            _mcp4822_stereo,
+            freq=self.sample_rate_hz * self.CYCLES_PER_SAMPLE,
+            out_base=machine.Pin(DAC.SDI_MOSI_PIN_ID),
+            set_base=machine.Pin(DAC.CS_PIN_ID),
+            sideset_base=machine.Pin(DAC.SCK_PIN_ID),
+        )
+
+        # load the idle word into X, which is repeated until a block arrives
+        self._state_machine.put(idle_word)
+        self._state_machine.exec("pull()")
+        self._state_machine.exec("mov(x, osr)")
+
+        self._dma = rp2.DMA()
+        pio, index = divmod(self.state_machine_id, 4)
+        self._dma_ctrl = self._dma.pack_ctrl(
+            size=2,
+            inc_write=False,
+            treq_sel=(pio << 3) | index,
+            irq_quiet=False,
+        )
+        self._dma.irq(handler=self._irq_ref, hard=True)
+
+        self._state_machine.active(1)
+
+    def _transfer(self, buffer) -> None:
+        self._dma.config(read=buffer,
+                         write=self._state_machine,
+                         count=len(buffer),
+                         ctrl=self._dma_ctrl,
+                         trigger=True)
+
+    def _end(self) -> None:
+        self._dma.irq(handler=None)
+        self._dma.active(0)
+        self._dma.close()
+        self._dma = None
+
+        self._state_machine.active(0)
+        self._state_machine = None
+
+        DAC.shared().init()
+
+    def _notify_block_freed(self) -> None:
+        self.block_freed.emit_deferred(self)
+
+    def __on_transfer_complete(self, _) -> None:
+        self._transfer_complete()
@@ -0,0 +1,93 @@
+import machine
+import rp2
+from computer.pulse_generator import PulseGenerator
+
+
+@rp2.asm_pio(set_init=rp2.PIO.OUT_HIGH,
+             fifo_join=rp2.PIO.JOIN_TX)
+def _pulse_train():
+    # Play commands of three words, one cycle per microsecond: the count
+    # less one, then the on and off times less 3 and 4 cycles. The output
+    # is inverted, so the set pin is low while a pulse is on. ISR is free,
+    # so holds the on time while OSR holds the off time. A count word of
+    # all ones (a count of FOREVER) repeats the pulse until the state
+    # machine is stopped, in a loop with the same timing which never
+    # counts down.
+    wrap_target()
+    pull(block)
+    mov(x, osr)
+    pull(block)
+    mov(isr, osr)
+    pull(block)
+    mov(y, invert(null))
+    jmp(x_not_y, "pulse")
+    label("forever")
+    set(pins, 0)
+    mov(y, isr)
+    label("forever_high")
+    jmp(y_dec, "forever_high")
+    set(pins, 1)
+    mov(y, osr)
+    label("forever_low")
+    jmp(y_dec, "forever_low")
+    jmp("forever")
+    label("pulse")
+    set(pins, 0)
+    mov(y, isr)
+    label("high")
+    jmp(y_dec, "high")
+    set(pins, 1)
+    mov(y, osr)
+    label("low")
+    jmp(y_dec, "low")
+    jmp(x_dec, "pulse")
+    wrap()
+
+
+class PIOPulseGenerator(PulseGenerator):
+    """A pulse generator played by a PIO state machine.
+
+    The state machine is clocked at 1 MHz, so each cycle is a microsecond
+    and pulses are timed exactly whatever the CPU is doing. Commands are
+    put into its transmit FIFO, joined to hold eight words. The state
+    machine takes over the output's pin until the generator is stopped.
+
+    Parameters
+    ----------
+    pin_id : int
+        The ID of the GPIO pin of the pulse output.
+    state_machine_id : int
+        The ID, from 0 to 7, of the PIO state machine to use.
+    """
+    FREQUENCY_HZ = 1_000_000
+    """The clock frequency of the state machine, one cycle per microsecond."""
+
+    def __init__(self, pin_id: int, state_machine_id: int):
+        super().__init__()
+
+        if state_machine_id not in range(8):
+            raise ValueError("Invalid state machine ID: ", state_machine_id)
+
+        self.pin_id = pin_id
+        self.state_machine_id = state_machine_id
+
+        self._state_machine = None
+
+    def _begin(self) -> None:
+        self._state_machine = rp2.StateMachine(
+            self.state_machine_id,
+            _pulse_train,
+            freq=self.FREQUENCY_HZ,
+            set_base=machine.Pin(self.pin_id),
+        )
+        self._state_machine.active(1)
+
+    def _free_words(self) -> int:
+        return self.FIFO_WORDS - self._state_machine.tx_fifo()
+
+    def _put(self, word: int) -> None:
+        self._state_machine.put(word)
+
+    def _end(self) -> None:
+        self._state_machine.active(0)
+        self._state_machine = None
@@ -0,0 +1,228 @@
+class PulseGenerator(object):
+    """A generator of timed pulses at one pulse output, driven by commands.
+
+    Each command asks for count pulses, each on for high_us and then off for
+    low_us microseconds. Commands are queued in a small FIFO and played in
+    order, one after another, so bursts, ratchets and fixed-width triggers
+    are timed by the generator rather than by the interpreter, and cost no
+    CPU time per edge.
+
+    A command is sent as three words: the count less one, then the on and
+    off times less the generator's fixed overheads (see encode). The FIFO
+    holds FIFO_WORDS words, so only a couple of commands can be queued at
+    once; send refuses a command rather than waiting for room, so it never
+    blocks and may be called from an interrupt handler.
+
+    A command with a count of FOREVER repeats its pulse until the generator
+    is stopped, e.g. to send a steady clock; commands queued after it are
+    never played.
+
+    Successive commands follow each other without a gap beyond the off time
+    of the last pulse of the first, and the few microseconds taken to read
+    the next command.
+
+    This class holds the command logic; playing the commands is left to the
+    subclasses, PIOPulseGenerator on the Computer and FakePulseGenerator on
+    the host.
+    """
+    MIN_HIGH_US = 3
+    """The shortest time in microseconds for which a pulse may be on."""
+
+    MIN_LOW_US = 4
+    """The shortest time in microseconds for which a pulse may be off."""
+
+    MAX_VALUE = 0x3FFFFFFF
+    """The largest time or count in a command, kept within a small integer."""
+
+    FOREVER = 0
+    """The count of a command repeating its pulse until the generator is stopped."""
+
+    FIFO_WORDS = 8
+    """The number of command words which can be queued."""
+
+    WORDS_PER_COMMAND = 3
+    """The number of words in each command."""
+
+    def __init__(self):
+        self.command_count = 0
+        """The number of commands accepted."""
+
+        self.refused_count = 0
+        """The number of commands refused as the FIFO was full."""
+
+        self._running = False
+
+    @classmethod
+    def encode(cls, high_us: int, low_us: int, count: int) -> tuple:
+        """Encode a command as the words sent to the generator.
+
+        Parameters
+        ----------
+        high_us
+            The time in microseconds for which each pulse is on.
+        low_us
+            The time in microseconds for which each pulse is off.
+        count
+            The number of pulses, or FOREVER.
+
+        Returns
+        -------
+        tuple of int
+            The count less one (-1, all ones in the word, for FOREVER), and
+            the on and off times less the generator's overheads.
+        """
+        cls._check(high_us, low_us, count)
+
+        return (count - 1,
+                high_us - cls.MIN_HIGH_US,
+                low_us - cls.MIN_LOW_US)
+
+    @classmethod
+    def _check(cls, high_us: int, low_us: int, count: int) -> None:
+        """Raise a ValueError if a command is out of range."""
+        if high_us < cls.MIN_HIGH_US or high_us > cls.MAX_VALUE:
+            raise ValueError("Invalid pulse on time: ", high_us)
+
+        if low_us < cls.MIN_LOW_US or low_us > cls.MAX_VALUE:
+            raise ValueError("Invalid pulse off time: ", low_us)
+
+        if count < cls.FOREVER or count > cls.MAX_VALUE:
+            raise ValueError("Invalid pulse count: ", count)
+
+    @property
+    def running(self) -> bool:
+        """Whether the generator has been started and not stopped."""
+        return self._running
+
+    def start(self) -> None:
+        """Start the generator, with the output off until a command is sent."""
+        if self._running:
+            return
+
+        self._begin()
+        self._running = True
+
+    def stop(self) -> None:
+        """Stop the generator, discarding any queued commands."""
+        if not self._running:
+            return
+
+        self._end()
+        self._running = False
+
+    def send(self, high_us: int, low_us: int, count: int = 1) -> bool:
+        """Queue a command to play a number of pulses.
+
+        Parameters
+        ----------
+        high_us
+            The time in microseconds for which each pulse is on.
+        low_us
+            The time in microseconds for which each pulse is off.
+        count
+            The number of pulses, or FOREVER.
+
+        Returns
+        -------
+        bool
+            Whether the command was accepted. A command is refused when the
+            generator is stopped or the FIFO has no room for it.
+        """
+        self._check(high_us, low_us, count)
+
+        if not self._running or self._free_words() < self.WORDS_PER_COMMAND:
+            self.refused_count += 1
+            return False
+
+        # the words are put one by one, as building a tuple would allocate
+        self._put(count - 1)
+        self._put(high_us - self.MIN_HIGH_US)
+        self._put(low_us - self.MIN_LOW_US)
+        self.command_count += 1
+
+        return True
+
+    def trigger(self, width_us: int) -> bool:
+        """Queue a single pulse of a fixed width.
+
+        Parameters
+        ----------
+        width_us
+            The time in microseconds for which the pulse is on.
+
+        Returns
+        -------
+        bool
+            Whether the command was accepted.
+        """
+        return self.send(width_us, self.MIN_LOW_US)
+
+    def reset_counters(self) -> None:
+        """Reset the command and refused command counters to zero."""
+        self.command_count = 0
+        self.refused_count = 0
+
+    def _begin(self) -> None:
+        """Prepare the hardware with the output off."""
+        raise NotImplementedError(
+            self.__class__.__name__ + " does not implement _begin."
+        )
+
+    def _free_words(self) -> int:
+        """Get the number of words for which the FIFO has room."""
+        raise NotImplementedError(
+            self.__class__.__name__ + " does not implement _free_words."
+        )
+
+    def _put(self, word: int) -> None:
+        """Put a command word into the FIFO."""
+        raise NotImplementedError(
+            self.__class__.__name__ + " does not implement _put."
+        )
+
+    def _end(self) -> None:
+        """Stop the hardware."""
+        raise NotImplementedError(
+            self.__class__.__name__ + " does not implement _end."
+        )
+
+
+class FakePulseGenerator(PulseGenerator):
+    """A pulse generator recording the commands sent to it, for testing on the host.
+
+    Queued commands stay in the FIFO until finish_command is called, which
+    plays the oldest, as the generator would once its pulses were done.
+    """
+
+    def __init__(self):
+        super().__init__()
+
+        self.words = []
+        """The command words sent, in order."""
+
+        self.commands = []
+        """The (high_us, low_us, count) commands played, in order."""
+
+        self.fifo = []
+        """The command words queued and not yet played."""
+
+    def finish_command(self) -> None:
+        """Play the oldest queued command."""
+        count, high, low = self.fifo[:self.WORDS_PER_COMMAND]
+        del self.fifo[:self.WORDS_PER_COMMAND]
+        self.commands.append((high + self.MIN_HIGH_US,
+                              low + self.MIN_LOW_US,
+                              count + 1))
+
+    def _begin(self) -> None:
+        pass
+
+    def _free_words(self) -> int:
+        return self.FIFO_WORDS - len(self.fifo)
+
+    def _put(self, word: int) -> None:
+        self.words.append(word)
+        self.fifo.append(word)
+
+    def _end(self) -> None:
+        self.fifo.clear()
@@ -59,6 +59,7 @@ class CVInputSocket(MultiplexedInput):
             minimum=self.min_value,
             maximum=self.max_value
         )
+        self._scale_curve()
 
     @property
     def io_pin_id(self) -> int:
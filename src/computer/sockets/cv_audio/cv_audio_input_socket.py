@@ -71,14 +71,7 @@ class CVAudioInputSocket(AnalogInput):
             minimum=self.min_value,
             maximum=self.max_value
         )
-
-    def read(self) -> None:
-        """Read a 12-bit uint value from the RP2040's ADC."""
-        value = self.ranged_variable.value
-        self.ranged_variable.value = self.adc.read_u16()
-
-        if abs(self.ranged_variable.value - value) > 32:
-            self.value_changed.emit(ranged_variable=self.ranged_variable)
+        self._scale_curve()
 
     @property
     def adc(self):
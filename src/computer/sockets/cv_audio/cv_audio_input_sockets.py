@@ -1,28 +1,222 @@
 import array
+import machine
+import time
 from computer.sockets.cv_audio.cv_audio_input_socket import CVAudioInputSocketOne
 from computer.sockets.cv_audio.cv_audio_input_socket import CVAudioInputSocketTwo
+from connect.deferred_queue import DeferredQueue
+from connect.signal import Signal
 
 
 class CVAudioInputSockets(object):
-    """The pair of audio input sockets."""
+    """The pair of audio input sockets.
+
+    Both sockets can be read together into blocks of samples at a fixed
+    sample rate, either on demand (capture and capture_into, which wait
+    until the block is full) or continuously in the background
+    (start_capture). Blocks are array('H') of raw 16-bit readings, and are
+    preallocated, so capturing allocates no memory.
+
+    A background capture fills a pair of blocks from a hard timer interrupt,
+    so the sample timing does not wait on the scheduler, while the
+    previously filled pair is processed, swapping the pairs each time a
+    block is complete and emitting block_captured. If a block is completed
+    before the previous one was taken with captured_block, it is counted in
+    overrun_count.
+    """
 
     def __init__(self):
         self.socket_one = CVAudioInputSocketOne()
         self.socket_two = CVAudioInputSocketTwo()
 
+        self._adc_one = self.socket_one.adc
+        self._adc_two = self.socket_two.adc
+
+        self._capture_buffers = None
+
+        self.block_captured = Signal()
+        """Signal emitted, with these sockets, when a background capture completes a block."""
+        self.block_captured.defer_to(DeferredQueue.shared())
+
+        self.overrun_count = 0
+        """The number of background capture blocks completed before the previous was taken."""
+
+        self._timer = None
+        self._blocks = None
+        self._filling = 0
+        self._index = 0
+        self._block_taken = True
+        self._block_completed = False
+
+        # bound once, since binding a method allocates
+        self._sample_ref = self.__sample
+
     def read(self):
-        return (self.socket_one.read_u16(),
-                self.socket_two.read_u16())
+        """Read the raw 16-bit value of each socket.
 
-    def read_range(self, num_samples=1):
+        Returns
+        -------
+        tuple of int
+            The readings of sockets one and two.
+        """
+        return (self._adc_one.read_u16(),
+                self._adc_two.read_u16())
 
-        left_values = array.array(typecode="I") * num_samples
-        right_values = array.array(typecode="I") * num_samples
+    def read_range(self, num_samples=1):
+        """Get the range of num_samples consecutive readings of each socket.
 
-        for i in range(0, num_samples):
-            left_values[i] = self.socket_one.read_u16()
-            right_values[i] = self.socket_two.read_u16()
+        Returns
+        -------
+        tuple of int
+            The difference between the largest and smallest readings of
+            sockets one and two.
+        """
+        left_values, right_values = self.capture(num_samples)
 
         return (max(left_values) - min(left_values),
                 max(right_values) - min(right_values))
 
+    def capture(self, num_samples: int, sample_rate_hz: int = None):
+        """Capture a block of readings of each socket into reused buffers.
+
+        The buffers are kept by these sockets and only reallocated when
+        num_samples changes, so their contents are overwritten by the next
+        capture.
+
+        Parameters
+        ----------
+        num_samples
+            The number of readings of each socket.
+        sample_rate_hz
+            The number of readings of each socket per second. If None, the
+            sockets are read as fast as possible.
+
+        Returns
+        -------
+        tuple of array.array
+            The array('H') of readings of sockets one and two.
+        """
+        buffers = self._capture_buffers
+        if buffers is None or len(buffers[0]) != num_samples:
+            buffers = (array.array("H", [0] * num_samples),
+                       array.array("H", [0] * num_samples))
+            self._capture_buffers = buffers
+
+        self.capture_into(buffers[0], buffers[1], sample_rate_hz)
+
+        return buffers
+
+    def capture_into(self, buffer_left, buffer_right, sample_rate_hz: int = None):
+        """Fill preallocated buffers with readings of each socket.
+
+        Readings are scheduled against a fixed deadline for each sample,
+        rather than a delay between them, so the sample rate does not drift.
+
+        Parameters
+        ----------
+        buffer_left : array.array
+            The array('H') to fill with readings of socket one.
+        buffer_right : array.array
+            The array('H') to fill with readings of socket two, at least as
+            long as buffer_left.
+        sample_rate_hz
+            The number of readings of each socket per second. If None, the
+            sockets are read as fast as possible.
+        """
+        adc_one = self._adc_one
+        adc_two = self._adc_two
+
+        if sample_rate_hz is None:
+            for i in range(len(buffer_left)):
+                buffer_left[i] = adc_one.read_u16()
+                buffer_right[i] = adc_two.read_u16()
+            return
+
+        period_us = 1_000_000 // sample_rate_hz
+        deadline = time.ticks_us()
+
+        for i in range(len(buffer_left)):
+            while time.ticks_diff(deadline, time.ticks_us()) > 0:
+                pass
+            buffer_left[i] = adc_one.read_u16()
+            buffer_right[i] = adc_two.read_u16()
+            deadline = time.ticks_add(deadline, period_us)
+
+    @property
+    def capturing(self) -> bool:
+        """Whether a background capture is running."""
+        return self._timer is not None
+
+    def start_capture(self, block_size: int, sample_rate_hz: int) -> None:
+        """Start capturing blocks of readings in the background.
+
+        Parameters
+        ----------
+        block_size
+            The number of readings of each socket in a block.
+        sample_rate_hz
+            The number of readings of each socket per second.
+        """
+        self.stop_capture()
+
+        self._blocks = tuple(
+            (array.array("H", [0] * block_size),
+             array.array("H", [0] * block_size))
+            for _ in range(2)
+        )
+        self._filling = 0
+        self._index = 0
+        self._block_taken = True
+        self._block_completed = False
+
+        self._timer = machine.Timer(-1,
+                                    freq=sample_rate_hz,
+                                    callback=self._sample_ref,
+                                    hard=True)
+
+    def stop_capture(self) -> None:
+        """Stop capturing in the background."""
+        if self._timer is not None:
+            self._timer.deinit()
+            self._timer = None
+
+    @property
+    def captured_block(self):
+        """The most recently completed block of a background capture.
+
+        Returns
+        -------
+        tuple of array.array or None
+            The array('H') of readings of sockets one and two. They are
+            filled again after the next block completes, so should be
+            processed before then. None if no block has been completed
+            since the capture was started.
+        """
+        if not self._block_completed:
+            return None
+
+        self._block_taken = True
+
+        return self._blocks[1 - self._filling]
+
+    def __sample(self, _) -> None:
+        """Take one reading of each socket for a background capture."""
+        left, right = self._blocks[self._filling]
+        index = self._index
+
+        left[index] = self._adc_one.read_u16()
+        right[index] = self._adc_two.read_u16()
+
+        index += 1
+        if index < len(left):
+            self._index = index
+            return
+
+        self._index = 0
+        self._filling = 1 - self._filling
+        self._block_completed = True
+
+        if not self._block_taken:
+            self.overrun_count += 1
+        self._block_taken = False
+
+        self.block_captured.emit_deferred(self)
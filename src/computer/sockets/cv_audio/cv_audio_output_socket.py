@@ -1,5 +1,5 @@
-import machine
 from computer.base.analog_output import AnalogOutput
+from computer.dac import DAC
 
 
 class CVAudioOutputSocket(AnalogOutput):
@@ -24,42 +24,17 @@ class CVAudioOutputSocket(AnalogOutput):
     There are two analog outputs on the DAC that are going to the sockets
     Each 16-bit word written to the DAC over SPI has a flag on byte 15 for which DAC you want to write to.
     The datasheet has the rest, but there are 12 bits for the value.
-    """
-
-    __SCK_PIN_ID = 18
-    """Pin ID for clock signal from the RP2040 to the DAC."""
-
-    __SDI_MOSI_PIN_ID = 19
-    """Pin ID for serial data from RP2040 to the DAC, most-significant bit first."""
-
-    __CS_PIN_ID = 21
-    """Active-low chip select signal from RP2040 to enable communication with the DAC."""
-
-    __BAUD_RATE_HZ = 20_000_000
-    """The max SCK clock rate (in Hz) from the MCP4822 datasheet. Equal to 20 MHz"""
 
-    __BITS = 8
-    """The width in bits of each transfer."""
+    Both sockets write through the shared DAC driver (see DAC.shared), each
+    to its own dac_channel.
+    """
 
     __HARDWARE_MIN = 0
     __HARDWARE_MAX = 4095
 
     def __init__(self):
         super().__init__()
-        # create a chip select on the documented SPI CS pin
-        self.__chip_select_pin = machine.Pin(self.__CS_PIN_ID,
-                                             mode=machine.Pin.OUT, value=1)
-
-        self.__spi = machine.SPI(
-            id=0,
-            baudrate=self.__BAUD_RATE_HZ,
-            polarity=0,
-            phase=0,
-            bits=self.__BITS,
-            firstbit=machine.SPI.MSB,
-            sck=self.__SCK_PIN_ID,
-            mosi=self.__SDI_MOSI_PIN_ID,
-        )
+        self.__dac = DAC.shared()
 
     @property
     def hardware_min(self) -> int:
@@ -69,6 +44,13 @@ class CVAudioOutputSocket(AnalogOutput):
     def hardware_max(self) -> int:
         return self.__HARDWARE_MAX
 
+    @property
+    def dac_channel(self) -> int:
+        """The channel of the DAC which drives this output socket."""
+        raise NotImplementedError(
+            self.__class__.__name__ + " does not implement dac_channel."
+        )
+
     def write(self, value: int):
         """Write the given value to the DAC.
 
@@ -77,25 +59,10 @@ class CVAudioOutputSocket(AnalogOutput):
         value
             The 12-bit uint (a python int ranging 0 to 4095) to write.
 
-        Writes to the DAC are 16-bit words.
-        The value to write to the DAC is a 12-bit unsigned integer.
-
-        The bytes object (immutable) is 16-bits where:
-
-        15 : DAC_SELECTION_BIT in {0, 1}
-        14 : IGNORED
-        13 : Output gain selection bit, hard-coded to 1
-        12 : Output Shutdown Control bit, hard-coded to 1
-        11-0 : the data value to write to the DAC
+        The value is written to this socket's channel of the shared DAC
+        driver, which allocates no memory; see DAC.write.
         """
-
-        dac_data = self.__DAC_STRING | (int(4095 - value) & 0xFFF)
-
-        try:
-            self.__chip_select_pin.value(0)
-            self.__spi.write(bytes((dac_data >> 8, dac_data & 0xFF)))
-        finally:
-            self.__chip_select_pin.value(1)
+        self.__dac.write(self.dac_channel, value)
 
     def __str__(self):
         return self.__class__.__name__ + ": (min = " + str(
@@ -104,9 +71,17 @@ class CVAudioOutputSocket(AnalogOutput):
 
 class CVAudioOutputSocketOne(CVAudioOutputSocket):
     """The first (leftmost) CV/Audio output socket."""
-    __DAC_STRING = 0b0011000000000000
+
+    @property
+    def dac_channel(self) -> int:
+        """The channel of the DAC which drives this output socket."""
+        return DAC.CHANNEL_A
 
 
 class CVAudioOutputSocketTwo(CVAudioOutputSocket):
     """The second (rightmost) CV/Audio output socket."""
-    __DAC_STRING = 0b1011000000000000
+
+    @property
+    def dac_channel(self) -> int:
+        """The channel of the DAC which drives this output socket."""
+        return DAC.CHANNEL_B
@@ -1,11 +1,115 @@
 import array
+from computer.dac import DAC
+from computer.dac_stream import DACStream
+from computer.pio_dac_stream import PIODACStream
 from computer.sockets.cv_audio.cv_audio_output_socket import CVAudioOutputSocketOne
 from computer.sockets.cv_audio.cv_audio_output_socket import CVAudioOutputSocketTwo
+from connect.signal import Signal
 
 
 class CVAudioOutputSockets(object):
-    """The pair of audio output sockets."""
+    """The pair of audio output sockets.
+
+    Values can be written to both sockets at once with write, or streamed to
+    them at an exact sample rate in blocks of stereo samples, see
+    start_stream and DACStream.
+    """
 
     def __init__(self):
         self.socket_one = CVAudioOutputSocketOne()
         self.socket_two = CVAudioOutputSocketTwo()
+        self.__dac = DAC.shared()
+
+        self.__stream = None
+
+        self.block_freed = Signal()
+        """Signal emitted, with the stream, when a block of the stream has been played."""
+
+        # bound once, so the same slot is connected to and disconnected from each stream
+        self.__emit_block_freed = self.block_freed.emit_value
+
+    def write(self, value_one: int, value_two: int) -> None:
+        """Write a value to each socket in a single DAC update.
+
+        Parameters
+        ----------
+        value_one
+            The 12-bit uint (a python int ranging 0 to 4095) to write to
+            socket one.
+        value_two
+            The 12-bit uint (a python int ranging 0 to 4095) to write to
+            socket two.
+        """
+        self.__dac.write_pair(value_one, value_two)
+
+    @property
+    def stream(self):
+        """The stream playing to the sockets, if any."""
+        return self.__stream
+
+    @property
+    def underrun_count(self) -> int:
+        """The number of times the stream ran out of submitted blocks."""
+        if self.__stream is None:
+            return 0
+
+        return self.__stream.underrun_count
+
+    def start_stream(self,
+                     sample_rate_hz: int,
+                     block_size: int = DACStream.DEFAULT_BLOCK_SIZE,
+                     stream=None):
+        """Start streaming blocks of stereo samples to the sockets.
+
+        Until the stream is stopped, the sockets must not be written to
+        directly.
+
+        Parameters
+        ----------
+        sample_rate_hz
+            The number of stereo samples played per second.
+        block_size
+            The number of stereo samples in each block.
+        stream : DACStream, optional
+            The stream to play, such as a FakeDACStream on the host. By
+            default a PIODACStream is created.
+
+        Returns
+        -------
+        DACStream
+            The started stream.
+        """
+        self.stop_stream()
+
+        if stream is None:
+            stream = PIODACStream(sample_rate_hz, block_size)
+
+        stream.block_freed.connect(self.__emit_block_freed)
+        stream.start()
+        self.__stream = stream
+
+        return stream
+
+    def submit_block(self, block) -> bool:
+        """Submit a block of stereo sample words to the stream.
+
+        Parameters
+        ----------
+        block : array.array
+            The array('I') of stereo sample words, see DACStream.pack_block.
+
+        Returns
+        -------
+        bool
+            Whether the block was accepted; see DACStream.submit_block.
+        """
+        return self.__stream.submit_block(block)
+
+    def stop_stream(self) -> None:
+        """Stop the stream, if any, returning the sockets to direct writes."""
+        if self.__stream is None:
+            return
+
+        self.__stream.stop()
+        self.__stream.block_freed.disconnect(self.__emit_block_freed)
+        self.__stream = None
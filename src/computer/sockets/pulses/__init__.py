@@ -2,6 +2,7 @@
 Simple digital on/off signals, buffered and scaled with transistors.
 Use them for clocks, pulses, gates. They could also produce unfiltered PWM signals,
 so could maybe be used for gnarly audio (loud!) or gritty CV.
+PulseOutputSocket.start_clock sends such a signal from a hardware PWM slice, at no CPU cost.
 They'll often be used to trigger the envelopes, which are Serge-style voltage controlled slopes.
 The gates are about 5-6V
 """
\ No newline at end of file
@@ -1,5 +1,8 @@
+import array
 import machine
+import time
 from computer.base.hardware_component import HardwareComponent
+from connect.deferred_queue import DeferredQueue
 from connect.signal import Signal
 
 
@@ -11,6 +14,12 @@ class PulseInputSocket(HardwareComponent):
     NB: Input pin must have the pull-up enabled, this powers the transistor.
 
     The gates are about 5-6v
+
+    In capture mode (see start_capture), the hard interrupt handler also
+    records the time in microseconds of each falling edge in a preallocated
+    ring of timestamps, before any scheduling delay, so the period of a
+    clock at this input can be measured accurately however busy the main
+    loop is (see last_period, average_period and jitter).
     """
     __ON_VALUE = 0
     """The value used to represent "on" for this pulse input."""
@@ -18,6 +27,12 @@ class PulseInputSocket(HardwareComponent):
     __OFF_VALUE = 1
     """The value used to represent "off" for this pulse input."""
 
+    __EDGE_COUNT_MAX = 0x3FFFFFFF
+    """The largest edge count, the largest micropython small integer."""
+
+    __EDGE_COUNT_WRAP = 0x20000000
+    """The amount the edge count is reduced by at its largest, a multiple of every ring size."""
+
     def __init__(self):
 
         self._pin = machine.Pin(self.io_pin_id,
@@ -25,7 +40,13 @@ class PulseInputSocket(HardwareComponent):
                                 machine.Pin.PULL_UP)
 
         self.pulse_started = Signal()
-        """Signal emitted when a pulse starts at this input."""
+        """Signal emitted when a pulse starts at this input.
+
+        The pulse is detected in a hard interrupt handler, which defers the
+        emission to the shared DeferredQueue, so the connected slots are
+        called outside the interrupt and may allocate memory.
+        """
+        self.pulse_started.defer_to(DeferredQueue.shared())
 
         self.jack_inserted = Signal()
         """Signal emitted when a jack is inserted in this pulse input."""
@@ -36,8 +57,23 @@ class PulseInputSocket(HardwareComponent):
         self._has_jack = False
         """Whether this pulse input has a jack inserted."""
 
-        self.irq = self._pin.irq(handler=self.__emit_pulse_started,
-                                 trigger=machine.Pin.IRQ_FALLING)
+        self._timestamps = None
+        self._timestamp_mask = 0
+        self._edge_count = 0
+
+        self.edge_callback = None
+        """Called from the hard interrupt handler, in capture mode, with the time of each falling edge.
+
+        The callback must not allocate memory.
+        """
+
+        # bound once, since binding a method allocates
+        self._emit_ref = self.__emit_pulse_started
+        self._capture_ref = self.__capture_pulse_started
+
+        self.irq = self._pin.irq(handler=self._emit_ref,
+                                 trigger=machine.Pin.IRQ_FALLING,
+                                 hard=True)
 
     @property
     def has_jack(self) -> bool:
@@ -57,7 +93,177 @@ class PulseInputSocket(HardwareComponent):
             self.jack_removed.emit()
 
     def __emit_pulse_started(self, _):
-        self.pulse_started.emit()
+        self.pulse_started.emit_deferred()
+
+    def __capture_pulse_started(self, _):
+        now = time.ticks_us()
+        count = self._edge_count
+        self._timestamps[count & self._timestamp_mask] = now
+
+        # keep the count a small integer, so incrementing it never
+        # allocates, without changing its position in the ring
+        if count == self.__EDGE_COUNT_MAX:
+            count -= self.__EDGE_COUNT_WRAP
+        self._edge_count = count + 1
+
+        if self.edge_callback is not None:
+            self.edge_callback(now)
+
+        self.pulse_started.emit_deferred()
+
+    @property
+    def capturing(self) -> bool:
+        """Whether the times of falling edges are being recorded."""
+        return self._timestamps is not None
+
+    @property
+    def edge_count(self) -> int:
+        """The number of falling edges recorded since capture was started.
+
+        Once the count reaches 2^30 - 1, the next edge wraps it back to 2^29
+        rather than to 0, so it stays a small integer and above the number
+        of edges kept.
+        """
+        return self._edge_count
+
+    def start_capture(self, size: int = 16) -> None:
+        """Start recording the time of each falling edge at this input.
+
+        Parameters
+        ----------
+        size
+            The number of most recent edges kept, a power of two.
+        """
+        if size < 2 or size & (size - 1):
+            raise ValueError("Invalid timestamp ring size: ", size)
+
+        self._timestamps = array.array("L", [0] * size)
+        self._timestamp_mask = size - 1
+        self._edge_count = 0
+
+        self.irq = self._pin.irq(handler=self._capture_ref,
+                                 trigger=machine.Pin.IRQ_FALLING,
+                                 hard=True)
+
+    def stop_capture(self) -> None:
+        """Stop recording the times of falling edges."""
+        self.irq = self._pin.irq(handler=self._emit_ref,
+                                 trigger=machine.Pin.IRQ_FALLING,
+                                 hard=True)
+        self._timestamps = None
+
+    def timestamps(self, edges: int = None) -> list:
+        """Get the recorded times of the most recent falling edges.
+
+        Parameters
+        ----------
+        edges
+            The maximum number of edges, by default as many as are kept.
+
+        Returns
+        -------
+        list of int
+            The times in microseconds (from time.ticks_us) of the edges,
+            oldest first.
+        """
+        irq_state = machine.disable_irq()
+        count = self._edge_count
+        kept = min(count, self._timestamp_mask + 1)
+        if edges is not None:
+            kept = min(kept, edges)
+        recent = [self._timestamps[i & self._timestamp_mask]
+                  for i in range(count - kept, count)]
+        machine.enable_irq(irq_state)
+
+        return recent
+
+    def period_us(self, periods: int = 1) -> int:
+        """Get the mean of the most recent periods, in whole microseconds.
+
+        Unlike average_period, this allocates no memory, so may be called
+        from an interrupt handler such as the edge_callback.
+
+        Parameters
+        ----------
+        periods
+            The number of periods to average over, less than the number of
+            edges kept.
+
+        Returns
+        -------
+        int
+            The mean period in microseconds, or 0 if too few edges have been
+            recorded.
+        """
+        count = self._edge_count
+        if count <= periods:
+            return 0
+
+        mask = self._timestamp_mask
+        return time.ticks_diff(self._timestamps[(count - 1) & mask],
+                               self._timestamps[(count - 1 - periods) & mask]) \
+            // periods
+
+    def last_period(self):
+        """Get the time between the two most recent falling edges.
+
+        Returns
+        -------
+        int or None
+            The period in microseconds, or None if fewer than two edges have
+            been recorded.
+        """
+        recent = self.timestamps(2)
+        if len(recent) < 2:
+            return None
+
+        return time.ticks_diff(recent[1], recent[0])
+
+    def average_period(self, edges: int = None):
+        """Get the mean time between the most recent falling edges.
+
+        Parameters
+        ----------
+        edges
+            The number of edges to average over, by default as many as are
+            kept.
+
+        Returns
+        -------
+        float or None
+            The mean period in microseconds, or None if fewer than two edges
+            have been recorded.
+        """
+        recent = self.timestamps(edges)
+        if len(recent) < 2:
+            return None
+
+        return time.ticks_diff(recent[-1], recent[0]) / (len(recent) - 1)
+
+    def jitter(self, edges: int = None):
+        """Get the standard deviation of the periods between the most recent falling edges.
+
+        Parameters
+        ----------
+        edges
+            The number of edges to measure over, by default as many as are
+            kept.
+
+        Returns
+        -------
+        float or None
+            The standard deviation in microseconds, or None if fewer than
+            three edges have been recorded.
+        """
+        recent = self.timestamps(edges)
+        if len(recent) < 3:
+            return None
+
+        periods = [time.ticks_diff(b, a) for a, b in zip(recent, recent[1:])]
+        mean = sum(periods) / len(periods)
+
+        return (sum((period - mean) ** 2 for period in periods) /
+                len(periods)) ** 0.5
 
     def set_irq(self, handler):
         self._pin.irq(handler=handler, trigger=machine.Pin.IRQ_FALLING)
@@ -1,4 +1,8 @@
+import machine
 from computer.base.digital_output import DigitalOutput
+from computer.pio_pulse_generator import PIOPulseGenerator
+from computer.pulse_generator import PulseGenerator
+from computer.timer_wheel import TimerWheel
 
 
 class PulseOutputSocket(DigitalOutput):
@@ -7,10 +11,42 @@ class PulseOutputSocket(DigitalOutput):
     Inverted digital output: 1/true = low, 0/false=high.
     Scaled via a transistor.
     Pin should be output, no pullup.
+
+    Pulses can be timed exactly, with no CPU time per edge, by a PIO pulse
+    generator (see start_generator and PulseGenerator). While the generator
+    is running it owns the pin: pulse queues a pulse on the generator, and
+    turn_on and turn_off have no effect until the generator is stopped.
+
+    A steady clock can be sent with no CPU time at all by start_clock,
+    which hands the pin to a hardware PWM slice. Both pulse outputs are
+    driven by the same PWM slice (GPIO 8 and 9 are its channels A and B),
+    so they share one frequency; a clock which the slice cannot produce,
+    below MIN_PWM_HZ or at a different frequency to the other output's
+    PWM clock, or not a whole number of hertz, is played by this socket's
+    pulse generator instead, from MIN_GENERATOR_HZ to MAX_GENERATOR_HZ.
     """
     __ON_VALUE = 0
     __OFF_VALUE = 1
 
+    MIN_PWM_HZ = 8
+    """The lowest clock frequency of the PWM slice, at its largest divider and wrap."""
+
+    MAX_GENERATOR_HZ = 1_000_000 // (PulseGenerator.MIN_HIGH_US +
+                                     PulseGenerator.MIN_LOW_US)
+    """The highest clock frequency of the pulse generator, at its shortest period."""
+
+    MIN_GENERATOR_HZ = 1_000_000 / PulseGenerator.MAX_VALUE
+    """The lowest clock frequency of the pulse generator, at its longest period."""
+
+    __pwm_clocks = []
+    """The pulse output sockets sending a clock by PWM."""
+
+    def __init__(self):
+        super().__init__()
+        self.__generator = None
+        self.__pwm = None
+        self.__clock_hz = 0
+
     @property
     def on_value(self) -> int:
         """The value used to represent "on" for this digital output."""
@@ -21,6 +57,178 @@ class PulseOutputSocket(DigitalOutput):
         """The value used to represent "off" for this digital output."""
         return self.__OFF_VALUE
 
+    @property
+    def state_machine_id(self) -> int:
+        """The ID of the PIO state machine used by this socket's pulse generator."""
+        raise NotImplementedError(
+            self.__class__.__name__ + " does not implement state_machine_id."
+        )
+
+    @property
+    def generator(self):
+        """The pulse generator playing to this socket, if any."""
+        return self.__generator
+
+    def start_generator(self, generator=None):
+        """Start timing the pulses of this socket with a pulse generator.
+
+        Parameters
+        ----------
+        generator : PulseGenerator, optional
+            The generator to start, such as a FakePulseGenerator on the
+            host. By default a PIOPulseGenerator on this socket's state
+            machine.
+
+        Returns
+        -------
+        PulseGenerator
+            The started generator.
+        """
+        self.stop_clock()
+        self.stop_generator()
+        self.cancel_pulse()
+        self.turn_off()
+
+        if generator is None:
+            generator = PIOPulseGenerator(self.io_pin_id,
+                                          self.state_machine_id)
+
+        generator.start()
+        self.__generator = generator
+
+        return generator
+
+    def stop_generator(self) -> None:
+        """Stop the pulse generator, if any, returning the pin to GPIO output, off."""
+        if self.__generator is None:
+            return
+
+        self.__generator.stop()
+        self.__generator = None
+        self.__clock_hz = 0
+        self._pin.init(machine.Pin.OUT, value=self.off_value)
+
+    @property
+    def clock_hz(self):
+        """The frequency of the clock sent by start_clock, or 0 if none is."""
+        return self.__clock_hz
+
+    def start_clock(self, hz, duty=0.5) -> None:
+        """Send a steady clock from this socket without waking the CPU.
+
+        The clock is made by the PWM slice of this socket's pin where it
+        can be, or else by a single command to this socket's pulse
+        generator repeating until the clock is stopped, at a resolution of
+        a microsecond.
+
+        Parameters
+        ----------
+        hz : int or float
+            The frequency of the clock in hertz.
+        duty : float
+            The fraction, from 0 to 1, of each period for which the clock is
+            on.
+        """
+        if hz <= 0:
+            raise ValueError("Invalid clock frequency: ", hz)
+
+        if not 0 <= duty <= 1:
+            raise ValueError("Invalid clock duty cycle: ", duty)
+
+        shared_hz = [socket.clock_hz for socket in self.__pwm_clocks
+                     if socket is not self]
+        use_pwm = hz >= self.MIN_PWM_HZ and hz == round(hz) and \
+            all(other == hz for other in shared_hz)
+
+        if not use_pwm and not \
+                self.MIN_GENERATOR_HZ <= hz <= self.MAX_GENERATOR_HZ:
+            raise ValueError("Clock frequency out of range for the pulse generator: ",
+                             hz)
+
+        self.stop_clock()
+        self.stop_generator()
+        self.cancel_pulse()
+
+        if use_pwm:
+            # the output is inverted, so the pin is high while the clock is off
+            self.__pwm = machine.PWM(self._pin,
+                                     freq=round(hz),
+                                     duty_u16=round((1 - duty) * 65535))
+            self.__pwm_clocks.append(self)
+        else:
+            generator = self.start_generator()
+            period_us = round(1_000_000 / hz)
+            high_us = min(max(round(period_us * duty),
+                              generator.MIN_HIGH_US),
+                          period_us - generator.MIN_LOW_US)
+            generator.send(high_us,
+                           period_us - high_us,
+                           generator.FOREVER)
+
+        self.__clock_hz = hz
+
+    def stop_clock(self) -> None:
+        """Stop the clock, if any, returning the pin to GPIO output, off."""
+        if not self.__clock_hz:
+            return
+
+        self.__clock_hz = 0
+        if self.__pwm is None:
+            self.stop_generator()
+            return
+
+        self.__pwm_clocks.remove(self)
+        if self.__pwm_clocks:
+            # the other output shares the slice, so only this channel stops
+            self.__pwm.duty_u16(65535)
+        else:
+            self.__pwm.deinit()
+        self.__pwm = None
+        self._pin.init(machine.Pin.OUT, value=self.off_value)
+
+    def send_pulses(self, high_us: int, low_us: int, count: int = 1) -> bool:
+        """Queue a train of pulses on the pulse generator.
+
+        Parameters
+        ----------
+        high_us
+            The time in microseconds for which each pulse is on.
+        low_us
+            The time in microseconds for which each pulse is off.
+        count
+            The number of pulses.
+
+        Returns
+        -------
+        bool
+            Whether the pulses were queued; see PulseGenerator.send.
+        """
+        if self.__generator is None:
+            return False
+
+        return self.__generator.send(high_us, low_us, count)
+
+    def pulse(self,
+              width_us: int = DigitalOutput.DEFAULT_PULSE_WIDTH_US,
+              retrigger: int = TimerWheel.RESTART) -> None:
+        """Turn this socket on for a period, then off.
+
+        While the pulse generator is running the pulse is queued on it, to
+        follow any pulses already queued, and retrigger is ignored.
+
+        Parameters
+        ----------
+        width_us
+            The time in microseconds for which this socket is on.
+        retrigger
+            What to do if this socket is already pulsing;
+            TimerWheel.EXTEND, TimerWheel.RESTART or TimerWheel.IGNORE.
+        """
+        if self.__generator is None:
+            super().pulse(width_us, retrigger)
+        else:
+            self.__generator.trigger(width_us)
+
 
 class PulseOutputSocketOne(PulseOutputSocket):
     """The first (leftmost) pulse input socket."""
@@ -30,6 +238,11 @@ class PulseOutputSocketOne(PulseOutputSocket):
         """The unique identifier of the GPIO pin used by this class."""
         return 8
 
+    @property
+    def state_machine_id(self) -> int:
+        """The ID of the PIO state machine used by this socket's pulse generator."""
+        return 4
+
 
 class PulseOutputSocketTwo(PulseOutputSocket):
     """The second (rightmost) pulse input socket."""
@@ -38,3 +251,8 @@ class PulseOutputSocketTwo(PulseOutputSocket):
     def io_pin_id(self) -> int:
         """The unique identifier of the GPIO pin used by this class."""
         return 9
+
+    @property
+    def state_machine_id(self) -> int:
+        """The ID of the PIO state machine used by this socket's pulse generator."""
+        return 5
@@ -72,8 +72,8 @@ class SwitchZ(MultiplexedInput):
     def is_down(self):
         return self.state == self.__DOWN
 
-    def __set_state(self):
-        super().read()
+    def __set_state(self, set_logic=True):
+        super().read(set_logic)
 
         value = self.ranged_variable.value
         if 0 <= value < SwitchZ.__DOWN_MID_BOUNDARY:
@@ -86,7 +86,7 @@ class SwitchZ(MultiplexedInput):
     def read(self, set_logic=True) -> None:
         """Read the switch and emit appropriate signals."""
         previous_state = self.state
-        self.__set_state()
+        self.__set_state(set_logic)
 
         state = self.state
         if previous_state == SwitchZ.__UP and state == SwitchZ.__MIDDLE:
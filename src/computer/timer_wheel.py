@@ -0,0 +1,212 @@
+import array
+import machine
+import time
+
+
+class TimerWheel(object):
+    """A single timer turning off every pulsing digital output.
+
+    Each digital output registered with the wheel has a slot in a
+    preallocated table of off-events, holding whether the output is pulsing
+    and the time at which it is to be turned off. One periodic timer ticks
+    while any output is pulsing; each tick turns off the outputs whose time
+    has come, and the timer is stopped when none are left. However many
+    pulses overlap, they cost one timer interrupt per tick, and no virtual
+    timer per output.
+
+    Pulse widths are rounded up to a whole number of ticks. If an output is
+    pulsed again while it is already pulsing, the retrigger mode decides the
+    new off time:
+
+    EXTEND
+        The later of the current off time and the end of the new pulse.
+    RESTART
+        The end of the new pulse, even if that is sooner.
+    IGNORE
+        The current off time; the new pulse is ignored.
+
+    Parameters
+    ----------
+    tick_us : int
+        The period of the timer in microseconds while any output is pulsing.
+    capacity : int
+        The maximum number of registered outputs.
+    """
+    EXTEND = 0
+    """Retrigger mode keeping an output on until the later off time."""
+
+    RESTART = 1
+    """Retrigger mode turning an output off at the end of the new pulse."""
+
+    IGNORE = 2
+    """Retrigger mode ignoring a pulse of an output which is already pulsing."""
+
+    DEFAULT_TICK_US = 500
+    """The default period of the timer in microseconds."""
+
+    DEFAULT_CAPACITY = 16
+    """The default maximum number of registered outputs."""
+
+    __shared = None
+    """The timer wheel shared by the Computer's digital outputs."""
+
+    def __init__(self,
+                 tick_us: int = DEFAULT_TICK_US,
+                 capacity: int = DEFAULT_CAPACITY):
+
+        self.tick_us = tick_us
+
+        self._outputs = [None] * capacity
+        self._off_times = array.array("i", [0] * capacity)
+        self._pending = bytearray(capacity)
+        self._count = 0
+        self._pending_count = 0
+
+        self._timer = machine.Timer(-1)
+        self._running = False
+
+        # bound once, since binding a method allocates
+        self._tick_ref = self.__tick
+
+    @classmethod
+    def shared(cls):
+        """Get the timer wheel shared by the Computer's digital outputs.
+
+        Returns
+        -------
+        TimerWheel
+            The process-wide timer wheel, created on first use.
+        """
+        if cls.__shared is None:
+            cls.__shared = cls()
+
+        return cls.__shared
+
+    def register(self, output) -> int:
+        """Give a digital output a slot in the off-event table.
+
+        An output on the same pin as a registered output takes over that
+        output's slot, since only one object drives a pin at a time, so
+        creating the Computer's outputs again uses no more slots.
+
+        Parameters
+        ----------
+        output : DigitalOutput
+            The output to be pulsed through this wheel.
+
+        Returns
+        -------
+        int
+            The output's slot, to be passed to pulse.
+        """
+        slot = None
+        for i in range(self._count):
+            registered = self._outputs[i]
+            if registered is not None and \
+                    registered.io_pin_id == output.io_pin_id:
+                slot = i
+                break
+            elif registered is None and slot is None:
+                slot = i
+
+        if slot is None:
+            if self._count == len(self._outputs):
+                raise ValueError("Timer wheel is full: ", self._count)
+
+            slot = self._count
+            self._count += 1
+
+        self.cancel(slot)
+        self._outputs[slot] = output
+
+        return slot
+
+    def unregister(self, slot: int) -> None:
+        """Free the slot of a digital output, leaving the output as it is.
+
+        Parameters
+        ----------
+        slot
+            The output's slot, from register.
+        """
+        self.cancel(slot)
+        self._outputs[slot] = None
+
+    def pulse(self, slot: int, width_us: int, retrigger: int = RESTART) -> None:
+        """Turn an output on, and off again after a period.
+
+        Parameters
+        ----------
+        slot
+            The output's slot, from register.
+        width_us
+            The time in microseconds before the output is turned off.
+        retrigger
+            What to do if the output is already pulsing; EXTEND, RESTART or
+            IGNORE.
+        """
+        pending = self._pending[slot]
+        if pending and retrigger == self.IGNORE:
+            return
+
+        off_time = time.ticks_add(time.ticks_us(), width_us)
+
+        irq_state = machine.disable_irq()
+        if pending and retrigger == self.EXTEND and \
+                time.ticks_diff(self._off_times[slot], off_time) > 0:
+            off_time = self._off_times[slot]
+
+        self._off_times[slot] = off_time
+        if not pending:
+            self._pending[slot] = 1
+            self._pending_count += 1
+        machine.enable_irq(irq_state)
+
+        self._outputs[slot].turn_on()
+
+        if not self._running:
+            self._running = True
+            self._timer.init(mode=machine.Timer.PERIODIC,
+                             period=self.tick_us,
+                             tick_hz=1_000_000,
+                             callback=self._tick_ref)
+
+    def cancel(self, slot: int) -> None:
+        """Forget the off-event of an output, leaving it as it is.
+
+        Parameters
+        ----------
+        slot
+            The output's slot, from register.
+        """
+        irq_state = machine.disable_irq()
+        if self._pending[slot]:
+            self._pending[slot] = 0
+            self._pending_count -= 1
+        machine.enable_irq(irq_state)
+
+    def is_pulsing(self, slot: int) -> bool:
+        """Determine whether an output is waiting to be turned off.
+
+        Parameters
+        ----------
+        slot
+            The output's slot, from register.
+        """
+        return bool(self._pending[slot])
+
+    def __tick(self, timer) -> None:
+        """Turn off the outputs whose off time has passed."""
+        now = time.ticks_us()
+        pending = self._pending
+        off_times = self._off_times
+
+        for slot in range(self._count):
+            if pending[slot] and time.ticks_diff(now, off_times[slot]) >= 0:
+                pending[slot] = 0
+                self._pending_count -= 1
+                self._outputs[slot].turn_off()
+
+        if not self._pending_count:
+            timer.deinit()
+            self._running = False
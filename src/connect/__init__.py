@@ -1,3 +1,15 @@
 from .ranged_variable import RangedVariable
+from .mapping import Mapping
+from .patch import Patch
+from .mod_matrix import ModMatrix
+from .curve import Curve
 from .signal import Signal
-from .timer_connector import TimerConnector
+from .rate_limited_signal import RateLimitedSignal
+
+try:
+    from .deferred_queue import DeferredQueue
+    from .timer_connector import TimerConnector
+except ImportError:
+    # the machine and micropython modules are not available on the host,
+    # where the rest of the package can still be used for analysis
+    pass
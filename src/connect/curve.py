@@ -0,0 +1,174 @@
+import array
+
+
+class Curve(object):
+    """A response curve for 12-bit readings, applied through a lookup table.
+
+    A curve is a function from [0, 1] onto [0, 1] which is tabulated once,
+    at 4096 evenly spaced points, into an array of unsigned 16-bit values
+    scaled to 0-65535. Applying the curve to a 16-bit ADC reading is then a
+    single index into the table, table[read_u16() >> 4], with no calls to
+    math functions, so it is cheap enough to use at audio rate.
+
+    Curves should be created with from_function or from_breakpoints, which
+    return the same curve (and table) each time they are given the same
+    function or breakpoints, so sockets using the same curve share a table.
+
+    Parameters
+    ----------
+    table : array.array
+        The 4096-entry lookup table of unsigned 16-bit values.
+    """
+    SIZE = 4096
+    """The number of entries in the lookup table of a curve."""
+
+    SHIFT = 4
+    """The number of bits to discard from a 16-bit reading to index the table."""
+
+    AUDIO_TAPER = ((0.0, 0.0), (0.5, 0.15), (1.0, 1.0))
+    """Breakpoints approximating the logarithmic taper of an audio potentiometer."""
+
+    __curves = {}
+    """The curves created so far, keyed by their function or breakpoints."""
+
+    def __init__(self, table):
+
+        if len(table) != Curve.SIZE:
+            raise ValueError("Invalid curve table length: ", len(table))
+
+        self.table = table
+
+        self.__range_tables = {}
+        """The tables scaled into a range, keyed by the range's extrema."""
+
+    @classmethod
+    def from_function(cls, function):
+        """Get the curve tabulating a function.
+
+        Parameters
+        ----------
+        function : callable
+            A function taking a float in [0, 1] and returning a float in
+            [0, 1]. Values returned outside that range are clipped.
+
+        Returns
+        -------
+        Curve
+            The curve, shared with any other caller passing the same function.
+        """
+        if function not in cls.__curves:
+            cls.__curves[function] = cls(cls.__tabulate(function))
+
+        return cls.__curves[function]
+
+    @classmethod
+    def from_breakpoints(cls, breakpoints):
+        """Get the curve linearly interpolating a list of breakpoints.
+
+        Parameters
+        ----------
+        breakpoints : list of tuple of float
+            The (x, y) points of the curve, both in [0, 1], with x strictly
+            increasing. The curve is held flat before the first and after the
+            last breakpoint.
+
+        Returns
+        -------
+        Curve
+            The curve, shared with any other caller passing the same breakpoints.
+        """
+        breakpoints = tuple((x, y) for x, y in breakpoints)
+
+        if len(breakpoints) < 2:
+            raise ValueError("At least two breakpoints are needed: ",
+                             breakpoints)
+
+        for (x_a, _), (x_b, _) in zip(breakpoints, breakpoints[1:]):
+            if x_b <= x_a:
+                raise ValueError("Breakpoints not strictly increasing in x: ",
+                                 breakpoints)
+
+        if breakpoints not in cls.__curves:
+            cls.__curves[breakpoints] = cls(cls.__tabulate(
+                lambda x: cls.__interpolate(breakpoints, x)
+            ))
+
+        return cls.__curves[breakpoints]
+
+    @classmethod
+    def __tabulate(cls, function):
+        """Tabulate a function on [0, 1] into a lookup table."""
+        table = array.array("H", range(cls.SIZE))
+        for i in range(cls.SIZE):
+            value = int(round(function(i / (cls.SIZE - 1)) * 65535))
+            table[i] = min(max(value, 0), 65535)
+
+        return table
+
+    @staticmethod
+    def __interpolate(breakpoints, x) -> float:
+        """Linearly interpolate between the breakpoints either side of x."""
+        if x <= breakpoints[0][0]:
+            return breakpoints[0][1]
+
+        for (x_a, y_a), (x_b, y_b) in zip(breakpoints, breakpoints[1:]):
+            if x <= x_b:
+                return y_a + (y_b - y_a) * (x - x_a) / (x_b - x_a)
+
+        return breakpoints[-1][1]
+
+    def table_for_range(self, minimum: int, maximum: int):
+        """Get a lookup table applying this curve within an integer range.
+
+        The table is indexed by the 12 most significant bits of a 16-bit
+        reading. The position of the reading between minimum and maximum
+        (clamped to [0, 1]) is curved, and the curved position is scaled back
+        between minimum and maximum, so a reading is curved and kept within
+        the range with a single lookup. minimum may be greater than maximum,
+        for inverted inputs. Tables are built once for each range.
+
+        Parameters
+        ----------
+        minimum
+            The value of the range at a curved position of 0.
+        maximum
+            The value of the range at a curved position of 1.
+
+        Returns
+        -------
+        array.array
+            The 4096-entry lookup table of values in the range.
+        """
+        key = (minimum, maximum)
+        if key not in self.__range_tables:
+            low = min(minimum, maximum)
+            high = max(minimum, maximum)
+            typecode = "H" if low >= 0 and high <= 65535 else "i"
+
+            table = array.array(typecode, range(Curve.SIZE))
+            span = maximum - minimum
+            for i in range(Curve.SIZE):
+                reading = i * 65535 // (Curve.SIZE - 1)
+                position = min(max((reading - minimum) / span, 0.0), 1.0) \
+                    if span else 0.0
+                curved = self.table[int(round(position * (Curve.SIZE - 1)))]
+                table[i] = minimum + int(round(curved * span / 65535))
+
+            self.__range_tables[key] = table
+
+        return self.__range_tables[key]
+
+    def __call__(self, value_u16: int) -> int:
+        """Apply this curve to an unsigned 16-bit value.
+
+        Parameters
+        ----------
+        value_u16
+            The value to apply the curve to, e.g. a reading from read_u16.
+
+        Returns
+        -------
+        int
+            The curved unsigned 16-bit value.
+        """
+        return self.table[value_u16 >> Curve.SHIFT]
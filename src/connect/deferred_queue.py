@@ -0,0 +1,172 @@
+import machine
+import micropython
+
+
+class DeferredQueue(object):
+    """A queue of signal emissions deferred out of interrupt handlers.
+
+    A signal emitted directly in an interrupt handler runs its slots inside
+    the handler, where a slot that allocates memory fails (in a hard
+    interrupt) and a slow slot delays other interrupts. An interrupt handler
+    can instead push the signal, with an optional value, into this queue. The
+    queue is a ring buffer allocated up front, so pushing allocates nothing.
+    The first push into an empty queue schedules a single call to drain with
+    micropython.schedule, which emits every queued signal outside the
+    interrupt.
+
+    If the queue is full, a push is dropped and counted in overflow_count.
+    With coalescing, pushing a value with the same signal as the newest
+    entry still waiting to be drained replaces that entry's value instead
+    of adding an entry, and is counted in coalesced_count, so a fast stream
+    of values (only the latest of which matters) cannot flood the queue or
+    the scheduler. Pushes without a value are events, such as the edges of
+    a pulse input, which slots may count, so they are only coalesced for
+    signals opted in with coalesce_events_of, e.g. the pulse_started signal
+    of a pulse input following a fast clock, whose slots only need to know
+    that at least one edge arrived since they last ran.
+
+    Parameters
+    ----------
+    size : int
+        The maximum number of entries waiting to be drained.
+    coalesce : bool
+        Whether to coalesce repeated pushes of a value with the same signal.
+    """
+    DEFAULT_SIZE = 16
+    """The default maximum number of entries waiting to be drained."""
+
+    __shared = None
+    """The deferred queue shared by the Computer's hardware components."""
+
+    def __init__(self, size: int = DEFAULT_SIZE, coalesce: bool = True):
+
+        if size < 1:
+            raise ValueError("Invalid deferred queue size: ", size)
+
+        self.coalesce = coalesce
+
+        self.overflow_count = 0
+        """The number of pushes dropped because the queue was full."""
+
+        self.coalesced_count = 0
+        """The number of pushes merged into the newest entry."""
+
+        self._coalesced_events = ()
+        """The signals whose pushes without a value are coalesced."""
+
+        self.schedule_failure_count = 0
+        """The number of times the micropython scheduler queue was full."""
+
+        # one entry is always left empty to tell a full queue from an empty one
+        self._capacity = size + 1
+        self._signals = [None] * self._capacity
+        self._values = [None] * self._capacity
+        self._head = 0
+        self._tail = 0
+        self._scheduled = False
+
+        # bound once, since binding a method allocates
+        self._drain_ref = self.drain
+
+    @classmethod
+    def shared(cls):
+        """Get the deferred queue shared by the Computer's hardware components.
+
+        Returns
+        -------
+        DeferredQueue
+            The process-wide deferred queue, created on first use.
+        """
+        if cls.__shared is None:
+            cls.__shared = cls()
+
+        return cls.__shared
+
+    def __len__(self) -> int:
+        return (self._tail - self._head) % self._capacity
+
+    def coalesce_events_of(self, signal, coalesce: bool = True) -> None:
+        """Set whether pushes of a signal without a value are coalesced.
+
+        Has no effect unless this queue coalesces.
+
+        Parameters
+        ----------
+        signal : Signal
+            The signal whose events are coalesced or not.
+        coalesce
+            Whether repeated pushes of the signal without a value are merged
+            into the newest entry.
+        """
+        events = tuple(event for event in self._coalesced_events
+                       if event is not signal)
+        if coalesce:
+            events += (signal,)
+
+        self._coalesced_events = events
+
+    def push(self, signal, value=None) -> None:
+        """Queue a signal to be emitted when the queue is next drained.
+
+        This method allocates no memory, so it may be called from a hard
+        interrupt handler.
+
+        Parameters
+        ----------
+        signal : Signal
+            The signal to emit.
+        value : optional
+            The value to emit the signal with, using Signal.emit_value. If
+            None, the signal is emitted with Signal.emit.
+        """
+        tail = self._tail
+
+        if self.coalesce and tail != self._head:
+            newest = (tail - 1) % self._capacity
+            if self._signals[newest] is signal and \
+                    (value is not None or signal in self._coalesced_events):
+                self._values[newest] = value
+                self.coalesced_count += 1
+                return
+
+        next_tail = (tail + 1) % self._capacity
+        if next_tail == self._head:
+            self.overflow_count += 1
+            return
+
+        self._signals[tail] = signal
+        self._values[tail] = value
+        self._tail = next_tail
+
+        if not self._scheduled:
+            try:
+                micropython.schedule(self._drain_ref, None)
+                self._scheduled = True
+            except RuntimeError:
+                # the entry stays queued and the next push tries again
+                self.schedule_failure_count += 1
+
+    def drain(self, _=None) -> None:
+        """Emit each queued signal, oldest first, until the queue is empty."""
+        self._scheduled = False
+
+        while self._head != self._tail:
+            irq_state = machine.disable_irq()
+            head = self._head
+            signal = self._signals[head]
+            value = self._values[head]
+            self._signals[head] = None
+            self._values[head] = None
+            self._head = (head + 1) % self._capacity
+            machine.enable_irq(irq_state)
+
+            if value is None:
+                signal.emit()
+            else:
+                signal.emit_value(value)
+
+    def reset_counters(self) -> None:
+        """Reset the overflow, coalesced and schedule failure counters to zero."""
+        self.overflow_count = 0
+        self.coalesced_count = 0
+        self.schedule_failure_count = 0
@@ -0,0 +1,61 @@
+"""
+Q16 fixed-point arithmetic for allocation-free mappings.
+
+On the RP2040, micropython stores integers of up to 31 bits directly in the
+object reference, while floats and larger integers are allocated on the
+heap. A Q16 coefficient is a real number scaled by 2**16 and stored as an
+integer. Multiplying a 16-bit value by it with mul_q16 keeps every
+intermediate result below 2**30, so mappings evaluated this way never
+allocate.
+"""
+Q16_SHIFT = 16
+"""The number of fractional bits in a Q16 number."""
+
+Q16_ONE = 1 << Q16_SHIFT
+"""The Q16 representation of one."""
+
+Q16_MAX = 1 << 21
+"""The exclusive upper bound on the magnitude of a coefficient for mul_q16."""
+
+VALUE_MAX = 1 << 16
+"""The exclusive upper bound on the magnitude of a value for mul_q16."""
+
+
+def to_q16(value) -> int:
+    """Convert a number to the nearest Q16 fixed-point integer.
+
+    Parameters
+    ----------
+    value : int or float
+        The number to convert.
+
+    Returns
+    -------
+    int
+        The Q16 representation of the number.
+    """
+    return int(round(value * Q16_ONE))
+
+
+def mul_q16(value: int, coefficient: int) -> int:
+    """Multiply an integer by a Q16 coefficient, rounding to the nearest integer.
+
+    The value is split into its high and low bytes, which are multiplied
+    separately so that no intermediate result reaches 2**30. Discarding the
+    low byte of the low product before adding it does not change the
+    rounded result.
+
+    Parameters
+    ----------
+    value
+        The integer to multiply, with magnitude less than VALUE_MAX.
+    coefficient
+        The Q16 coefficient, with magnitude less than Q16_MAX.
+
+    Returns
+    -------
+    int
+        The product, rounded to the nearest integer.
+    """
+    return ((value >> 8) * coefficient +
+            (((value & 0xFF) * coefficient) >> 8) + 0x80) >> 8
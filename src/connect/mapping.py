@@ -0,0 +1,158 @@
+from .fixed_point import Q16_MAX, VALUE_MAX, mul_q16, to_q16
+
+
+class Mapping(object):
+    """A linear mapping from the value of one ranged variable to another.
+
+    The slope and intercept of the mapping are computed once and cached,
+    and only recomputed after the range of either ranged variable has
+    changed (signalled by their range_changed signals). A mapping is
+    callable, so it can be connected directly as a slot, e.g. to an analog
+    input's value_changed signal, in place of RangedVariable.map_value.
+
+    A mapping stays connected to the range_changed signals of both ranged
+    variables, so a mapping which is no longer wanted should be disconnected
+    with disconnect, or it is kept alive by them.
+
+    Parameters
+    ----------
+    source : RangedVariable
+        The ranged variable whose value is mapped.
+    target : RangedVariable
+        The ranged variable whose value is set from the source's.
+    callback : callable, optional
+        Called with the target's value after each mapping, e.g. the write
+        method of the analog output owning the target.
+    fixed_point : bool
+        Whether to evaluate the mapping in integer fixed-point arithmetic.
+        The slope is then a Q16 integer (see connect.fixed_point) and the
+        intercept the integer minimum of the target. Results are integers,
+        rounded to within one of the floating point result, and evaluating
+        the mapping allocates no memory. Both ranges must be integers of at
+        most 16 bits, and the magnitude of the slope less than 32.
+    """
+
+    def __init__(self,
+                 source,
+                 target,
+                 callback=None,
+                 fixed_point: bool = False):
+
+        self.source = source
+        self.target = target
+        self.callback = callback
+        self.fixed_point = fixed_point
+
+        self._slope = None
+        self._intercept = None
+        self._offset = 0
+
+        source.range_changed.connect(self.invalidate)
+        target.range_changed.connect(self.invalidate)
+
+    @property
+    def slope(self):
+        """The slope of this mapping, a Q16 integer if it is fixed-point."""
+        if self._slope is None:
+            self.__compile()
+
+        return self._slope
+
+    @property
+    def intercept(self):
+        """The intercept of this mapping."""
+        if self._slope is None:
+            self.__compile()
+
+        return self._intercept
+
+    @property
+    def offset(self) -> int:
+        """The source value subtracted before a fixed-point mapping's slope is applied."""
+        if self._slope is None:
+            self.__compile()
+
+        return self._offset
+
+    def invalidate(self) -> None:
+        """Discard the cached coefficients so they are recomputed when next used."""
+        self._slope = None
+
+    def disconnect(self) -> None:
+        """Stop following the ranges of the source and target, e.g. before discarding this mapping."""
+        self.source.range_changed.disconnect(self.invalidate)
+        self.target.range_changed.disconnect(self.invalidate)
+        self._slope = None
+
+    def map(self, value):
+        """Map a value in the source's range onto the target's range.
+
+        Parameters
+        ----------
+        value : int or float
+            The value to map.
+
+        Returns
+        -------
+        int or float
+            The mapped value.
+        """
+        if self._slope is None:
+            self.__compile()
+
+        if self.fixed_point:
+            return self._intercept + mul_q16(value - self._offset,
+                                             self._slope)
+
+        return self._intercept + self._slope * value
+
+    def __call__(self, ranged_variable=None) -> None:
+        """Update the target's value from the source's.
+
+        Parameters
+        ----------
+        ranged_variable : RangedVariable, optional
+            Ignored; accepted so that this mapping can be used as a slot for
+            signals emitting the source.
+        """
+        if self._slope is None:
+            self.__compile()
+
+        target = self.target
+        if self.fixed_point:
+            target.value = self._intercept + \
+                mul_q16(self.source.value - self._offset, self._slope)
+        else:
+            target.value = self._intercept + self._slope * self.source.value
+
+        if self.callback is not None:
+            self.callback(target.value)
+
+    def __compile(self) -> None:
+        """Compute the slope and intercept from the current ranges."""
+        source = self.source
+        target = self.target
+
+        slope = target.value_range / source.value_range
+
+        if not self.fixed_point:
+            self._slope = slope
+            self._intercept = target.minimum_value - \
+                slope * source.minimum_value
+            return
+
+        slope = to_q16(slope)
+        if abs(slope) >= Q16_MAX or abs(source.value_range) >= VALUE_MAX:
+            raise ValueError(
+                "Ranges out of bounds for a fixed-point mapping: ",
+                source.value_range, target.value_range
+            )
+
+        self._slope = slope
+        self._offset = int(source.minimum_value)
+        self._intercept = int(round(target.minimum_value))
+
+    def __str__(self) -> str:
+        """Create a human-readable representation of this object."""
+        return f"{self.__class__.__name__}: slope = {self._slope}, " \
+               f"intercept = {self._intercept}"
@@ -0,0 +1,255 @@
+from array import array
+
+from .fixed_point import Q16_MAX, VALUE_MAX, mul_q16, to_q16
+from .ranged_variable import RangedVariable
+
+
+class ModMatrix(object):
+    """A modulation matrix routing every source to every destination.
+
+    Each tick, the value of every source is converted to a 12-bit position
+    within its range, and the position of each destination is its offset
+    plus the weighted sum of the source positions. The positions are mapped
+    onto the destinations' ranges, and only destinations whose position has
+    changed are written.
+
+    The source positions, destination offsets and positions, and the weights
+    are kept in integer arrays, and the weighted sums are computed in a
+    single multiply-accumulate pass over the weights, so a tick allocates no
+    memory however many routes are in use. Weights are Q8 fixed-point
+    integers (256 is a depth of one) with magnitude at most 1024, which keeps
+    every sum below 2**30 for up to 64 sources. The scale from a source's
+    range onto positions is a Q16 coefficient (see connect.fixed_point), so
+    the magnitude of a source's range must be at least 128 and below 65536.
+
+    Parameters
+    ----------
+    sources : list of RangedVariable or AnalogInput
+        The ranged variables, or hardware inputs owning them, whose values
+        modulate the destinations.
+    destinations : list of RangedVariable or AnalogOutput
+        The ranged variables, or hardware outputs owning them, which are
+        modulated. The write method of a hardware output is called with each
+        new value.
+    """
+    WEIGHT_SHIFT = 8
+    """The number of fractional bits in a weight."""
+
+    WEIGHT_ONE = 1 << WEIGHT_SHIFT
+    """The weight of a depth of one."""
+
+    WEIGHT_MAX = 4 * WEIGHT_ONE
+    """The largest magnitude of a weight."""
+
+    POSITION_MAX = 4095
+    """The largest position within a source's or destination's range."""
+
+    __MAX_SOURCES = 64
+
+    def __init__(self, sources, destinations):
+
+        if not 0 < len(sources) <= self.__MAX_SOURCES:
+            raise ValueError("Invalid number of modulation sources: ",
+                             len(sources))
+
+        self._sources = [source if isinstance(source, RangedVariable)
+                         else source.ranged_variable
+                         for source in sources]
+        self._source_keys = list(sources)
+
+        self._targets = []
+        self._writes = []
+        for destination in destinations:
+            if isinstance(destination, RangedVariable):
+                self._targets.append(destination)
+                self._writes.append(None)
+            else:
+                self._targets.append(destination.ranged_variable)
+                self._writes.append(destination.write)
+        self._destination_keys = list(destinations)
+
+        n_sources = len(self._sources)
+        n_destinations = len(self._targets)
+
+        self._weights = array("i", [0] * (n_sources * n_destinations))
+        """The weight of each route, with the routes of each destination contiguous."""
+
+        self._positions = array("i", [0] * n_sources)
+        """The position of each source within its range, from the last tick."""
+
+        self._offsets = array("i", [0] * n_destinations)
+        """The position of each destination with no modulation."""
+
+        self._outputs = array("i", [-1] * n_destinations)
+        """The position of each destination written on the last tick."""
+
+        self._source_scales = array("i", [0] * n_sources)
+        self._source_minima = array("i", [0] * n_sources)
+        self._target_scales = array("i", [0] * n_destinations)
+        self._target_minima = array("i", [0] * n_destinations)
+
+        self._dirty = True
+
+        for variable in self._sources + self._targets:
+            variable.range_changed.connect(self.invalidate)
+
+    def set_weight(self, source, destination, weight: int) -> None:
+        """Set the weight of the route from a source to a destination.
+
+        Parameters
+        ----------
+        source : RangedVariable or AnalogInput
+            The source, as passed to this modulation matrix.
+        destination : RangedVariable or AnalogOutput
+            The destination, as passed to this modulation matrix.
+        weight : int
+            The Q8 weight, between -WEIGHT_MAX and WEIGHT_MAX.
+        """
+        if not -self.WEIGHT_MAX <= weight <= self.WEIGHT_MAX:
+            raise ValueError("Invalid modulation weight: ", weight)
+
+        index = self.__destination_index(destination) * len(self._sources) + \
+            self.__source_index(source)
+        self._weights[index] = weight
+
+    def weight(self, source, destination) -> int:
+        """Get the Q8 weight of the route from a source to a destination.
+
+        Parameters
+        ----------
+        source : RangedVariable or AnalogInput
+            The source, as passed to this modulation matrix.
+        destination : RangedVariable or AnalogOutput
+            The destination, as passed to this modulation matrix.
+
+        Returns
+        -------
+        int
+            The Q8 weight of the route.
+        """
+        index = self.__destination_index(destination) * len(self._sources) + \
+            self.__source_index(source)
+        return self._weights[index]
+
+    def set_depth(self, source, destination, depth) -> None:
+        """Set the weight of the route from a source to a destination from a depth.
+
+        Parameters
+        ----------
+        source : RangedVariable or AnalogInput
+            The source, as passed to this modulation matrix.
+        destination : RangedVariable or AnalogOutput
+            The destination, as passed to this modulation matrix.
+        depth : int or float
+            The depth of the route, between -4 and 4. At a depth of one, the
+            full range of the source sweeps the full range of the
+            destination.
+        """
+        self.set_weight(source, destination, int(round(depth * self.WEIGHT_ONE)))
+
+    def set_offset(self, destination, position: int) -> None:
+        """Set the position of a destination within its range with no modulation.
+
+        Parameters
+        ----------
+        destination : RangedVariable or AnalogOutput
+            The destination, as passed to this modulation matrix.
+        position : int
+            The position, between 0 and POSITION_MAX.
+        """
+        if not 0 <= position <= self.POSITION_MAX:
+            raise ValueError("Invalid modulation offset: ", position)
+
+        self._offsets[self.__destination_index(destination)] = position
+
+    def invalidate(self) -> None:
+        """Recompute the range scales before the next tick."""
+        self._dirty = True
+
+    def tick(self) -> None:
+        """Modulate the destinations from the current values of the sources."""
+        if self._dirty:
+            self.__compile()
+
+        sources = self._sources
+        positions = self._positions
+        source_minima = self._source_minima
+        source_scales = self._source_scales
+        n_sources = len(sources)
+
+        for i in range(n_sources):
+            positions[i] = mul_q16(int(sources[i].value) - source_minima[i],
+                                   source_scales[i])
+
+        weights = self._weights
+        offsets = self._offsets
+        outputs = self._outputs
+        shift = self.WEIGHT_SHIFT
+        position_max = self.POSITION_MAX
+
+        for j in range(len(self._targets)):
+            row = j * n_sources
+            total = 0
+            for i in range(n_sources):
+                total += weights[row + i] * positions[i]
+
+            position = offsets[j] + (total >> shift)
+            if position < 0:
+                position = 0
+            elif position > position_max:
+                position = position_max
+
+            if position == outputs[j]:
+                continue
+            outputs[j] = position
+
+            target = self._targets[j]
+            target.value = self._target_minima[j] + \
+                mul_q16(position, self._target_scales[j])
+
+            write = self._writes[j]
+            if write is not None:
+                write(target.value)
+
+    def __compile(self) -> None:
+        """Compute the Q16 scales between positions and each range."""
+        self._dirty = False
+
+        for i, source in enumerate(self._sources):
+            if not 0 < abs(source.value_range) < VALUE_MAX:
+                raise ValueError("Modulation source range out of bounds: ",
+                                 source.value_range)
+            scale = to_q16(self.POSITION_MAX / source.value_range)
+            if abs(scale) >= Q16_MAX:
+                raise ValueError("Modulation source range out of bounds: ",
+                                 source.value_range)
+            self._source_minima[i] = int(source.minimum_value)
+            self._source_scales[i] = scale
+
+        for j, target in enumerate(self._targets):
+            if abs(target.value_range) >= VALUE_MAX:
+                raise ValueError("Modulation destination range out of bounds: ",
+                                 target.value_range)
+            self._target_minima[j] = int(round(target.minimum_value))
+            self._target_scales[j] = to_q16(target.value_range /
+                                            self.POSITION_MAX)
+            # write every destination with the new ranges on the next tick
+            self._outputs[j] = -1
+
+    def __source_index(self, source) -> int:
+        for i, key in enumerate(self._source_keys):
+            if key is source:
+                return i
+        raise ValueError("Not a source of this modulation matrix: ", source)
+
+    def __destination_index(self, destination) -> int:
+        for j, key in enumerate(self._destination_keys):
+            if key is destination:
+                return j
+        raise ValueError("Not a destination of this modulation matrix: ",
+                         destination)
+
+    def __str__(self) -> str:
+        """Create a human-readable representation of this object."""
+        return f"{self.__class__.__name__}: {len(self._sources)} sources, " \
+               f"{len(self._targets)} destinations"
@@ -0,0 +1,180 @@
+from .fixed_point import mul_q16
+from .mapping import Mapping
+from .ranged_variable import RangedVariable
+
+
+class Patch(object):
+    """A fixed set of routes from sources to destinations, run in one loop.
+
+    Each route maps the value of a source onto the value, minimum, maximum
+    or range of a destination. Connecting the same routes with signals runs
+    a cascade of emits, mappings and writes per route; a patch instead
+    compiles its routes into flat lists of ranged variables, prebound write
+    methods and Q16 fixed-point coefficients (see connect.fixed_point), and
+    evaluates them all in a single call to tick, e.g. once per step of a
+    timed loop.
+
+    Routes onto a minimum, maximum or range are run before routes onto a
+    value, so values are mapped into the ranges set in the same tick. A
+    route is only evaluated when its source's value has changed, and its
+    destination only written when the mapped value has changed. The
+    coefficients are recompiled when the range of any ranged variable in the
+    patch changes.
+
+    Parameters
+    ----------
+    routes : list of tuple
+        The (source, mapping, destination) routes of the patch, see add.
+    """
+    VALUE = "value"
+    """Map the source onto the destination's value."""
+
+    MINIMUM = "minimum"
+    """Map the source onto the value of the destination's minimum."""
+
+    MAXIMUM = "maximum"
+    """Map the source onto the value of the destination's maximum."""
+
+    RANGE = "range"
+    """Map the source onto the values of the destination's minimum and maximum."""
+
+    def __init__(self, routes=()):
+
+        self._routes = []
+        """The (mapping, write) pair of each route, in the order added."""
+
+        self._dirty = True
+        self._extremum_count = 0
+
+        self._sources = []
+        self._targets = []
+        self._writes = []
+        self._slopes = []
+        self._offsets = []
+        self._intercepts = []
+        self._inputs = []
+        self._outputs = []
+
+        for source, mapping, destination in routes:
+            self.add(source, mapping, destination)
+
+    def add(self, source, mapping, destination) -> None:
+        """Add a route to this patch.
+
+        Parameters
+        ----------
+        source : RangedVariable or AnalogInput
+            The ranged variable, or the hardware input owning the ranged
+            variable, whose value is mapped.
+        mapping : str
+            Which part of the destination the source is mapped onto; one of
+            Patch.VALUE, Patch.MINIMUM, Patch.MAXIMUM or Patch.RANGE.
+        destination : RangedVariable or AnalogOutput
+            The ranged variable, or the hardware output owning the ranged
+            variable, onto which the source is mapped. The write method of a
+            hardware output is called with each new value.
+        """
+        if mapping == self.RANGE:
+            self.add(source, self.MINIMUM, destination)
+            self.add(source, self.MAXIMUM, destination)
+            return
+
+        if mapping not in (self.VALUE, self.MINIMUM, self.MAXIMUM):
+            raise ValueError("Invalid patch mapping: ", mapping)
+
+        if not isinstance(source, RangedVariable):
+            source = source.ranged_variable
+
+        if isinstance(destination, RangedVariable):
+            target = destination
+            write = None
+        else:
+            target = destination.ranged_variable
+            write = destination.write if mapping == self.VALUE else None
+
+        if mapping != self.VALUE:
+            target = getattr(target, mapping)
+            if not isinstance(target, RangedVariable):
+                raise ValueError("Patch destination extremum is not a ranged variable: ",
+                                 target)
+
+        route = (Mapping(source, target, fixed_point=True), write)
+
+        if mapping == self.VALUE:
+            self._routes.append(route)
+        else:
+            self._routes.insert(self._extremum_count, route)
+            self._extremum_count += 1
+
+        source.range_changed.connect(self.invalidate)
+        target.range_changed.connect(self.invalidate)
+        self._dirty = True
+
+    def invalidate(self) -> None:
+        """Recompile the coefficients of this patch before the next tick."""
+        self._dirty = True
+
+    def tick(self) -> None:
+        """Evaluate every route of this patch."""
+        if self._dirty:
+            self.__compile()
+
+        self.__run(0, self._extremum_count)
+
+        # the range routes may have changed the ranges of the value routes
+        if self._dirty:
+            self.__compile()
+
+        self.__run(self._extremum_count, len(self._sources))
+
+    def __run(self, start: int, stop: int) -> None:
+        """Evaluate the routes with indices in [start, stop)."""
+        sources = self._sources
+        targets = self._targets
+        writes = self._writes
+        slopes = self._slopes
+        offsets = self._offsets
+        intercepts = self._intercepts
+        inputs = self._inputs
+        outputs = self._outputs
+
+        for i in range(start, stop):
+            value = sources[i].value
+            if value == inputs[i]:
+                continue
+            inputs[i] = value
+
+            output = intercepts[i] + mul_q16(int(value) - offsets[i], slopes[i])
+            if output == outputs[i]:
+                continue
+            outputs[i] = output
+
+            target = targets[i]
+            target.value = output
+
+            write = writes[i]
+            if write is not None:
+                write(target.value)
+
+    def __compile(self) -> None:
+        """Flatten the routes into lists of variables, methods and coefficients."""
+        self._dirty = False
+
+        self._sources = [mapping.source for mapping, _ in self._routes]
+        self._targets = [mapping.target for mapping, _ in self._routes]
+        self._writes = [write for _, write in self._routes]
+        self._slopes = [mapping.slope for mapping, _ in self._routes]
+        self._offsets = [mapping.offset for mapping, _ in self._routes]
+        self._intercepts = [mapping.intercept for mapping, _ in self._routes]
+
+        # evaluate every route with the new coefficients on the next run
+        self._inputs = [None] * len(self._routes)
+        self._outputs = [None] * len(self._routes)
+
+    def __len__(self) -> int:
+        return len(self._routes)
+
+    def __str__(self) -> str:
+        """Create a human-readable representation of this object."""
+        return f"{self.__class__.__name__}: {len(self._routes)} routes, " \
+               f"{self._extremum_count} onto ranges"
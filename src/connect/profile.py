@@ -0,0 +1,159 @@
+"""Profiling of the slots connected to signals.
+
+Profiling is enabled for every signal reachable from a root object, such as
+a Computer, by walking its attributes. Each slot of those signals is then
+wrapped in a SlotProfile recording its call count and the total, maximum and
+last duration of its calls, in the microseconds of the provided clock. On
+the module the clock is the micropython time module; on the host, any object
+with ticks_us and ticks_diff methods can stand in for it.
+
+Signals that are not profiled are not changed, so profiling costs nothing
+until it is enabled.
+"""
+import time
+
+from .signal import Signal
+
+
+def signals(root) -> list:
+    """Find the signals reachable from an object through its attributes.
+
+    Attributes are followed through instance dictionaries, __slots__, and
+    lists, tuples and dictionaries. Signals' slots, and functions, methods,
+    classes and modules, are not followed.
+
+    Parameters
+    ----------
+    root
+        The object from which to search, such as a Computer.
+
+    Returns
+    -------
+    list of tuple of (str, Signal)
+        The path to, and the signal, of each signal found.
+    """
+    found = []
+    visited = set()
+    stack = [(root.__class__.__name__, root)]
+
+    while stack:
+        path, obj = stack.pop()
+
+        if id(obj) in visited:
+            continue
+        visited.add(id(obj))
+
+        if isinstance(obj, Signal):
+            found.append((path, obj))
+        elif isinstance(obj, (list, tuple)):
+            for index, item in enumerate(obj):
+                stack.append((path + "[" + str(index) + "]", item))
+        elif isinstance(obj, dict):
+            for key, item in obj.items():
+                stack.append((path + "[" + repr(key) + "]", item))
+        elif not isinstance(obj, _NOT_FOLLOWED):
+            for name, item in _attributes(obj):
+                stack.append((path + "." + name, item))
+
+    return found
+
+
+def enable(root, clock=time) -> None:
+    """Enable profiling of the slots of every signal reachable from an object.
+
+    Parameters
+    ----------
+    root
+        The object from which to search for signals, such as a Computer.
+    clock : module or object
+        The source of time, providing ticks_us and ticks_diff as in the
+        micropython time module.
+    """
+    for _, signal in signals(root):
+        signal.enable_profiling(clock)
+
+
+def disable(root) -> None:
+    """Disable profiling of the slots of every signal reachable from an object.
+
+    Parameters
+    ----------
+    root
+        The object from which to search for signals, such as a Computer.
+    """
+    for _, signal in signals(root):
+        signal.disable_profiling()
+
+
+def hottest(root, count: int = 10) -> list:
+    """Find the profiled slots with the greatest total duration.
+
+    Parameters
+    ----------
+    root
+        The object from which to search for signals, such as a Computer.
+    count : int
+        The maximum number of slots to return.
+
+    Returns
+    -------
+    list of tuple of (str, SlotProfile)
+        The path to each signal and the profile of its slot, hottest first.
+    """
+    profiles = [(path, profile)
+                for path, signal in signals(root)
+                for profile in signal.slot_profiles]
+    profiles.sort(key=lambda entry: entry[1].total_us, reverse=True)
+
+    return profiles[:count]
+
+
+def report(root, count: int = 10) -> None:
+    """Print the profiled slots with the greatest total duration.
+
+    Parameters
+    ----------
+    root
+        The object from which to search for signals, such as a Computer.
+    count : int
+        The maximum number of slots to list.
+    """
+    print("calls  total_us  max_us  last_us  signal -> slot")
+    for path, profile in hottest(root, count):
+        print(f"{profile.call_count:5d}  {profile.total_us:8d}  "
+              f"{profile.max_us:6d}  {profile.last_us:7d}  "
+              f"{path} -> {profile.name}")
+
+
+def _attributes(obj) -> list:
+    """Get the names and values of an object's instance attributes."""
+    attributes = []
+
+    instance_dict = getattr(obj, "__dict__", None)
+    if isinstance(instance_dict, dict):
+        attributes.extend(instance_dict.items())
+
+    # micropython ignores __slots__, so these are only found on the host
+    for cls in getattr(obj.__class__, "__mro__", ()):
+        for name in cls.__dict__.get("__slots__", ()):
+            if hasattr(obj, name):
+                attributes.append((name, getattr(obj, name)))
+
+    return attributes
+
+
+class _Bound(object):
+    def method(self):
+        pass
+
+
+_NOT_FOLLOWED = (
+    type,
+    type(_attributes),
+    type(_Bound().method),
+    type(time),
+    str,
+    bytes,
+    bytearray,
+)
+"""The types whose attributes are not followed when searching for signals."""
@@ -1,3 +1,6 @@
+from .signal import Signal
+
+
 class RangedVariable(object):
     """A variable constrained to a specific range.
 
@@ -11,6 +14,11 @@ class RangedVariable(object):
     from an ADC or digital pin will have fixed ranges. For outputs, hardware
     imposes a limit on the range of values that can be written.
 
+    A ranged variable used as the minimum or maximum of another keeps a list
+    of its dependents, and pushes its new value into their cached numerical
+    ranges whenever it changes. Setting a value is therefore a clamp against
+    two cached numbers, however the range is defined.
+
     Parameters
     ----------
     value : int or float
@@ -23,6 +31,18 @@ class RangedVariable(object):
         This may itself be a ranged variable.
     """
 
+    __slots__ = (
+        "_value",
+        "_minimum",
+        "_maximum",
+        "_minimum_value",
+        "_maximum_value",
+        "_numerical_min",
+        "_numerical_max",
+        "_dependents",
+        "range_changed",
+    )
+
     def __init__(self,
                  value,
                  minimum,
@@ -32,8 +52,26 @@ class RangedVariable(object):
         self._minimum = minimum
         self._maximum = maximum
 
-        self._numerical_min = min(self.minimum_value, self.maximum_value)
-        self._numerical_max = max(self.minimum_value, self.maximum_value)
+        self._dependents = []
+        """The ranged variables which have this ranged variable as an extremum."""
+
+        self.range_changed = Signal()
+        """Signal emitted when the range of this ranged variable is changed."""
+
+        if isinstance(minimum, RangedVariable):
+            minimum._dependents.append(self)
+            self._minimum_value = minimum.value
+        else:
+            self._minimum_value = minimum
+
+        if isinstance(maximum, RangedVariable):
+            maximum._dependents.append(self)
+            self._maximum_value = maximum.value
+        else:
+            self._maximum_value = maximum
+
+        self._numerical_min = min(self._minimum_value, self._maximum_value)
+        self._numerical_max = max(self._minimum_value, self._maximum_value)
 
     @property
     def value(self):
@@ -44,15 +82,26 @@ class RangedVariable(object):
     def value(self, value) -> None:
         """Set the current value of this ranged variable.
 
-        This method ensures that the range of the ranged variable is respected.
+        This method ensures that the range of the ranged variable is respected
+        by clamping the value to the cached numerical minimum and maximum.
+        If this ranged variable is the minimum or maximum of others, their
+        ranges are updated from the new value.
 
         Parameters
         ----------
         value : int or float
             The value to which to set this ranged variable's value.
         """
-        if min(self.minimum_value, self.maximum_value) <= value <= max(
-                self.minimum_value, self.maximum_value):
+        if value < self._numerical_min:
+            value = self._numerical_min
+        elif value > self._numerical_max:
+            value = self._numerical_max
+
+        if self._dependents and value != self._value:
+            self._value = value
+            for dependent in self._dependents:
+                dependent._update_range()
+        else:
             self._value = value
 
     @property
@@ -89,10 +138,7 @@ class RangedVariable(object):
         int or float
             The current value of the minimum of this ranged variable.
         """
-        if isinstance(self._minimum, RangedVariable):
-            return self._minimum.value
-        else:
-            return self._minimum
+        return self._minimum_value
 
     @minimum_value.setter
     def minimum_value(self, minimum) -> None:
@@ -107,9 +153,7 @@ class RangedVariable(object):
             self._minimum.value = minimum
         else:
             self._minimum = minimum
-
-        self._numerical_min = min(self.minimum_value, self.maximum_value)
-        self._numerical_max = max(self.minimum_value, self.maximum_value)
+            self._update_range()
 
     @property
     def maximum_value(self):
@@ -123,10 +167,7 @@ class RangedVariable(object):
         int or float
             The current value of the maximum of this ranged variable.
         """
-        if isinstance(self._maximum, RangedVariable):
-            return self._maximum.value
-        else:
-            return self._maximum
+        return self._maximum_value
 
     @maximum_value.setter
     def maximum_value(self, maximum) -> None:
@@ -141,9 +182,7 @@ class RangedVariable(object):
             self._maximum.value = maximum
         else:
             self._maximum = maximum
-
-        self._numerical_min = min(self.minimum_value, self.maximum_value)
-        self._numerical_max = max(self.minimum_value, self.maximum_value)
+            self._update_range()
 
     @property
     def value_range(self):
@@ -162,8 +201,8 @@ class RangedVariable(object):
         This method has access to this variable's ranges, and the value and
         ranges of the variable it is to be updated from.
         Using this as a slot will require re-computation of the slope each
-        time the signal fires. To avoid this would need a permanent object
-        with a slot to connect to the signal which can update this variable.
+        time the signal fires. To avoid this, connect a Mapping between the
+        two ranged variables to the signal instead.
 
         Parameters
         ----------
@@ -184,8 +223,6 @@ class RangedVariable(object):
             The ranged variable from which to map this ranged variable's minimum's value.
         """
         self.minimum.map_value(ranged_variable)
-        self._numerical_min = min(self.minimum_value, self.maximum_value)
-        self._numerical_max = max(self.minimum_value, self.maximum_value)
 
     def map_maximum_value(self, ranged_variable):
         """Update this ranged variable's maximum's value from another.
@@ -196,8 +233,35 @@ class RangedVariable(object):
             The ranged variable from which to map this ranged variable's maximum's value.
         """
         self.maximum.map_value(ranged_variable)
-        self._numerical_min = min(self.minimum_value, self.maximum_value)
-        self._numerical_max = max(self.minimum_value, self.maximum_value)
+
+    def _update_range(self) -> None:
+        """Update the cached numerical range from the minimum and maximum.
+
+        This is called when a numerical extremum is set, and by an extremum
+        which is a ranged variable when its value changes, so the cache is
+        updated once per change. range_changed is emitted if the range has
+        changed.
+        """
+        if isinstance(self._minimum, RangedVariable):
+            minimum_value = self._minimum.value
+        else:
+            minimum_value = self._minimum
+
+        if isinstance(self._maximum, RangedVariable):
+            maximum_value = self._maximum.value
+        else:
+            maximum_value = self._maximum
+
+        if minimum_value == self._minimum_value and \
+                maximum_value == self._maximum_value:
+            return
+
+        self._minimum_value = minimum_value
+        self._maximum_value = maximum_value
+        self._numerical_min = min(minimum_value, maximum_value)
+        self._numerical_max = max(minimum_value, maximum_value)
+
+        self.range_changed.emit()
 
     def __str__(self) -> str:
         """Create a human-readable representation of this object."""
@@ -0,0 +1,114 @@
+import time
+
+from .signal import Signal
+
+
+class RateLimitedSignal(Signal):
+    """A signal whose emit_value calls are limited to a maximum rate.
+
+    Values emitted within 1 / max_rate_hz seconds of the last delivered
+    emission are held back rather than delivered. Only the latest held value
+    is kept, and it is delivered (on the trailing edge) by the first call to
+    poll once the interval has passed, so slots always end up with the most
+    recent value while being called at a bounded rate. Each held value that
+    is replaced by a newer one before it is delivered is counted in
+    drop_count; each delivered emission is counted in emit_count.
+
+    Only emit_value is rate-limited. With max_rate_hz set to None, emit_value
+    delivers every value immediately, as a plain Signal does.
+
+    Parameters
+    ----------
+    max_rate_hz : int or None
+        The maximum number of emissions delivered per second, or None for no
+        limit.
+    clock : module or object
+        The source of time, providing ticks_us and ticks_diff as in the
+        micropython time module.
+    """
+    __slots__ = (
+        "_interval_us",
+        "_last_emit_us",
+        "_pending",
+        "_has_pending",
+        "_clock",
+        "emit_count",
+        "drop_count",
+    )
+
+    def __init__(self, max_rate_hz=None, clock=time):
+        super().__init__()
+
+        self._clock = clock
+        self._interval_us = 0
+        self._last_emit_us = clock.ticks_us()
+        self._pending = None
+        self._has_pending = False
+
+        self.emit_count = 0
+        """The number of emissions delivered to the slots."""
+
+        self.drop_count = 0
+        """The number of held values replaced before they were delivered."""
+
+        self.max_rate_hz = max_rate_hz
+
+    @property
+    def max_rate_hz(self):
+        """The maximum number of emissions delivered per second, or None for no limit."""
+        if self._interval_us:
+            return 1_000_000 // self._interval_us
+        else:
+            return None
+
+    @max_rate_hz.setter
+    def max_rate_hz(self, max_rate_hz) -> None:
+        """Set the maximum number of emissions delivered per second."""
+        if max_rate_hz is None:
+            self._interval_us = 0
+        elif 0 < max_rate_hz <= 1_000_000:
+            self._interval_us = 1_000_000 // max_rate_hz
+        else:
+            raise ValueError("Invalid maximum rate: ", max_rate_hz)
+
+    def emit_value(self, value) -> None:
+        """Deliver the value to the slots now, or hold it if emitted too recently.
+
+        Parameters
+        ----------
+        value
+            The argument with which to call each slot.
+        """
+        now = self._clock.ticks_us()
+
+        if self._clock.ticks_diff(now, self._last_emit_us) >= self._interval_us:
+            self.__deliver(value, now)
+        else:
+            if self._has_pending:
+                self.drop_count += 1
+            self._pending = value
+            self._has_pending = True
+
+    def poll(self) -> None:
+        """Deliver the held value if there is one and the interval has passed."""
+        if not self._has_pending:
+            return
+
+        now = self._clock.ticks_us()
+
+        if self._clock.ticks_diff(now, self._last_emit_us) >= self._interval_us:
+            self.__deliver(self._pending, now)
+
+    def reset_counters(self) -> None:
+        """Reset the emit and drop counters to zero."""
+        self.emit_count = 0
+        self.drop_count = 0
+
+    def __deliver(self, value, now) -> None:
+        self._pending = None
+        self._has_pending = False
+        self._last_emit_us = now
+        self.emit_count += 1
+
+        for slot in self._slots:
+            slot(value)
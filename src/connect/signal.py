@@ -1,7 +1,28 @@
 class Signal(object):
-    """A signal emitted by an object instance."""
+    """A signal emitted by an object instance.
+
+    The connected slots are kept in a tuple which is only rebuilt when slots
+    are connected or disconnected, so emitting just iterates the tuple and
+    returns at once when nothing is connected. emit passes keyword arguments
+    to each slot, which builds a dictionary on every call. emit_value passes
+    a single positional argument instead, so it allocates nothing and is the
+    one to use for signals emitted from scan loops, such as an analog
+    input's value_changed.
+
+    A signal given a DeferredQueue with defer_to can also be emitted from an
+    interrupt handler with emit_deferred, which queues the emission without
+    allocating and leaves the slots to be called outside the interrupt.
+
+    Profiling (see enable_profiling and connect.profile) replaces each slot
+    with a SlotProfile wrapper that times its calls. Emitting is unchanged,
+    so a signal that is not being profiled pays nothing for it.
+    """
+    __slots__ = ("_slots", "_deferred_queue", "_profile_clock")
+
     def __init__(self):
-        self._slots = []
+        self._slots = ()
+        self._deferred_queue = None
+        self._profile_clock = None
 
     def connect(self, *slots):
         """Connect the specified slots to this signal.
@@ -13,7 +34,9 @@ class Signal(object):
         """
         for slot in slots:
             if slot not in self._slots:
-                self._slots.append(slot)
+                if self._profile_clock is not None:
+                    slot = SlotProfile(slot, self._profile_clock)
+                self._slots += (slot,)
 
     def disconnect(self, *slots):
         """Disconnect the specified slots from this signal.
@@ -23,15 +46,85 @@ class Signal(object):
         slots : list of callable
             The callable slots to disconnect from this signal.
         """
-        for slot in slots:
-            if slot in self._slots:
-                self._slots.pop(self._slots.index(slot))
+        self._slots = tuple(
+            slot for slot in self._slots
+            if (slot.slot if isinstance(slot, SlotProfile) else slot)
+            not in slots
+        )
 
     def emit(self, **kwargs) -> None:
         """Call each slot connected to this signal."""
+        if not self._slots:
+            return
+
         for slot in self._slots:
             slot(**kwargs)
 
+    def emit_value(self, value) -> None:
+        """Call each slot connected to this signal with a single positional argument.
+
+        Parameters
+        ----------
+        value
+            The argument with which to call each slot.
+        """
+        for slot in self._slots:
+            slot(value)
+
+    def defer_to(self, deferred_queue) -> None:
+        """Set the queue used by emit_deferred.
+
+        Parameters
+        ----------
+        deferred_queue : DeferredQueue
+            The queue into which deferred emissions of this signal are pushed.
+        """
+        self._deferred_queue = deferred_queue
+
+    def emit_deferred(self, value=None) -> None:
+        """Queue this signal to be emitted outside of an interrupt handler.
+
+        The signal must have been given a queue with defer_to. Queuing
+        allocates no memory, so this may be called from a hard interrupt
+        handler.
+
+        Parameters
+        ----------
+        value : optional
+            The value to emit the signal with, using emit_value. If None,
+            the signal is emitted with emit.
+        """
+        self._deferred_queue.push(self, value)
+
+    @property
+    def slot_profiles(self) -> tuple:
+        """The profiles of this signal's slots, empty unless profiling is enabled."""
+        return tuple(slot for slot in self._slots
+                     if isinstance(slot, SlotProfile))
+
+    def enable_profiling(self, clock) -> None:
+        """Record the call count and durations of each slot of this signal.
+
+        Parameters
+        ----------
+        clock : module or object
+            The source of time, providing ticks_us and ticks_diff as in the
+            micropython time module.
+        """
+        self._profile_clock = clock
+        self._slots = tuple(
+            slot if isinstance(slot, SlotProfile) else SlotProfile(slot, clock)
+            for slot in self._slots
+        )
+
+    def disable_profiling(self) -> None:
+        """Stop profiling this signal's slots, discarding their profiles."""
+        self._profile_clock = None
+        self._slots = tuple(
+            slot.slot if isinstance(slot, SlotProfile) else slot
+            for slot in self._slots
+        )
+
     def __str__(self) -> str:
         """Create a human-readable representation of this object."""
         str_rep = self.__class__.__name__ + ", slots = ["
@@ -39,3 +132,74 @@ class Signal(object):
             str_rep += str(slot) + ", "
 
         return str_rep[:-2]
+
+
+class SlotProfile(object):
+    """A slot wrapped to record the number and duration of its calls.
+
+    A slot profile compares equal to the slot it wraps, so a profiled signal's
+    slots can be connected and disconnected as usual.
+
+    Parameters
+    ----------
+    slot : callable
+        The slot to profile.
+    clock : module or object
+        The source of time, providing ticks_us and ticks_diff as in the
+        micropython time module.
+    """
+    __slots__ = (
+        "slot",
+        "call_count",
+        "total_us",
+        "max_us",
+        "last_us",
+        "_clock",
+    )
+
+    def __init__(self, slot, clock):
+        self.slot = slot
+        self._clock = clock
+        self.call_count = 0
+        self.total_us = 0
+        self.max_us = 0
+        self.last_us = 0
+
+    @property
+    def name(self) -> str:
+        """A human-readable name for the profiled slot."""
+        name = getattr(self.slot, "__name__", None)
+        if name is None:
+            return str(self.slot)
+
+        owner = getattr(self.slot, "__self__", None)
+        if owner is None:
+            return name
+        else:
+            return owner.__class__.__name__ + "." + name
+
+    def __call__(self, *args, **kwargs):
+        start = self._clock.ticks_us()
+        self.slot(*args, **kwargs)
+        duration = self._clock.ticks_diff(self._clock.ticks_us(), start)
+
+        self.call_count += 1
+        self.total_us += duration
+        self.last_us = duration
+        if duration > self.max_us:
+            self.max_us = duration
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, SlotProfile):
+            other = other.slot
+        return self.slot == other
+
+    def __hash__(self) -> int:
+        return hash(self.slot)
+
+    def reset(self) -> None:
+        """Reset the recorded call count and durations to zero."""
+        self.call_count = 0
+        self.total_us = 0
+        self.max_us = 0
+        self.last_us = 0
@@ -1,14 +1,26 @@
 import machine
-import micropython
+
+from .deferred_queue import DeferredQueue
+from .signal import Signal
 
 
 class TimerConnector:
-    """Micropython timer for timed event loops."""
+    """Micropython timer for timed event loops.
+
+    Each timeout of the timer emits timed_out, deferred to the shared
+    DeferredQueue, so the looper steps outside the timer interrupt and the
+    interrupt handler itself allocates nothing.
+    """
     def __init__(self,
                  looper,
                  freq: int,
                  computer=None):
 
+        self.timed_out = Signal()
+        """Signal emitted, outside the timer interrupt, on each timeout."""
+        self.timed_out.defer_to(DeferredQueue.shared())
+        self.timed_out.connect(self.update)
+
         self._timer = machine.Timer(-1,
                                     freq=freq,
                                     callback=self.callback)
@@ -17,8 +29,8 @@ class TimerConnector:
 
     def callback(self, _):
         """The callback to run on each timed execution."""
-        micropython.schedule(self.update, 0)
+        self.timed_out.emit_deferred()
 
-    def update(self, _):
-        """The update method to be scheduled by the callback."""
+    def update(self, _=None):
+        """The update method run when timed_out is emitted."""
         self._looper.take_step()
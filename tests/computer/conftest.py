@@ -0,0 +1,30 @@
+import os
+import sys
+import time
+
+import pytest
+
+# the computer package imports itself and connect by absolute names, as on
+# the Computer, where both are at the root of the filesystem
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "src"))
+
+
+class FakeClock(object):
+    """A microsecond clock which only moves when it is advanced."""
+
+    def __init__(self):
+        self.now = 0
+
+    def ticks_us(self):
+        return self.now
+
+    def advance(self, us):
+        self.now += us
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Replace time.ticks_us with a FakeClock."""
+    fake_clock = FakeClock()
+    monkeypatch.setattr(time, "ticks_us", fake_clock.ticks_us)
+    return fake_clock
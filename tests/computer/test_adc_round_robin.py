@@ -0,0 +1,115 @@
+import pytest
+
+from computer.base.analog_input import ADCRoundRobin, FakeADCRegisters
+
+
+def u16(value):
+    return (value << 4) | (value >> 8)
+
+
+def test_start_configures_registers():
+
+    registers = FakeADCRegisters()
+    capture = ADCRoundRobin(mem32=registers)
+    capture.start(10_000)
+
+    assert capture.running
+    assert registers[ADCRoundRobin.DIV] == 48_000_000 * 256 // 40_000 - 256
+
+    cs = registers[ADCRoundRobin.CS]
+    assert cs & ADCRoundRobin.CS_EN
+    assert cs & ADCRoundRobin.CS_START_MANY
+    assert (cs >> ADCRoundRobin.CS_AINSEL_SHIFT) & 0x7 == 0
+    assert (cs >> ADCRoundRobin.CS_RROBIN_SHIFT) & 0x1F == 0b1111
+
+    fcs = registers[ADCRoundRobin.FCS]
+    assert fcs & ADCRoundRobin.FCS_EN
+    assert not fcs & ADCRoundRobin.FCS_OVER
+
+
+def test_drain_follows_round_robin():
+
+    registers = FakeADCRegisters({1: 0x100, 3: 0xABC})
+    capture = ADCRoundRobin(channels=(1, 3), block_size=4, mem32=registers)
+    capture.start(1000)
+
+    # the first conversion is of the first channel
+    registers.convert(3)
+    assert capture.drain() == 3
+
+    assert list(capture.buffers[0][:2]) == [u16(0x100), u16(0x100)]
+    assert capture.buffers[1][0] == u16(0xABC)
+    assert capture.latest(1) == u16(0x100)
+    assert capture.latest(3) == u16(0xABC)
+
+    # the next reading continues with the second channel
+    registers.values[3] = 0x123
+    registers.convert(1)
+    capture.drain()
+
+    assert capture.latest(3) == u16(0x123)
+    assert capture.sample_count == 4
+
+
+def test_buffers_wrap():
+
+    registers = FakeADCRegisters({0: 1})
+    capture = ADCRoundRobin(channels=(0,), block_size=2, mem32=registers)
+    capture.start(1000)
+
+    for value in (1, 2, 3):
+        registers.values[0] = value
+        registers.convert(1)
+        capture.drain()
+
+    assert list(capture.buffers[0]) == [u16(3), u16(2)]
+    assert capture.latest(0) == u16(3)
+
+
+def test_overflow_restarts_from_first_channel():
+
+    registers = FakeADCRegisters({0: 1, 1: 2})
+    capture = ADCRoundRobin(channels=(0, 1), mem32=registers)
+    capture.start(1000)
+
+    registers.convert(ADCRoundRobin.DEFAULT_BLOCK_SIZE)
+    assert capture.drain() == 0
+    assert capture.overflow_count == 1
+    assert not registers[ADCRoundRobin.FCS] & ADCRoundRobin.FCS_OVER
+    assert registers.fifo == []
+
+    registers.convert(1)
+    capture.drain()
+    assert capture.latest(0) == u16(1)
+    assert capture.sample_count == 1
+
+
+def test_stop():
+
+    registers = FakeADCRegisters({0: 1})
+    capture = ADCRoundRobin(mem32=registers)
+    capture.start(1000)
+    registers.convert(2)
+    capture.stop()
+
+    assert not capture.running
+    assert registers[ADCRoundRobin.CS] & ~ADCRoundRobin.CS_READY == \
+        ADCRoundRobin.CS_EN
+    assert registers[ADCRoundRobin.DIV] == 0
+    assert registers.fifo == []
+
+    registers.convert(1)
+    assert registers.fifo == []
+
+
+def test_invalid_settings():
+
+    with pytest.raises(ValueError):
+        ADCRoundRobin(channels=(1, 0), mem32=FakeADCRegisters())
+
+    with pytest.raises(ValueError):
+        ADCRoundRobin(channels=(4,), mem32=FakeADCRegisters())
+
+    capture = ADCRoundRobin(mem32=FakeADCRegisters())
+    with pytest.raises(ValueError):
+        capture.start(200_000)
@@ -0,0 +1,72 @@
+from computer.base.analog_output import AnalogOutput
+from connect.curve import Curve
+from connect.ranged_variable import RangedVariable
+
+
+class Output(AnalogOutput):
+    """A 12-bit analog output recording the values written to it."""
+
+    def __init__(self):
+        super().__init__()
+        self.written = []
+
+    @property
+    def hardware_min(self) -> int:
+        return 0
+
+    @property
+    def hardware_max(self) -> int:
+        return 4095
+
+    def write(self, value):
+        self.written.append(value)
+
+
+def test_curve_from_small_and_float_ranges():
+
+    output = Output()
+    output.curve = Curve.from_function(lambda x: x * x)
+
+    for source in (RangedVariable(value=50, minimum=0, maximum=100),
+                   RangedVariable(value=0.5, minimum=0.0, maximum=1.0)):
+        output.map_and_write_value(source)
+        assert abs(output.written[-1] - 4095 / 4) <= 2
+
+        source.value = source.maximum_value
+        output.map_and_write_value(source)
+        assert output.written[-1] == 4095
+
+
+def test_curve_follows_range_changes():
+
+    output = Output()
+    output.curve = Curve.from_function(lambda x: x)
+    source = RangedVariable(value=100, minimum=0, maximum=100)
+
+    output.map_and_write_value(source)
+    assert output.written[-1] == 4095
+
+    source.maximum_value = 200
+    output.map_and_write_value(source)
+    assert abs(output.written[-1] - 4095 / 2) <= 1
+
+
+def test_curve_sources_do_not_leak():
+
+    output = Output()
+    output.curve = Curve.from_function(lambda x: x)
+    sources = [RangedVariable(value=1, minimum=0, maximum=10),
+               RangedVariable(value=1, minimum=0, maximum=20)]
+
+    output.map_and_write_value(sources[0])
+    output.map_and_write_value(sources[1])
+    slots = [len(source.range_changed._slots) for source in sources]
+    index = output._AnalogOutput__curve_index
+    index_slots = len(index.range_changed._slots)
+
+    for _ in range(100):
+        for source in sources:
+            output.map_and_write_value(source)
+
+    assert [len(source.range_changed._slots) for source in sources] == slots
+    assert len(index.range_changed._slots) == index_slots == 1
@@ -0,0 +1,199 @@
+import pytest
+
+from computer.clock_engine import ClockEngine
+
+
+class Output(object):
+
+    def __init__(self, clock):
+        self.clock = clock
+        self.pulse_times = []
+
+    def pulse(self, width_us):
+        self.pulse_times.append(self.clock.now)
+
+
+class Source(object):
+
+    def __init__(self, period_us):
+        self.period = period_us
+        self.capturing = True
+        self.edge_callback = None
+
+    def period_us(self, periods=1):
+        return self.period
+
+
+def run(engine, clock, edge_times, until):
+    """Advance the clock to each edge and each scheduled pulse in turn."""
+    edge_times = list(edge_times)
+    pulse_timer = engine._pulse_timer
+
+    while True:
+        pulse_time = None
+        if pulse_timer.active:
+            pulse_time = pulse_timer.armed_at + pulse_timer.settings["period"]
+
+        if edge_times and (pulse_time is None or edge_times[0] <= pulse_time):
+            clock.now = edge_times.pop(0)
+            engine.source.edge_callback(clock.now)
+        elif pulse_time is not None and pulse_time <= until:
+            clock.now = pulse_time
+            pulse_timer.active = False
+            pulse_timer.fire()
+        else:
+            return
+
+
+@pytest.fixture
+def engine_for(clock, monkeypatch):
+
+    def engine_for(**settings):
+        engine = ClockEngine(Output(clock), Source(settings.pop("period")),
+                             **settings)
+
+        # note when the one-shot pulse timer is armed, to know when it fires
+        pulse_timer = engine._pulse_timer
+        arm = pulse_timer.init
+
+        def init(**timer_settings):
+            pulse_timer.armed_at = clock.now
+            arm(**timer_settings)
+
+        monkeypatch.setattr(pulse_timer, "init", init)
+        engine.start()
+        return engine
+
+    return engine_for
+
+
+def test_multiply(clock, engine_for):
+
+    engine = engine_for(period=1200, multiply=3)
+    run(engine, clock, [0, 1200], until=2400)
+
+    assert engine.output.pulse_times == [0, 400, 800, 1200, 1600, 2000]
+
+
+def test_divide_and_multiply(clock, engine_for):
+
+    engine = engine_for(period=900, divide=2, multiply=3)
+    run(engine, clock, [0, 900, 1800, 2700], until=3600)
+
+    assert engine.output.pulse_times == [0, 600, 1200, 1800, 2400, 3000]
+
+
+def test_swing_delays_every_second_pulse(clock, engine_for):
+
+    engine = engine_for(period=1000, multiply=2, swing=0.5)
+    run(engine, clock, [0, 1000], until=2000)
+
+    assert engine.output.pulse_times == [0, 750, 1000, 1750]
+
+
+def test_swing_across_cycles(clock, engine_for):
+
+    engine = engine_for(period=1000, swing=0.25)
+    run(engine, clock, [0, 1000, 2000, 3000], until=4000)
+
+    assert engine.output.pulse_times == [0, 1250, 2000, 3250]
+
+
+def test_new_cycle_discards_scheduled_pulses(clock, engine_for):
+
+    engine = engine_for(period=1000, multiply=4)
+    run(engine, clock, [0, 300], until=600)
+
+    # the pulse due at 500 is replaced by the new cycle's pulses
+    assert engine.output.pulse_times == [0, 250, 300, 550]
+
+
+def test_long_cycles_stay_small_integers(clock, engine_for):
+
+    engine = engine_for(period=2_000_000,
+                        divide=ClockEngine.MAX_DIVIDE,
+                        multiply=3,
+                        swing=0.9)
+    run(engine, clock, [0], until=0)
+
+    assert engine._spacing * engine.multiply <= ClockEngine.MAX_CYCLE_US
+    assert engine._pulse_timer.settings["period"] < 1 << 30
+
+
+def test_internal_clock(clock):
+
+    output = Output(clock)
+    engine = ClockEngine(output, multiply=2)
+    engine.start(period_us=1000)
+    reference_timer = engine._reference_timer
+
+    assert engine.running
+    assert reference_timer.settings["period"] == 1000
+    assert reference_timer.settings["mode"] == reference_timer.ONE_SHOT
+    assert reference_timer.settings["hard"]
+
+    clock.advance(1000)
+    reference_timer.fire()
+    assert output.pulse_times == [1000]
+    assert engine._pulse_timer.settings["period"] == 500
+    assert engine._pulse_timer.settings["hard"]
+    assert reference_timer.settings["period"] == 1000
+
+    engine.stop()
+    assert not engine.running
+    assert not engine._pulse_timer.active
+    assert not reference_timer.active
+
+
+def test_internal_clock_period_change_keeps_phase(clock):
+
+    output = Output(clock)
+    engine = ClockEngine(output)
+    engine.start(period_us=1000)
+    reference_timer = engine._reference_timer
+
+    clock.advance(1000)
+    reference_timer.fire()
+
+    # the next edge is a new period after the last edge, not after the change
+    clock.advance(300)
+    engine.period_us = 2000
+    assert reference_timer.settings["period"] == 1700
+
+    clock.advance(100)
+    engine.period_us = 1500
+    assert reference_timer.settings["period"] == 1100
+
+    # an edge already due is made at once, keeping the phase of the clock
+    engine.period_us = 350
+    assert reference_timer.settings["period"] == 1
+    clock.advance(1)
+    reference_timer.fire()
+    assert output.pulse_times == [1000, 1401]
+    assert reference_timer.settings["period"] == 1700 - 1401
+
+    # after more than a period has been missed, the clock restarts from now
+    clock.advance(199)
+    engine.period_us = 50
+    clock.advance(1)
+    reference_timer.fire()
+    assert output.pulse_times == [1000, 1401, 1601]
+    assert reference_timer.settings["period"] == 50
+
+    engine.stop()
+
+
+def test_invalid_settings(clock):
+
+    output = Output(clock)
+
+    for settings in ({"divide": 0},
+                     {"divide": ClockEngine.MAX_DIVIDE + 1},
+                     {"multiply": ClockEngine.MAX_MULTIPLY + 1},
+                     {"swing": 1}):
+        with pytest.raises(ValueError):
+            ClockEngine(output, **settings)
+
+    engine = ClockEngine(output)
+    with pytest.raises(ValueError):
+        engine.period_us = ClockEngine.MAX_CYCLE_US + 1
@@ -0,0 +1,142 @@
+import array
+import machine
+import time
+
+import pytest
+
+from computer.sockets.cv_audio.cv_audio_input_sockets import \
+    CVAudioInputSockets
+from connect.deferred_queue import DeferredQueue
+
+
+class TickingClock(object):
+    """A microsecond clock moving on by a microsecond each time it is read."""
+
+    def __init__(self):
+        self.now = 0
+
+    def ticks_us(self):
+        self.now += 1
+        return self.now
+
+
+class Reader(object):
+    """An ADC recording the time of each reading, which it returns."""
+
+    def __init__(self, clock):
+        self.clock = clock
+        self.times = []
+
+    def read_u16(self):
+        self.times.append(self.clock.now)
+        return self.clock.now
+
+
+@pytest.fixture
+def sockets(monkeypatch):
+    # socket one is on GPIO 27, socket two on GPIO 26
+    monkeypatch.setitem(machine.ADC.values, 27, 100)
+    monkeypatch.setitem(machine.ADC.values, 26, 200)
+    sockets = CVAudioInputSockets()
+    yield sockets
+    sockets.stop_capture()
+    DeferredQueue.shared().drain()
+
+
+def fill(sockets, samples):
+    for _ in range(samples):
+        sockets._timer.fire()
+
+
+def test_capture(sockets):
+
+    left, right = sockets.capture(4)
+    assert list(left) == [100] * 4
+    assert list(right) == [200] * 4
+
+    # the buffers are reused while the number of samples is unchanged
+    assert sockets.capture(4)[0] is left
+    assert sockets.capture(5)[0] is not left
+
+    assert sockets.read_range(3) == (0, 0)
+
+
+def test_capture_into_timing(sockets, monkeypatch):
+
+    clock = TickingClock()
+    monkeypatch.setattr(time, "ticks_us", clock.ticks_us)
+    sockets._adc_one = Reader(clock)
+    sockets._adc_two = Reader(clock)
+
+    left = array.array("H", [0] * 6)
+    right = array.array("H", [0] * 6)
+    sockets.capture_into(left, right, sample_rate_hz=10_000)
+
+    # each reading is taken as soon as its deadline has passed, and the
+    # first deadline is the clock's first reading
+    times = sockets._adc_one.times
+    assert len(times) == 6
+    for i, reading_time in enumerate(times):
+        assert 0 <= reading_time - (1 + 100 * i) <= 2
+    assert list(left) == times
+
+
+def test_background_capture(sockets):
+
+    captured = []
+    sockets.block_captured.connect(captured.append)
+
+    sockets.start_capture(block_size=3, sample_rate_hz=8000)
+    assert sockets.capturing
+    assert sockets._timer.settings["hard"]
+    assert sockets._timer.settings["freq"] == 8000
+    assert sockets.captured_block is None
+
+    fill(sockets, 2)
+    assert sockets.captured_block is None
+
+    fill(sockets, 1)
+    DeferredQueue.shared().drain()
+    assert captured == [sockets]
+
+    first = sockets.captured_block
+    assert [list(block) for block in first] == [[100] * 3, [200] * 3]
+
+    # the next block is filled into the other pair of buffers
+    machine.ADC.values[27] = 300
+    fill(sockets, 3)
+    second = sockets.captured_block
+    assert second[0] is not first[0]
+    assert list(second[0]) == [300] * 3
+    assert sockets.overrun_count == 0
+
+    timer = sockets._timer
+    sockets.stop_capture()
+    assert not sockets.capturing
+    assert not timer.active
+
+
+def test_overrun(sockets):
+
+    sockets.start_capture(block_size=2, sample_rate_hz=8000)
+
+    fill(sockets, 2)
+    fill(sockets, 2)
+    assert sockets.overrun_count == 1
+
+    sockets.captured_block
+    fill(sockets, 2)
+    assert sockets.overrun_count == 1
+
+    fill(sockets, 4)
+    assert sockets.overrun_count == 3
+
+
+def test_restart_forgets_blocks(sockets):
+
+    sockets.start_capture(block_size=2, sample_rate_hz=8000)
+    fill(sockets, 2)
+    assert sockets.captured_block is not None
+
+    sockets.start_capture(block_size=2, sample_rate_hz=8000)
+    assert sockets.captured_block is None
@@ -0,0 +1,145 @@
+import array
+
+import pytest
+
+from computer.dac import DAC
+from computer.dac_stream import DACStream, FakeDACStream
+from computer.sockets.cv_audio.cv_audio_output_sockets import \
+    CVAudioOutputSockets
+
+
+def block(stream, value):
+    return array.array("I", [DACStream.pack(value, value)] * stream.block_size)
+
+
+def test_pack():
+
+    word = DACStream.pack(0, 4095)
+
+    assert word >> 16 == DAC.frame(DAC.CHANNEL_A, 0)
+    assert word & 0xFFFF == DAC.frame(DAC.CHANNEL_B, 4095)
+
+
+def test_idle_until_first_block():
+
+    stream = FakeDACStream(8000, block_size=4)
+    stream.start()
+
+    assert stream.running
+    assert stream.words == [DACStream.pack(DACStream.IDLE_VALUE,
+                                           DACStream.IDLE_VALUE)]
+    assert stream.transferring is None
+
+
+def test_blocks_played_in_order():
+
+    freed = []
+
+    stream = FakeDACStream(8000, block_size=4)
+    stream.block_freed.connect(freed.append)
+    stream.start()
+
+    assert stream.submit_block(block(stream, 1))
+    assert stream.submit_block(block(stream, 2))
+    assert not stream.submit_block(block(stream, 3))
+
+    stream.finish_transfer()
+    assert freed == [stream]
+    assert stream.submit_block(block(stream, 3))
+
+    stream.finish_transfer()
+    stream.finish_transfer()
+
+    assert stream.words[1:] == list(block(stream, 1)) + \
+        list(block(stream, 2)) + list(block(stream, 3))
+    assert stream.block_count == 3
+    assert stream.underrun_count == 1
+    assert len(freed) == 3
+
+
+def test_submitted_block_is_copied():
+
+    stream = FakeDACStream(8000, block_size=4)
+    stream.start()
+
+    samples = block(stream, 1)
+    stream.submit_block(samples)
+    samples[0] = 0
+
+    stream.finish_transfer()
+
+    assert stream.words[1] == DACStream.pack(1, 1)
+
+
+def test_underrun_then_resume():
+
+    stream = FakeDACStream(8000, block_size=2)
+    stream.start()
+    stream.submit_block(block(stream, 1))
+    stream.finish_transfer()
+
+    assert stream.underrun_count == 1
+    assert stream.transferring is None
+
+    assert stream.submit_block(block(stream, 2))
+    assert stream.transferring is not None
+
+    stream.reset_counters()
+    assert stream.underrun_count == 0
+    assert stream.block_count == 0
+
+
+def test_stop_discards_blocks():
+
+    stream = FakeDACStream(8000, block_size=2)
+    stream.start()
+    stream.submit_block(block(stream, 1))
+    stream.submit_block(block(stream, 2))
+    stream.stop()
+
+    assert not stream.running
+    assert stream.transferring is None
+
+    stream.start()
+    assert stream.transferring is None
+    assert stream.submit_block(block(stream, 3))
+
+
+def test_invalid_block_size():
+
+    with pytest.raises(ValueError):
+        FakeDACStream(8000, block_size=0)
+
+
+def test_sockets_stream():
+
+    sockets = CVAudioOutputSockets()
+    assert sockets.underrun_count == 0
+
+    freed = []
+    sockets.block_freed.connect(freed.append)
+
+    stream = sockets.start_stream(8000, block_size=2,
+                                  stream=FakeDACStream(8000, block_size=2))
+    assert sockets.stream is stream
+    assert stream.running
+
+    samples = array.array("I", [0] * 2)
+    DACStream.pack_block([1, 2], [3, 4], samples)
+    assert sockets.submit_block(samples)
+    stream.finish_transfer()
+
+    assert stream.words[1:] == [DACStream.pack(1, 3), DACStream.pack(2, 4)]
+    assert freed == [stream]
+    assert sockets.underrun_count == 1
+
+    sockets.stop_stream()
+    assert not stream.running
+    assert sockets.stream is None
+    assert sockets.underrun_count == 0
+
+    # a stopped stream no longer reaches the sockets' signal
+    stream.start()
+    stream.submit_block(samples)
+    stream.finish_transfer()
+    assert freed == [stream]
@@ -0,0 +1,283 @@
+import types
+
+import pytest
+
+from computer.pio_pulse_generator import PIOPulseGenerator, _pulse_train
+from computer.pulse_generator import FakePulseGenerator, PulseGenerator
+from computer.sockets.pulses.pulse_output_socket import PulseOutputSocketOne
+
+
+def assemble(program):
+    """Record the instructions of a PIO program, its labels and its wrap."""
+    instructions = []
+    labels = {}
+    wrap = {}
+
+    def append(*instruction):
+        instructions.append(instruction)
+
+    namespace = {
+        "wrap_target": lambda: wrap.update(target=len(instructions)),
+        "wrap": lambda: wrap.update(end=len(instructions) - 1),
+        "label": lambda name: labels.update({name: len(instructions)}),
+        "pull": lambda mode: append("pull"),
+        "mov": lambda destination, source: append("mov", destination, source),
+        "set": lambda destination, value: append("set", value),
+        "jmp": lambda *args: append("jmp", *args) if len(args) == 2
+        else append("jmp", None, *args),
+        "invert": lambda source: ("invert", source),
+    }
+    for name in ("block", "pins", "null", "osr", "isr", "x", "y", "x_dec",
+                 "y_dec", "x_not_y"):
+        namespace[name] = name
+
+    types.FunctionType(program.__code__, namespace)()
+
+    return instructions, labels, wrap
+
+
+def simulate(words, cycles):
+    """Run the pulse train program on a FIFO of words, one cycle at a time.
+
+    Returns the level of the pin after each cycle.
+    """
+    instructions, labels, wrap = assemble(_pulse_train)
+    # words are 32 bits, so a count of -1 is all ones
+    fifo = [word & 0xFFFFFFFF for word in words]
+    registers = {"osr": 0, "isr": 0, "x": 0, "y": 0, "null": 0}
+    pin = 1
+    levels = []
+    pc = wrap["target"]
+
+    for _ in range(cycles):
+        instruction = instructions[pc]
+        following = pc + 1
+
+        if instruction[0] == "pull":
+            if not fifo:
+                # a blocking pull stalls until a word arrives
+                levels.append(pin)
+                continue
+            registers["osr"] = fifo.pop(0)
+        elif instruction[0] == "mov":
+            source = instruction[2]
+            if isinstance(source, tuple):
+                value = ~registers[source[1]] & 0xFFFFFFFF
+            else:
+                value = registers[source]
+            registers[instruction[1]] = value
+        elif instruction[0] == "set":
+            pin = instruction[1]
+        elif instruction[0] == "jmp":
+            condition = instruction[1]
+            if condition is None:
+                jump = True
+            elif condition == "x_not_y":
+                jump = registers["x"] != registers["y"]
+            else:
+                register = condition[0]
+                jump = registers[register] != 0
+                registers[register] = (registers[register] - 1) & 0xFFFFFFFF
+            if jump:
+                following = labels[instruction[2]]
+
+        if pc == wrap["end"] and following == pc + 1:
+            following = wrap["target"]
+        pc = following
+        levels.append(pin)
+
+    return levels
+
+
+def runs(levels):
+    """Get the (level, length) runs of the levels, after the first on."""
+    start = levels.index(0)
+    result = []
+    for level in levels[start:]:
+        if result and result[-1][0] == level:
+            result[-1][1] += 1
+        else:
+            result.append([level, 1])
+
+    return [tuple(run) for run in result]
+
+
+def test_program_timing():
+
+    generator = FakePulseGenerator()
+    generator.start()
+    generator.send(5, 7, 3)
+
+    levels = simulate(generator.words, 100)
+
+    # the output is inverted, so a pulse is on while the pin is low
+    assert runs(levels)[:5] == [(0, 5), (1, 7), (0, 5), (1, 7), (0, 5)]
+    assert len(runs(levels)) == 6
+
+
+def test_program_minimum_times():
+
+    generator = FakePulseGenerator()
+    generator.start()
+    generator.send(PulseGenerator.MIN_HIGH_US, PulseGenerator.MIN_LOW_US, 2)
+
+    assert runs(simulate(generator.words, 50))[:3] == [
+        (0, PulseGenerator.MIN_HIGH_US),
+        (1, PulseGenerator.MIN_LOW_US),
+        (0, PulseGenerator.MIN_HIGH_US),
+    ]
+
+
+def test_program_commands_follow_each_other():
+
+    generator = FakePulseGenerator()
+    generator.start()
+    generator.send(10, 20)
+    generator.send(30, 40)
+
+    # reading the next command adds 7 cycles to the last off time
+    assert runs(simulate(generator.words, 200))[:3] == [(0, 10), (1, 27),
+                                                       (0, 30)]
+
+
+def test_program_forever():
+
+    generator = FakePulseGenerator()
+    generator.start()
+    generator.send(5, 7, PulseGenerator.FOREVER)
+    generator.send(20, 20)
+
+    # the pulse repeats, and the command queued after it is never played
+    levels = simulate(generator.words, 12 * 1000)
+    assert set(runs(levels)[:-1]) == {(0, 5), (1, 7)}
+    assert len(runs(levels)) > 1990
+
+
+def test_encode_round_trip():
+
+    generator = FakePulseGenerator()
+    generator.start()
+
+    for command in ((3, 4, 1), (500, 1500, 4), (1 << 20, 7, 1 << 16),
+                    (10, 20, PulseGenerator.FOREVER)):
+        assert generator.send(*command)
+        assert tuple(generator.fifo[-3:]) == PulseGenerator.encode(*command)
+        generator.finish_command()
+
+    assert generator.commands == [(3, 4, 1), (500, 1500, 4),
+                                  (1 << 20, 7, 1 << 16),
+                                  (10, 20, PulseGenerator.FOREVER)]
+    assert generator.command_count == 4
+
+
+def test_full_fifo_refuses_commands():
+
+    generator = FakePulseGenerator()
+    generator.start()
+
+    assert generator.send(10, 10)
+    assert generator.send(10, 10)
+    assert not generator.send(10, 10)
+    assert not generator.trigger(10)
+    assert generator.refused_count == 2
+    assert len(generator.fifo) == 6
+
+    generator.finish_command()
+    assert generator.trigger(10)
+    assert generator.command_count == 3
+
+    generator.reset_counters()
+    assert generator.refused_count == 0
+
+
+def test_stopped_generator_refuses_commands():
+
+    generator = FakePulseGenerator()
+    assert not generator.send(10, 10)
+
+    generator.start()
+    generator.send(10, 10)
+    generator.stop()
+
+    assert generator.fifo == []
+    assert not generator.send(10, 10)
+    assert generator.refused_count == 2
+
+
+def test_invalid_commands():
+
+    generator = FakePulseGenerator()
+    generator.start()
+
+    for command in ((PulseGenerator.MIN_HIGH_US - 1, 10, 1),
+                    (10, PulseGenerator.MIN_LOW_US - 1, 1),
+                    (10, 10, PulseGenerator.FOREVER - 1),
+                    (PulseGenerator.MAX_VALUE + 1, 10, 1)):
+        with pytest.raises(ValueError):
+            generator.send(*command)
+
+    assert generator.words == []
+
+
+def test_pio_generator():
+
+    generator = PIOPulseGenerator(8, 4)
+    generator.start()
+    state_machine = generator._state_machine
+
+    assert state_machine.id == 4
+    assert state_machine.settings["freq"] == 1_000_000
+    assert state_machine.settings["set_base"].id == 8
+    assert state_machine.running
+
+    assert generator.send(10, 20, 3)
+    assert state_machine.fifo == [2, 7, 16]
+
+    generator.stop()
+    assert not state_machine.running
+
+    with pytest.raises(ValueError):
+        PIOPulseGenerator(8, 8)
+
+
+def test_socket_routes_pulses(clock):
+
+    socket = PulseOutputSocketOne()
+    assert not socket.send_pulses(10, 10)
+
+    socket.pulse(1000)
+    assert socket.is_pulsing()
+
+    generator = socket.start_generator(FakePulseGenerator())
+    assert socket.generator is generator
+    assert generator.running
+    assert not socket.is_pulsing()
+    assert socket.is_off()
+
+    socket.pulse(500)
+    assert socket.send_pulses(100, 200, 4)
+    generator.finish_command()
+    generator.finish_command()
+    assert generator.commands == [(500, PulseGenerator.MIN_LOW_US, 1),
+                                  (100, 200, 4)]
+    assert not socket.is_pulsing()
+
+    socket.stop_generator()
+    assert socket.generator is None
+    assert not generator.running
+    assert socket.is_off()
+
+    socket.pulse(1000)
+    assert socket.is_pulsing()
+
+
+def test_socket_default_generator():
+
+    socket = PulseOutputSocketOne()
+    generator = socket.start_generator()
+
+    assert isinstance(generator, PIOPulseGenerator)
+    assert generator.state_machine_id == socket.state_machine_id == 4
+    assert generator.pin_id == socket.io_pin_id
+
+    socket.stop_generator()
@@ -0,0 +1,68 @@
+import pytest
+
+from computer.sockets.pulses.pulse_input_socket import PulseInputSocketOne
+
+
+def edges(socket, clock, period_us, count):
+    for _ in range(count):
+        clock.advance(period_us)
+        socket._pin.handler(socket._pin)
+
+
+def test_capture_periods(clock):
+
+    socket = PulseInputSocketOne()
+    socket.start_capture(4)
+    assert socket.capturing
+    assert socket.last_period() is None
+    assert socket.period_us() == 0
+
+    edges(socket, clock, 1000, 3)
+    edges(socket, clock, 1500, 3)
+
+    assert socket.edge_count == 6
+    assert socket.timestamps() == [3000, 4500, 6000, 7500]
+    assert socket.last_period() == 1500
+    assert socket.period_us(2) == 1500
+    assert socket.average_period() == 1500
+    assert socket.jitter() == 0
+
+    socket.stop_capture()
+    assert not socket.capturing
+
+
+def test_edge_callback(clock):
+
+    received = []
+
+    socket = PulseInputSocketOne()
+    socket.start_capture()
+    socket.edge_callback = received.append
+
+    edges(socket, clock, 250, 2)
+
+    assert received == [250, 500]
+
+
+def test_edge_count_stays_small(clock):
+
+    socket = PulseInputSocketOne()
+    socket.start_capture(4)
+    edges(socket, clock, 1000, 4)
+
+    # as if 2^30 - 4 edges had been recorded
+    socket._edge_count = 0x3FFFFFFC
+    edges(socket, clock, 1000, 5)
+
+    assert socket.edge_count == 0x20000001
+    assert socket.timestamps() == [6000, 7000, 8000, 9000]
+    assert socket.last_period() == 1000
+    assert socket.period_us(3) == 1000
+
+
+def test_invalid_ring_size():
+
+    socket = PulseInputSocketOne()
+
+    with pytest.raises(ValueError):
+        socket.start_capture(12)
@@ -0,0 +1,150 @@
+import pytest
+
+from computer.pulse_generator import PulseGenerator
+from computer.sockets.pulses.pulse_output_socket import (
+    PulseOutputSocket, PulseOutputSocketOne, PulseOutputSocketTwo)
+
+
+@pytest.fixture(autouse=True)
+def pwm_clocks():
+    """Forget the PWM clocks of a test, which are shared by every socket."""
+    yield
+    PulseOutputSocket._PulseOutputSocket__pwm_clocks.clear()
+
+
+def pwm(socket):
+    return socket._PulseOutputSocket__pwm
+
+
+def test_pwm_clock():
+
+    socket = PulseOutputSocketOne()
+    socket.start_clock(1000, duty=0.25)
+
+    assert socket.clock_hz == 1000
+    assert socket.generator is None
+    assert pwm(socket).freq() == 1000
+    # the output is inverted, so the duty is of the pin being high
+    assert pwm(socket).duty_u16() == round(0.75 * 65535)
+
+
+@pytest.mark.parametrize("hz", [PulseOutputSocket.MIN_PWM_HZ - 1, 0.5])
+def test_slow_clock_uses_generator(hz):
+
+    socket = PulseOutputSocketOne()
+    socket.start_clock(hz)
+
+    period_us = round(1_000_000 / hz)
+    assert pwm(socket) is None
+    assert socket.clock_hz == hz
+    assert socket.generator._state_machine.fifo == list(
+        PulseGenerator.encode(period_us // 2, period_us - period_us // 2,
+                              PulseGenerator.FOREVER))
+
+
+def test_fractional_clock_uses_generator():
+
+    socket = PulseOutputSocketOne()
+    socket.start_clock(12.5)
+
+    assert pwm(socket) is None
+    assert socket.generator._state_machine.fifo == list(
+        PulseGenerator.encode(40_000, 40_000, PulseGenerator.FOREVER))
+
+    socket.start_clock(12.0)
+    assert pwm(socket).freq() == 12
+
+
+def test_shared_frequency():
+
+    one = PulseOutputSocketOne()
+    two = PulseOutputSocketTwo()
+
+    one.start_clock(1000)
+    two.start_clock(1000, duty=0.1)
+    assert pwm(two).freq() == 1000
+    assert two.generator is None
+
+    two.start_clock(2000)
+    assert pwm(two) is None
+    assert two.generator is not None
+    assert pwm(one).freq() == 1000
+
+    # once the other clock is stopped, the slice is free to change frequency
+    one.stop_clock()
+    one.start_clock(3000)
+    assert pwm(one).freq() == 3000
+
+    # a socket's own clock does not hold the slice at its frequency
+    one.start_clock(4000)
+    assert pwm(one).freq() == 4000
+
+
+def test_stop_clock_leaves_shared_slice():
+
+    one = PulseOutputSocketOne()
+    two = PulseOutputSocketTwo()
+    one.start_clock(1000)
+    two.start_clock(1000)
+    one_pwm = pwm(one)
+    two_pwm = pwm(two)
+
+    one.stop_clock()
+    assert one.clock_hz == 0
+    assert pwm(one) is None
+    assert one_pwm.active
+    assert one_pwm.duty_u16() == 65535
+    assert one._pin.value() == one.off_value
+    assert two_pwm.active
+
+    two.stop_clock()
+    assert not two_pwm.active
+    assert two._pin.value() == two.off_value
+
+
+def test_clocks_refused_by_generator():
+
+    one = PulseOutputSocketOne()
+    two = PulseOutputSocketTwo()
+    one.start_clock(200_000)
+    two.start_clock(PulseOutputSocket.MAX_GENERATOR_HZ)
+    assert two.generator._state_machine.fifo == [-1, 0, 0]
+
+    for hz in (PulseOutputSocket.MAX_GENERATOR_HZ + 1,
+               PulseOutputSocket.MIN_GENERATOR_HZ / 2):
+        with pytest.raises(ValueError):
+            two.start_clock(hz)
+
+        # the refused clock leaves the running one alone
+        assert two.clock_hz == PulseOutputSocket.MAX_GENERATOR_HZ
+        assert two.generator.running
+
+    two.start_clock(PulseOutputSocket.MIN_GENERATOR_HZ)
+    assert two.generator._state_machine.fifo[0] == -1
+
+
+def test_invalid_clocks():
+
+    socket = PulseOutputSocketOne()
+
+    for hz, duty in ((0, 0.5), (-1, 0.5), (1000, 1.5), (1000, -0.1)):
+        with pytest.raises(ValueError):
+            socket.start_clock(hz, duty)
+
+    assert socket.clock_hz == 0
+
+
+def test_stop_generator_stops_clock():
+
+    socket = PulseOutputSocketOne()
+    socket.start_clock(2)
+
+    socket.stop_generator()
+    assert socket.clock_hz == 0
+    assert socket.generator is None
+    assert socket._pin.value() == socket.off_value
+
+    socket.start_clock(1000)
+    socket.start_generator()
+    assert socket.clock_hz == 0
+    assert pwm(socket) is None
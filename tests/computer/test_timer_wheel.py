@@ -0,0 +1,88 @@
+import pytest
+
+from computer.timer_wheel import TimerWheel
+
+
+class Output(object):
+
+    def __init__(self, io_pin_id):
+        self.io_pin_id = io_pin_id
+        self.on = False
+
+    def turn_on(self):
+        self.on = True
+
+    def turn_off(self):
+        self.on = False
+
+
+def test_pulse_turned_off_by_tick(clock):
+
+    wheel = TimerWheel()
+    output = Output(8)
+    slot = wheel.register(output)
+
+    wheel.pulse(slot, 1000)
+    assert output.on
+    assert wheel.is_pulsing(slot)
+    assert wheel._timer.active
+
+    clock.advance(999)
+    wheel._timer.fire()
+    assert output.on
+
+    clock.advance(1)
+    wheel._timer.fire()
+    assert not output.on
+    assert not wheel.is_pulsing(slot)
+    assert not wheel._timer.active
+
+
+def test_retrigger_modes(clock):
+
+    wheel = TimerWheel()
+    output = Output(8)
+    slot = wheel.register(output)
+
+    wheel.pulse(slot, 1000)
+    wheel.pulse(slot, 500, TimerWheel.EXTEND)
+    assert wheel._off_times[slot] == 1000
+
+    wheel.pulse(slot, 500, TimerWheel.RESTART)
+    assert wheel._off_times[slot] == 500
+
+    wheel.pulse(slot, 2000, TimerWheel.IGNORE)
+    assert wheel._off_times[slot] == 500
+
+
+def test_same_pin_takes_over_slot(clock):
+
+    wheel = TimerWheel(capacity=2)
+    first = Output(8)
+    slot = wheel.register(first)
+    wheel.pulse(slot, 1000)
+
+    second = Output(8)
+    assert wheel.register(second) == slot
+    assert not wheel.is_pulsing(slot)
+
+    # registering the same pins again never fills the wheel
+    for _ in range(10):
+        wheel.register(Output(8))
+        wheel.register(Output(9))
+
+
+def test_unregister_frees_slot(clock):
+
+    wheel = TimerWheel(capacity=2)
+    slot = wheel.register(Output(8))
+    wheel.register(Output(9))
+
+    with pytest.raises(ValueError):
+        wheel.register(Output(10))
+
+    wheel.pulse(slot, 1000)
+    wheel.unregister(slot)
+    assert not wheel.is_pulsing(slot)
+
+    assert wheel.register(Output(10)) == slot
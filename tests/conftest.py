@@ -0,0 +1,234 @@
+"""
+Stand-ins for the micropython-only modules, so the tests run on the host.
+
+Each stand-in is only installed if the real module cannot be imported, so
+the tests use the real modules when run under micropython. The stand-ins
+provide just what the package uses, and record what is done with them
+(pin values, timer and PWM settings, words put to state machines) for the
+tests to check. Interrupt handlers and timer callbacks are never called by
+the stand-ins; the tests call them.
+"""
+import sys
+import time
+import types
+
+
+def _install(name, **attributes):
+    """Install a stand-in module, unless the real module can be imported."""
+    try:
+        __import__(name)
+    except ImportError:
+        module = types.ModuleType(name)
+        module.__dict__.update(attributes)
+        sys.modules[name] = module
+
+
+def _schedule(function, argument):
+    """Record a scheduled call, which the tests make themselves."""
+    sys.modules["micropython"].scheduled.append((function, argument))
+
+
+class Pin(object):
+    """A GPIO pin, holding the last value written to it."""
+    IN = 0
+    OUT = 1
+    PULL_UP = 1
+    IRQ_FALLING = 4
+    IRQ_RISING = 8
+
+    def __init__(self, pin_id, mode=None, pull=None, value=None):
+        self.id = pin_id
+        self.mode = mode
+        self._value = value or 0
+        self.handler = None
+
+    def init(self, mode=None, pull=None, value=None):
+        self.mode = mode
+        if value is not None:
+            self._value = value
+
+    def value(self, value=None):
+        if value is None:
+            return self._value
+        self._value = int(bool(value))
+
+    def irq(self, handler=None, trigger=None, hard=False):
+        self.handler = handler
+
+
+class ADC(object):
+    """An ADC, reading the value set for its pin in ADC.values."""
+    values = {}
+
+    def __init__(self, pin_id):
+        self.id = pin_id
+
+    def read_u16(self):
+        return ADC.values.get(self.id, 0)
+
+
+class PWM(object):
+    """A PWM output, holding its frequency and duty cycle."""
+
+    def __init__(self, pin, freq=None, duty_u16=None):
+        self.pin = pin
+        self._freq = freq
+        self._duty_u16 = duty_u16
+        self.active = True
+
+    def freq(self, freq=None):
+        if freq is None:
+            return self._freq
+        self._freq = freq
+
+    def duty_u16(self, duty_u16=None):
+        if duty_u16 is None:
+            return self._duty_u16
+        self._duty_u16 = duty_u16
+
+    def deinit(self):
+        self.active = False
+
+
+class Timer(object):
+    """A timer, holding the settings it was last started with."""
+    ONE_SHOT = 0
+    PERIODIC = 1
+
+    def __init__(self, timer_id=-1, **settings):
+        self.settings = settings
+        self.active = bool(settings)
+
+    def init(self, **settings):
+        self.settings = settings
+        self.active = True
+
+    def deinit(self):
+        self.active = False
+
+    def fire(self):
+        """Call the timer's callback, as its interrupt would."""
+        self.settings["callback"](self)
+
+
+class SPI(object):
+    """An SPI bus, recording the bytes written to it."""
+    MSB = 0
+
+    def __init__(self, *args, **settings):
+        self.written = []
+
+    def init(self, *args, **settings):
+        pass
+
+    def write(self, buffer):
+        self.written.append(bytes(buffer))
+
+
+class Peripheral(object):
+    """A peripheral which the tests do not use."""
+
+    def __init__(self, *args, **settings):
+        pass
+
+
+class Memory(dict):
+    """Memory-mapped registers, reading 0 until written."""
+
+    def __getitem__(self, address):
+        return self.get(address, 0)
+
+
+class PIO(object):
+    OUT_LOW = 0
+    OUT_HIGH = 1
+    SHIFT_LEFT = 0
+    SHIFT_RIGHT = 1
+    JOIN_NONE = 0
+    JOIN_TX = 1
+    JOIN_RX = 2
+
+
+def asm_pio(**settings):
+    """Leave a PIO program's function as it is, without assembling it."""
+    return lambda program: program
+
+
+class StateMachine(object):
+    """A PIO state machine, recording the words put into its FIFO."""
+
+    def __init__(self, state_machine_id, program=None, **settings):
+        self.id = state_machine_id
+        self.settings = settings
+        self.fifo = []
+        self.executed = []
+        self.running = False
+
+    def active(self, value=None):
+        if value is None:
+            return self.running
+        self.running = bool(value)
+
+    def put(self, word):
+        self.fifo.append(word)
+
+    def tx_fifo(self):
+        return len(self.fifo)
+
+    def exec(self, instruction):
+        self.executed.append(instruction)
+
+
+class DMA(object):
+    """A DMA channel, recording its configurations."""
+
+    def __init__(self):
+        self.configs = []
+        self.handler = None
+
+    def pack_ctrl(self, **settings):
+        return 0
+
+    def irq(self, handler=None, hard=False):
+        self.handler = handler
+
+    def config(self, **settings):
+        self.configs.append(settings)
+
+    def active(self, value=None):
+        pass
+
+    def close(self):
+        pass
+
+
+_install("micropython",
+         schedule=_schedule,
+         scheduled=[])
+
+_install("machine",
+         Pin=Pin,
+         ADC=ADC,
+         PWM=PWM,
+         Timer=Timer,
+         SPI=SPI,
+         I2C=Peripheral,
+         UART=Peripheral,
+         mem32=Memory(),
+         disable_irq=lambda: 0,
+         enable_irq=lambda state: None)
+
+_install("rp2",
+         PIO=PIO,
+         asm_pio=asm_pio,
+         StateMachine=StateMachine,
+         DMA=DMA)
+
+if not hasattr(time, "ticks_us"):
+    # set by the tests, e.g. with monkeypatch, to control the time
+    time.ticks_us = lambda: time.perf_counter_ns() // 1000
+    time.ticks_ms = lambda: time.perf_counter_ns() // 1_000_000
+    time.ticks_add = lambda ticks, delta: ticks + delta
+    time.ticks_diff = lambda ticks_a, ticks_b: ticks_a - ticks_b
+    time.sleep_us = lambda us: time.sleep(us / 1_000_000)
+    time.sleep_ms = lambda ms: time.sleep(ms / 1000)
@@ -0,0 +1,84 @@
+import pytest
+
+from src.connect.curve import Curve
+
+
+def square(x):
+    return x * x
+
+
+def test_from_function():
+
+    curve = Curve.from_function(square)
+
+    assert len(curve.table) == Curve.SIZE
+    assert curve.table[0] == 0
+    assert curve.table[-1] == 65535
+    assert curve(0xFFFF) == 65535
+    assert curve(0x8000) == round((2048 / 4095) ** 2 * 65535)
+
+
+def test_from_function_is_shared():
+
+    assert Curve.from_function(square) is Curve.from_function(square)
+
+
+def test_from_function_clips():
+
+    curve = Curve.from_function(lambda x: 2 * x - 0.5)
+
+    assert curve.table[0] == 0
+    assert curve.table[-1] == 65535
+
+
+def test_from_breakpoints():
+
+    curve = Curve.from_breakpoints(((0.0, 0.0), (0.5, 0.25), (1.0, 1.0)))
+
+    assert curve.table[0] == 0
+    assert curve.table[-1] == 65535
+    assert curve.table[1023] == round(1023 / 4095 / 2 * 65535)
+    assert curve(0x8000) == round((0.25 + 1.5 * (2048 / 4095 - 0.5)) * 65535)
+
+
+def test_from_breakpoints_is_shared():
+
+    curve = Curve.from_breakpoints(Curve.AUDIO_TAPER)
+
+    assert curve is Curve.from_breakpoints([list(point)
+                                            for point in Curve.AUDIO_TAPER])
+
+
+def test_invalid_breakpoints():
+
+    with pytest.raises(ValueError):
+        Curve.from_breakpoints(((0.0, 0.0),))
+
+    with pytest.raises(ValueError):
+        Curve.from_breakpoints(((0.5, 0.0), (0.5, 1.0)))
+
+
+def test_table_for_range():
+
+    curve = Curve.from_function(square)
+    table = curve.table_for_range(224, 65535)
+
+    assert len(table) == Curve.SIZE
+    assert table[0] == 224
+    assert table[-1] == 65535
+    assert min(table) == 224
+    assert table[2048] == 224 + round(
+        curve.table[round((2048 * 65535 // 4095 - 224) / (65535 - 224) * 4095)]
+        * (65535 - 224) / 65535)
+    assert curve.table_for_range(224, 65535) is table
+
+
+def test_table_for_inverted_range():
+
+    curve = Curve.from_function(square)
+    table = curve.table_for_range(65535, 0)
+
+    # a falling reading rises through the inverted range
+    assert table[-1] == 65535
+    assert table[0] == 0
+    assert table[1024] == 65535 - curve.table[3071]
@@ -0,0 +1,184 @@
+import micropython
+import pytest
+
+from src.connect.deferred_queue import DeferredQueue
+from src.connect.signal import Signal
+
+
+def test_drain_emits_in_order():
+
+    received = []
+
+    first = Signal()
+    first.connect(lambda value=None: received.append(("first", value)))
+    second = Signal()
+    second.connect(lambda value=None: received.append(("second", value)))
+
+    queue = DeferredQueue(size=4, coalesce=False)
+    queue.push(first)
+    queue.push(second, 2)
+    queue.push(first, 3)
+
+    assert len(queue) == 3
+    queue.drain()
+
+    assert received == [("first", None), ("second", 2), ("first", 3)]
+    assert len(queue) == 0
+
+
+def test_coalesce_newest_entry():
+
+    received = []
+
+    signal = Signal()
+    signal.connect(received.append)
+
+    queue = DeferredQueue(size=4)
+    for value in range(5):
+        queue.push(signal, value)
+
+    assert len(queue) == 1
+    assert queue.coalesced_count == 4
+
+    queue.drain()
+
+    assert received == [4]
+
+
+def test_events_not_coalesced():
+
+    received = []
+
+    signal = Signal()
+    signal.connect(lambda: received.append(None))
+
+    queue = DeferredQueue(size=4)
+    for _ in range(3):
+        queue.push(signal)
+
+    assert len(queue) == 3
+    assert queue.coalesced_count == 0
+
+    queue.drain()
+
+    assert received == [None, None, None]
+
+
+def test_events_coalesced_by_opt_in():
+
+    received = []
+
+    fast = Signal()
+    fast.connect(lambda: received.append("fast"))
+    slow = Signal()
+    slow.connect(lambda: received.append("slow"))
+
+    queue = DeferredQueue(size=2)
+    queue.coalesce_events_of(fast)
+    for _ in range(10):
+        queue.push(fast)
+    queue.push(slow)
+    queue.push(slow)
+
+    assert len(queue) == 2
+    assert queue.coalesced_count == 9
+    assert queue.overflow_count == 1
+
+    queue.drain()
+    assert received == ["fast", "slow"]
+
+    queue.coalesce_events_of(fast, False)
+    queue.push(fast)
+    queue.push(fast)
+    assert len(queue) == 2
+
+
+def test_overflow():
+
+    signal = Signal()
+
+    queue = DeferredQueue(size=2, coalesce=False)
+    for _ in range(5):
+        queue.push(signal)
+
+    assert len(queue) == 2
+    assert queue.overflow_count == 3
+
+    queue.reset_counters()
+    assert queue.overflow_count == 0
+
+
+def test_emit_deferred():
+
+    received = []
+
+    signal = Signal()
+    signal.connect(received.append)
+    queue = DeferredQueue()
+    signal.defer_to(queue)
+
+    signal.emit_deferred(1)
+    assert received == []
+
+    queue.drain()
+    assert received == [1]
+
+
+def test_invalid_size():
+
+    with pytest.raises(ValueError):
+        DeferredQueue(size=0)
+
+
+def test_first_push_schedules_drain():
+
+    del micropython.scheduled[:]
+
+    signal = Signal()
+    queue = DeferredQueue(coalesce=False)
+    queue.push(signal)
+    queue.push(signal)
+
+    assert micropython.scheduled == [(queue.drain, None)]
+
+    queue.drain()
+    queue.push(signal)
+
+    assert len(micropython.scheduled) == 2
+
+
+def test_schedule_failure(monkeypatch):
+
+    def full_scheduler(function, argument):
+        raise RuntimeError("schedule queue full")
+
+    monkeypatch.setattr(micropython, "schedule", full_scheduler)
+
+    received = []
+
+    signal = Signal()
+    signal.connect(received.append)
+    queue = DeferredQueue()
+    queue.push(signal, 1)
+
+    assert queue.schedule_failure_count == 1
+    assert len(queue) == 1
+
+    queue.drain()
+    assert received == [1]
+
+
+def test_ring_wraps():
+
+    received = []
+
+    signal = Signal()
+    signal.connect(received.append)
+    queue = DeferredQueue(size=2, coalesce=False)
+
+    for value in range(1, 7):
+        queue.push(signal, value)
+        queue.drain()
+
+    assert received == [1, 2, 3, 4, 5, 6]
+    assert queue.overflow_count == 0
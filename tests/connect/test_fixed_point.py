@@ -0,0 +1,86 @@
+import pytest
+
+from src.connect.fixed_point import Q16_ONE, mul_q16, to_q16
+from src.connect.mapping import Mapping
+from src.connect.ranged_variable import RangedVariable
+
+RANGES = (
+    # (source min, source max, target min, target max)
+    (224, 65535, 0, 65535),  # main knob to CV output PWM
+    (192, 65535, 4095, 0),  # X knob to inverted CV/Audio output DAC
+    (65535, 0, 0, 4095),  # CV input to CV/Audio output DAC
+    (65535, 0, 65535, 0),  # CV input to CV output PWM
+    (0, 65535, 0, 65535),
+    (0, 4095, 0, 65535),
+    (0, 65535, 1000, 1100),
+    (0, 100, 0, 3000),
+)
+
+
+def test_to_q16():
+
+    assert to_q16(1) == Q16_ONE
+    assert to_q16(0.5) == Q16_ONE // 2
+    assert to_q16(-2) == -2 * Q16_ONE
+
+
+def test_mul_q16_rounds_to_nearest():
+
+    for value in range(-65535, 65536, 131):
+        for coefficient in (1, 65535, 65536, 65537, -98304, 2 ** 21 - 1):
+            assert mul_q16(value, coefficient) == \
+                (value * coefficient + (1 << 15)) >> 16
+
+
+def test_fixed_point_mapping_matches_float_mapping():
+
+    for source_min, source_max, target_min, target_max in RANGES:
+        source = RangedVariable(value=source_min,
+                                minimum=source_min,
+                                maximum=source_max)
+
+        target = RangedVariable(value=target_min,
+                                minimum=target_min,
+                                maximum=target_max)
+
+        float_mapping = Mapping(source, target)
+        fixed_mapping = Mapping(source, target, fixed_point=True)
+
+        for value in range(min(source_min, source_max),
+                           max(source_min, source_max) + 1):
+            fixed_value = fixed_mapping.map(value)
+
+            assert isinstance(fixed_value, int)
+            assert abs(fixed_value - float_mapping.map(value)) <= 1
+
+
+def test_fixed_point_mapping_sets_integer_target():
+
+    source = RangedVariable(value=65535,
+                            minimum=224,
+                            maximum=65535)
+
+    target = RangedVariable(value=0,
+                            minimum=0,
+                            maximum=4095)
+
+    Mapping(source, target, fixed_point=True)()
+
+    assert target.value == 4095
+    assert isinstance(target.value, int)
+
+
+def test_fixed_point_slope_out_of_range():
+
+    source = RangedVariable(value=0,
+                            minimum=0,
+                            maximum=1)
+
+    target = RangedVariable(value=0,
+                            minimum=0,
+                            maximum=65535)
+
+    mapping = Mapping(source, target, fixed_point=True)
+
+    with pytest.raises(ValueError):
+        mapping.map(0)
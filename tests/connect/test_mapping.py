@@ -0,0 +1,107 @@
+from src.connect.mapping import Mapping
+from src.connect.ranged_variable import RangedVariable
+
+
+def test_map_value():
+
+    source = RangedVariable(value=0,
+                            minimum=0,
+                            maximum=100)
+
+    target = RangedVariable(value=0,
+                            minimum=0,
+                            maximum=1000)
+
+    mapping = Mapping(source, target)
+
+    source.value = 50
+    mapping()
+    assert target.value == 500
+
+    assert mapping.map(25) == 250
+
+
+def test_matches_map_value():
+
+    source = RangedVariable(value=224,
+                            minimum=224,
+                            maximum=65535)
+
+    target = RangedVariable(value=4095,
+                            minimum=4095,
+                            maximum=0)
+
+    expected = RangedVariable(value=4095,
+                              minimum=4095,
+                              maximum=0)
+
+    mapping = Mapping(source, target)
+
+    for value in range(224, 65536, 997):
+        source.value = value
+        mapping()
+        expected.map_value(source)
+        assert abs(target.value - expected.value) < 1e-6
+
+
+def test_invalidated_on_range_change():
+
+    source = RangedVariable(value=0,
+                            minimum=0,
+                            maximum=10)
+
+    target = RangedVariable(value=0,
+                            minimum=0,
+                            maximum=10)
+
+    mapping = Mapping(source, target)
+    assert mapping.slope == 1
+
+    target.maximum_value = 20
+    assert mapping.slope == 2
+
+    source.minimum_value = 5
+    assert mapping.slope == 4
+    assert mapping.map(5) == 0
+
+
+def test_callback():
+
+    source = RangedVariable(value=1,
+                            minimum=0,
+                            maximum=1)
+
+    target = RangedVariable(value=0,
+                            minimum=0,
+                            maximum=2)
+
+    written = []
+    mapping = Mapping(source, target, callback=written.append)
+    mapping(ranged_variable=source)
+
+    assert written == [2]
+
+
+def test_disconnect():
+
+    source = RangedVariable(value=0,
+                            minimum=0,
+                            maximum=10)
+
+    target = RangedVariable(value=0,
+                            minimum=0,
+                            maximum=10)
+
+    source_slots = source.range_changed._slots
+    target_slots = target.range_changed._slots
+
+    mapping = Mapping(source, target)
+    assert mapping.slope == 1
+
+    mapping.disconnect()
+    assert source.range_changed._slots == source_slots
+    assert target.range_changed._slots == target_slots
+
+    # the mapping still works, but recompiles from the ranges when used
+    target.maximum_value = 20
+    assert mapping.slope == 2
@@ -0,0 +1,101 @@
+import pytest
+
+from src.connect.mod_matrix import ModMatrix
+from src.connect.ranged_variable import RangedVariable
+
+
+class Output(object):
+    """An analog output writing to a list."""
+
+    def __init__(self):
+        self.ranged_variable = RangedVariable(value=0, minimum=0, maximum=4095)
+        self.written = []
+
+    def write(self, value):
+        self.written.append(value)
+
+
+def test_weighted_sum():
+
+    knob = RangedVariable(value=0, minimum=0, maximum=65535)
+    cv = RangedVariable(value=0, minimum=65535, maximum=0)
+    output = Output()
+    level = RangedVariable(value=0, minimum=0, maximum=1000)
+
+    matrix = ModMatrix([knob, cv], [output, level])
+    matrix.set_depth(knob, output, 0.5)
+    matrix.set_weight(cv, output, ModMatrix.WEIGHT_ONE // 4)
+    matrix.set_depth(cv, level, -1)
+    matrix.set_offset(level, ModMatrix.POSITION_MAX)
+
+    matrix.tick()
+    assert output.written == [1023]
+    assert level.value == 0
+
+    knob.value = 65535
+    matrix.tick()
+    assert output.written == [1023, 3071]
+
+    cv.value = 65535
+    matrix.tick()
+    assert output.written == [1023, 3071, 2047]
+    assert level.value == 1000
+
+
+def test_unchanged_destinations_not_written():
+
+    knob = RangedVariable(value=30000, minimum=0, maximum=65535)
+    output = Output()
+
+    matrix = ModMatrix([knob], [output])
+    matrix.set_depth(knob, output, 1)
+
+    matrix.tick()
+    matrix.tick()
+    knob.value = 30001
+    matrix.tick()
+
+    assert len(output.written) == 1
+
+
+def test_clamped_to_range():
+
+    knob = RangedVariable(value=65535, minimum=0, maximum=65535)
+    output = Output()
+
+    matrix = ModMatrix([knob], [output])
+    matrix.set_depth(knob, output, 4)
+    matrix.set_offset(output, 2000)
+    matrix.tick()
+
+    assert output.ranged_variable.value == 4095
+
+
+def test_invalid_weights():
+
+    knob = RangedVariable(value=0, minimum=0, maximum=65535)
+    output = Output()
+
+    matrix = ModMatrix([knob], [output])
+
+    with pytest.raises(ValueError):
+        matrix.set_weight(knob, output, ModMatrix.WEIGHT_MAX + 1)
+
+    with pytest.raises(ValueError):
+        matrix.set_weight(output, knob, 0)
+
+
+def test_invalid_source_ranges():
+
+    output = Output()
+
+    for source in (RangedVariable(value=0, minimum=0, maximum=100),
+                   RangedVariable(value=0.5, minimum=0.0, maximum=1.0),
+                   RangedVariable(value=0, minimum=0, maximum=1 << 16)):
+        matrix = ModMatrix([source], [output])
+        with pytest.raises(ValueError):
+            matrix.tick()
+
+    matrix = ModMatrix([RangedVariable(value=0, minimum=0, maximum=128)],
+                       [output])
+    matrix.tick()
@@ -0,0 +1,88 @@
+import pytest
+
+from src.connect.patch import Patch
+from src.connect.ranged_variable import RangedVariable
+
+
+class Output(object):
+    """An analog output writing to a list."""
+
+    def __init__(self):
+        self.ranged_variable = RangedVariable(
+            value=0,
+            minimum=RangedVariable(value=0, minimum=0, maximum=1000),
+            maximum=RangedVariable(value=4000, minimum=3000, maximum=4000)
+        )
+        self.written = []
+
+    def write(self, value):
+        self.written.append(value)
+
+
+def test_value_route():
+
+    knob = RangedVariable(value=0, minimum=0, maximum=4095)
+    output = Output()
+
+    patch = Patch([(knob, Patch.VALUE, output)])
+
+    patch.tick()
+    assert output.written == [0]
+
+    patch.tick()
+    assert output.written == [0]
+
+    knob.value = 4095
+    patch.tick()
+    assert output.written == [0, 4000]
+
+
+def test_range_routes_run_first():
+
+    knob = RangedVariable(value=4095, minimum=0, maximum=4095)
+    cv = RangedVariable(value=4095, minimum=0, maximum=4095)
+    output = Output()
+
+    # added in reverse, the range route must still be run first
+    patch = Patch([(cv, Patch.VALUE, output),
+                   (knob, Patch.MINIMUM, output)])
+
+    patch.tick()
+    assert output.ranged_variable.minimum_value == 1000
+    assert output.written == [4000]
+
+    cv.value = 0
+    patch.tick()
+    assert output.written == [4000, 1000]
+
+    knob.value = 0
+    patch.tick()
+    assert output.written == [4000, 1000, 0]
+
+
+def test_matches_mapping():
+
+    source = RangedVariable(value=0, minimum=0, maximum=65535)
+    target = RangedVariable(value=0, minimum=0, maximum=3000)
+
+    patch = Patch([(source, Patch.VALUE, target)])
+
+    for value in range(0, 65536, 997):
+        source.value = value
+        patch.tick()
+        assert abs(target.value - value * 3000 / 65535) <= 1
+
+
+def test_range_route_expands():
+
+    knob = RangedVariable(value=0, minimum=0, maximum=4095)
+    output = Output()
+
+    patch = Patch([(knob, Patch.RANGE, output)])
+    assert len(patch) == 2
+
+
+def test_invalid_mapping():
+
+    with pytest.raises(ValueError):
+        Patch([(RangedVariable(0, 0, 1), "slope", RangedVariable(0, 0, 1))])
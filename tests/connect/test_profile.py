@@ -0,0 +1,74 @@
+from src.connect import profile
+from src.connect.ranged_variable import RangedVariable
+from src.connect.signal import Signal
+
+
+class FakeClock(object):
+    """A clock advancing by a fixed step each time it is read."""
+
+    def __init__(self, step):
+        self.now = 0
+        self.step = step
+
+    def ticks_us(self):
+        self.now += self.step
+        return self.now
+
+    def ticks_diff(self, a, b):
+        return a - b
+
+
+class Root(object):
+
+    def __init__(self):
+        self.changed = Signal()
+        self.variables = [RangedVariable(0, 0, 1)]
+
+
+def test_profile_slots():
+
+    received = []
+
+    root = Root()
+    root.changed.connect(received.append)
+    root.variables[0].range_changed.connect(received.append)
+
+    profile.enable(root, clock=FakeClock(5))
+
+    root.changed.emit_value(1)
+    root.changed.emit_value(2)
+    root.variables[0].range_changed.emit_value(3)
+
+    assert received == [1, 2, 3]
+
+    hottest = profile.hottest(root)
+    assert [path for path, _ in hottest] == [
+        "Root.changed",
+        "Root.variables[0].range_changed",
+    ]
+    assert hottest[0][1].call_count == 2
+    assert hottest[0][1].total_us == 10
+    assert hottest[0][1].max_us == 5
+    assert hottest[0][1].last_us == 5
+
+    profile.report(root)
+
+
+def test_disable_and_disconnect():
+
+    received = []
+
+    signal = Signal()
+    signal.enable_profiling(FakeClock(1))
+    signal.connect(received.append)
+    assert len(signal.slot_profiles) == 1
+
+    signal.disconnect(received.append)
+    assert signal._slots == ()
+
+    signal.connect(received.append)
+    signal.disable_profiling()
+    assert signal.slot_profiles == ()
+
+    signal.emit_value(1)
+    assert received == [1]
@@ -94,3 +94,63 @@ def test_mixed_init():
 
     ranged_variable.maximum_value = 2
     assert ranged_variable.maximum_value == 2
+
+
+def test_value_clamped():
+
+    ranged_variable = RangedVariable(value=0,
+                                     minimum=0,
+                                     maximum=10)
+
+    ranged_variable.value = 11
+    assert ranged_variable.value == 10
+
+    ranged_variable.value = -1
+    assert ranged_variable.value == 0
+
+
+def test_inverted_value_clamped():
+
+    ranged_variable = RangedVariable(value=65535,
+                                     minimum=65535,
+                                     maximum=0)
+
+    ranged_variable.value = 70000
+    assert ranged_variable.value == 65535
+
+    ranged_variable.value = -1
+    assert ranged_variable.value == 0
+
+
+def test_ranged_extremum_updates_dependent():
+    min_ranged_variable = RangedVariable(value=0,
+                                         minimum=0,
+                                         maximum=5)
+
+    max_ranged_variable = RangedVariable(value=10,
+                                         minimum=5,
+                                         maximum=10)
+
+    ranged_variable = RangedVariable(value=0,
+                                     minimum=min_ranged_variable,
+                                     maximum=max_ranged_variable)
+
+    range_changes = []
+    ranged_variable.range_changed.connect(lambda: range_changes.append(1))
+
+    min_ranged_variable.value = 2
+    assert ranged_variable.minimum_value == 2
+    assert len(range_changes) == 1
+
+    max_ranged_variable.value = 8
+    assert ranged_variable.maximum_value == 8
+    assert len(range_changes) == 2
+
+    max_ranged_variable.value = 8
+    assert len(range_changes) == 2
+
+    ranged_variable.value = 9
+    assert ranged_variable.value == 8
+
+    ranged_variable.value = 1
+    assert ranged_variable.value == 2
@@ -0,0 +1,69 @@
+import pytest
+
+from src.connect.rate_limited_signal import RateLimitedSignal
+
+
+class FakeClock(object):
+
+    def __init__(self):
+        self.now = 0
+
+    def ticks_us(self):
+        return self.now
+
+    def ticks_diff(self, a, b):
+        return a - b
+
+
+def test_unlimited():
+
+    received = []
+
+    signal = RateLimitedSignal(clock=FakeClock())
+    signal.connect(received.append)
+
+    for value in range(3):
+        signal.emit_value(value)
+
+    assert received == [0, 1, 2]
+    assert signal.emit_count == 3
+    assert signal.drop_count == 0
+
+
+def test_trailing_edge_delivery():
+
+    received = []
+
+    clock = FakeClock()
+    signal = RateLimitedSignal(max_rate_hz=100, clock=clock)
+    signal.connect(received.append)
+
+    clock.now = 10_000
+    signal.emit_value(1)
+    clock.now = 12_000
+    signal.emit_value(2)
+    clock.now = 14_000
+    signal.emit_value(3)
+    signal.poll()
+
+    assert received == [1]
+    assert signal.drop_count == 1
+
+    clock.now = 20_000
+    signal.poll()
+    signal.poll()
+
+    assert received == [1, 3]
+    assert signal.emit_count == 2
+
+
+def test_max_rate_hz():
+
+    signal = RateLimitedSignal(max_rate_hz=250, clock=FakeClock())
+    assert signal.max_rate_hz == 250
+
+    signal.max_rate_hz = None
+    assert signal.max_rate_hz is None
+
+    with pytest.raises(ValueError):
+        signal.max_rate_hz = 0
@@ -0,0 +1,38 @@
+from src.connect.signal import Signal
+
+
+def test_connect_and_emit():
+
+    received = []
+
+    def slot(ranged_variable):
+        received.append(ranged_variable)
+
+    signal = Signal()
+    signal.connect(slot, slot)
+
+    signal.emit(ranged_variable=1)
+    signal.emit_value(2)
+
+    assert received == [1, 2]
+
+
+def test_disconnect():
+
+    received = []
+
+    signal = Signal()
+    signal.connect(received.append)
+    signal.disconnect(received.append)
+
+    signal.emit_value(1)
+
+    assert received == []
+
+
+def test_emit_without_slots():
+
+    signal = Signal()
+
+    signal.emit()
+    signal.emit_value(None)